@@ -1,19 +1,26 @@
+import os
 from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
 from flask_bcrypt import Bcrypt
 from flask_jwt_extended import JWTManager
 from flask_restx import Api
-from flask_migrate import Migrate
 from app.config import Config
+from app.middlewares.compression import Compression
+from app.middlewares.replica_routing import ReplicaRouter, RoutingSession
+from app.middlewares.profiling import Profiler
 
 # Inicializamos las extensiones globalmente para luego asociarlas a la app en la función create_app
-db = SQLAlchemy()  # Para la interacción con la base de datos usando SQLAlchemy
-migrate = Migrate()  # Para gestionar las migraciones de la base de datos
+db = SQLAlchemy(session_options={'class_': RoutingSession})  # Para la interacción con la base de datos usando SQLAlchemy (las lecturas de las peticiones GET pueden ir a réplicas)
+migrate = None  # Para gestionar las migraciones de la base de datos (Flask-Migrate se importa bajo demanda en create_app)
 bcrypt = Bcrypt()  # Para el hash y verificación de contraseñas de los usuarios
 jwt = JWTManager()  # Para la gestión de tokens JWT en la autenticación
+compression = Compression()  # Para comprimir las respuestas según el encabezado Accept-Encoding
+replicas = ReplicaRouter()  # Para enviar las lecturas a las réplicas de la base de datos
+profiler = Profiler()  # Para perfilar peticiones bajo demanda (solo si está habilitado en la configuración)
 
 def create_app():
     """Función factory para crear la aplicación Flask y configurar sus componentes."""
+    global migrate
     
     # Creamos una instancia de la aplicación Flask
     app = Flask(__name__)
@@ -25,7 +32,16 @@ def create_app():
     db.init_app(app)  # Inicializar SQLAlchemy con la app
     bcrypt.init_app(app)  # Inicializar Bcrypt con la app
     jwt.init_app(app)  # Inicializar JWTManager con la app
-    migrate.init_app(app, db)  # Inicializar Migrate con la app y la base de datos
+    compression.init_app(app)  # Inicializar la compresión de respuestas con la app
+    replicas.init_app(app)  # Inicializar el enrutamiento de lecturas a réplicas con la app
+    profiler.init_app(app)  # Inicializar el perfilado de peticiones con la app
+
+    # Flask-Migrate importa Alembic, que solo se usa en los comandos `flask db`. Con arranque rápido
+    # únicamente se inicializa cuando la app se carga desde la línea de comandos de Flask
+    if not app.config['FAST_STARTUP'] or os.environ.get('FLASK_RUN_FROM_CLI') == 'true':
+        from flask_migrate import Migrate
+        migrate = migrate or Migrate()
+        migrate.init_app(app, db)  # Inicializar Migrate con la app y la base de datos
 
     # Autorizador JWT para integrar con la documentación Swagger
     authorizations = {
@@ -44,7 +60,8 @@ def create_app():
         version='1.0',  # Versión de la API
         description='API para gestión de hábitos, usuarios, asignaciones y logros ',  # Descripción de la API
         authorizations=authorizations,  # Añadimos la configuración de JWT a la API
-        security='Bearer'  # Define que los endpoints por defecto usan el esquema de seguridad JWT
+        security='Bearer',  # Define que los endpoints por defecto usan el esquema de seguridad JWT
+        doc='/' if app.config['SWAGGER_UI_ENABLED'] else False  # Interfaz Swagger (la especificación /swagger.json se genera en su primera petición)
     )
 
     # Importamos los controladores y namespaces que organizan las rutas/endpoints de la API
@@ -52,12 +69,22 @@ def create_app():
     from .controllers.habit_controller import habit_ns # Controlador para la gestión de hábitos
     from .controllers.assignment_controller import assignment_ns # Controlador para la gestión de asignaciones de hábitos por cada usuario
     from .controllers.completed_date_controller import completed_date_ns # Controlador para la gestión de fechas en que se completan los hábitos
+    from .controllers.admin_controller import admin_ns # Controlador para las operaciones de administración
+    from .controllers.change_controller import change_ns # Controlador del feed de cambios para servicios externos
+    from .controllers.job_controller import job_ns # Controlador del estado de los trabajos en segundo plano
 
     # Registramos cada namespace (grupo de rutas) en la API
     api.add_namespace(user_ns, path='/users')  # Registrar el namespace de usuarios en /users
     api.add_namespace(habit_ns, path='/habits') # Registrar el namespace de hábitos en /habits
     api.add_namespace(assignment_ns, path='/assignments') # Registrar el namespace de asignaciones de hábitos por cada usuario en /assignment
     api.add_namespace(completed_date_ns, path='/completed_dates') # Registrar el namespace de fechas en que se completan los hábitos en /completed_dates
+    api.add_namespace(admin_ns, path='/admin') # Registrar el namespace de administración en /admin
+    api.add_namespace(change_ns, path='/changes') # Registrar el namespace del feed de cambios en /changes
+    api.add_namespace(job_ns, path='/jobs') # Registrar el namespace de trabajos en segundo plano en /jobs
+
+    # Registramos los comandos de línea de comandos (`flask recommendations refresh`, etc.)
+    from .commands import register_commands
+    register_commands(app)
 
     # Retornamos la aplicación ya configurada
     return app
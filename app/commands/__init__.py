@@ -0,0 +1,22 @@
+def register_commands(app):
+    """
+    Registra en la aplicación los comandos de línea de comandos de Flask (`flask <grupo> <comando>`).
+
+    Args:
+        app (Flask): La aplicación Flask.
+    """
+    from .recommendation_commands import recommendations_cli
+    from .analytics_commands import analytics_cli
+    from .export_commands import export_cli
+    from .outbox_commands import outbox_cli
+    from .reminder_commands import reminders_cli
+    from .job_commands import jobs_cli
+    from .sync_commands import sync_cli
+
+    app.cli.add_command(recommendations_cli)
+    app.cli.add_command(analytics_cli)
+    app.cli.add_command(export_cli)
+    app.cli.add_command(outbox_cli)
+    app.cli.add_command(reminders_cli)
+    app.cli.add_command(jobs_cli)
+    app.cli.add_command(sync_cli)
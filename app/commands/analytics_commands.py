@@ -0,0 +1,32 @@
+import time
+import click
+from flask.cli import AppGroup
+from app.services.analytics_service import AnalyticsService
+
+# Grupo de comandos `flask analytics ...`
+analytics_cli = AppGroup('analytics', help='Cálculos de analítica por lotes.')
+
+
+@analytics_cli.command('retention')
+@click.option('--max-weeks', type=int, default=None, help='Semanas posteriores a la creación a calcular por cohorte.')
+@click.option('--workers', type=int, default=None, help='Procesos a usar (por defecto, la cantidad de CPUs).')
+def retention(max_weeks, workers):
+    """Recalcula la matriz de retención semanal por cohortes de usuarios."""
+    start = time.perf_counter()
+    cells = AnalyticsService.refresh_cohort_retention(max_weeks, workers)
+    click.echo(f'Cohort retention refreshed: {cells} cells in {time.perf_counter() - start:.2f}s')
+
+
+@analytics_cli.command('habit-stats')
+@click.option('--window-days', type=int, default=None, help='Días, incluido hoy, que abarca la tasa de completado.')
+@click.option('--interval', type=int, default=None,
+              help='Si se indica, el comando queda en ejecución y recalcula las estadísticas cada INTERVAL segundos.')
+def habit_stats(window_days, interval):
+    """Recalcula las estadísticas de popularidad de los hábitos (usuarios activos y tasa de completado)."""
+    while True:
+        start = time.perf_counter()
+        habits = AnalyticsService.refresh_habit_stats(window_days)
+        click.echo(f'Habit stats refreshed: {habits} habits in {time.perf_counter() - start:.2f}s')
+        if not interval:
+            break
+        time.sleep(interval)
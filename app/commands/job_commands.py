@@ -0,0 +1,34 @@
+import signal
+import threading
+import click
+from flask.cli import AppGroup
+from app.services.job_service import JobService
+
+# Grupo de comandos `flask jobs ...`
+jobs_cli = AppGroup('jobs', help='Ejecución de los trabajos en segundo plano.')
+
+
+@jobs_cli.command('worker')
+@click.option('--concurrency', type=int, default=None, help='Trabajos simultáneos (por defecto JOB_WORKER_CONCURRENCY).')
+@click.option('--burst', is_flag=True, help='Termina cuando no quedan trabajos pendientes.')
+def worker(concurrency, burst):
+    """Ejecuta los trabajos en segundo plano. Al recibir SIGTERM o Ctrl+C termina los trabajos en curso y sale."""
+    stop_event = threading.Event()
+
+    def stop(signum, frame):
+        click.echo('Stopping worker; waiting for the running jobs')
+        stop_event.set()
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    executed = JobService.work(concurrency, burst, stop_event)
+    click.echo(f'Worker stopped: {executed} jobs executed')
+
+
+@jobs_cli.command('prune')
+@click.option('--older-than-days', type=int, default=7, show_default=True,
+              help='Antigüedad mínima, en días, de los trabajos terminados o fallidos a eliminar.')
+def prune(older_than_days):
+    """Elimina los trabajos terminados o fallidos antiguos."""
+    deleted = JobService.prune(older_than_days)
+    click.echo(f'Jobs pruned: {deleted} jobs deleted')
@@ -0,0 +1,15 @@
+import click
+from flask.cli import AppGroup
+from app.services.outbox_service import OutboxService
+
+# Grupo de comandos `flask outbox ...`
+outbox_cli = AppGroup('outbox', help='Mantenimiento de la bandeja de salida de eventos.')
+
+
+@outbox_cli.command('prune')
+@click.option('--older-than-days', type=int, default=30, show_default=True,
+              help='Antigüedad mínima, en días, de los eventos a eliminar.')
+def prune(older_than_days):
+    """Elimina los eventos antiguos, ya leídos por los consumidores, de la bandeja de salida."""
+    deleted = OutboxService.prune(older_than_days)
+    click.echo(f'Outbox pruned: {deleted} events deleted')
@@ -0,0 +1,22 @@
+import time
+import click
+from flask.cli import AppGroup
+from app.services.recommendation_service import RecommendationService
+
+# Grupo de comandos `flask recommendations ...`
+recommendations_cli = AppGroup('recommendations', help='Gestión de la matriz de recomendaciones de hábitos.')
+
+
+@recommendations_cli.command('refresh')
+@click.option('--top-k', type=int, default=None, help='Hábitos relacionados a conservar por hábito.')
+@click.option('--interval', type=int, default=None,
+              help='Si se indica, el comando queda en ejecución y recalcula la matriz cada INTERVAL segundos.')
+def refresh(top_k, interval):
+    """Recalcula la matriz de co-ocurrencia de hábitos usada por las recomendaciones."""
+    while True:
+        start = time.perf_counter()
+        entries = RecommendationService.refresh_cooccurrences(top_k)
+        click.echo(f'Co-occurrence matrix refreshed: {entries} entries in {time.perf_counter() - start:.2f}s')
+        if not interval:
+            break
+        time.sleep(interval)
@@ -0,0 +1,42 @@
+import time
+import click
+from datetime import datetime, timedelta
+from flask.cli import AppGroup
+from app.services.reminder_service import ReminderService
+
+# Grupo de comandos `flask reminders ...`
+reminders_cli = AppGroup('reminders', help='Envío de recordatorios por momento del día.')
+
+
+def _dispatch(slot, day, batch_size, workers):
+    start = time.perf_counter()
+    totals = ReminderService.dispatch(slot, day, batch_size, workers)
+    click.echo(f"Reminders {day} {slot}: {totals['planned']} planned, {totals['sent']} sent, "
+               f"{totals['failed']} failed, {totals['skipped']} skipped in {time.perf_counter() - start:.2f}s")
+
+
+@reminders_cli.command('dispatch')
+@click.option('--slot', type=click.Choice(ReminderService.SLOTS), default=None,
+              help='Turno a enviar (por defecto, el turno en curso).')
+@click.option('--date', 'day', type=click.DateTime(formats=['%Y-%m-%d']), default=None,
+              help='Día del turno, YYYY-MM-DD (por defecto, el del turno en curso).')
+@click.option('--batch-size', type=int, default=None, help='Recordatorios por lote.')
+@click.option('--workers', type=int, default=None, help='Hilos de envío.')
+def dispatch(slot, day, batch_size, workers):
+    """Planifica y envía los recordatorios pendientes de un turno. Puede repetirse sin duplicar envíos."""
+    current_slot, current_day = ReminderService.current_slot(datetime.now())
+    _dispatch(slot or current_slot, day.date() if day else current_day, batch_size, workers)
+
+
+@reminders_cli.command('scheduler')
+@click.option('--batch-size', type=int, default=None, help='Recordatorios por lote.')
+@click.option('--workers', type=int, default=None, help='Hilos de envío.')
+def scheduler(batch_size, workers):
+    """Envía el turno en curso y luego cada turno al comenzar, hasta que se detenga el proceso."""
+    while True:
+        now = datetime.now()
+        _dispatch(*ReminderService.current_slot(now), batch_size, workers)
+        now = datetime.now()
+        next_start = min(start for day in (now.date(), now.date() + timedelta(days=1))
+                         for _, start in ReminderService.slot_starts(day) if start > now)
+        time.sleep((next_start - now).total_seconds())
@@ -0,0 +1,13 @@
+import click
+from flask.cli import AppGroup
+from app.services.sync_service import SyncService
+
+# Grupo de comandos `flask sync ...`
+sync_cli = AppGroup('sync', help='Mantenimiento de la sincronización incremental de la aplicación móvil.')
+
+
+@sync_cli.command('prune')
+def prune():
+    """Elimina las lápidas de más de SYNC_TOMBSTONE_RETENTION_DAYS días."""
+    deleted = SyncService.prune_tombstones()
+    click.echo(f'Sync pruned: {deleted} tombstones deleted')
@@ -1,8 +1,13 @@
 import os
 from dotenv import load_dotenv
 
-# Cargar el archivo .env en las variables de entorno
-load_dotenv()
+# Modo de ejecución de la aplicación: 'development' (por defecto) o 'production'
+APP_ENV = os.environ.get('APP_ENV', 'development')
+
+# Cargar el archivo .env en las variables de entorno. En producción las variables las define
+# la plataforma de despliegue, así que se omite la búsqueda del archivo para acelerar el arranque
+if APP_ENV != 'production':
+    load_dotenv()
 
 class Config:
     """
@@ -16,8 +21,61 @@ class Config:
         SQLALCHEMY_DATABASE_URI (str): URI para la conexión a la base de datos MySQL.
         SQLALCHEMY_TRACK_MODIFICATIONS (bool): Deshabilita el seguimiento de modificaciones de objetos en SQLAlchemy para optimizar el rendimiento.
         SQLALCHEMY_ECHO (bool): Activa la impresión de todas las consultas SQL ejecutadas por la aplicación en la consola, útil para depuración.
+        FAST_STARTUP (bool): Modo de arranque rápido; omite la interfaz Swagger y las extensiones que solo usa la línea de comandos.
+        SWAGGER_UI_ENABLED (bool): Publica la interfaz Swagger en la raíz de la API.
         SECRET_KEY (str): Clave secreta para firmar cookies y otras funcionalidades de seguridad de Flask.
         JWT_SECRET_KEY (str): Clave secreta utilizada para generar y verificar tokens JWT.
+        COMPRESS_MIN_SIZE (int): Tamaño mínimo en bytes para comprimir una respuesta.
+        BATCH_MAX_IDS (int): Cantidad máxima de IDs aceptados en las búsquedas por lote (?ids=).
+        DEFAULT_PER_PAGE (int): Cantidad de elementos por página por defecto en los listados paginados.
+        MAX_PER_PAGE (int): Cantidad máxima de elementos por página en los listados paginados.
+        HABIT_SEARCH_INDEX_TTL (int): Segundos de vida del índice en memoria de búsqueda de hábitos (motores sin pg_trgm).
+        RECOMMENDATION_TOP_K (int): Hábitos relacionados que se conservan por hábito en la matriz de recomendaciones.
+        HEATMAP_CACHE_SIZE (int): Usuarios cuyos mapas de calor se mantienen en caché.
+        HEATMAP_CACHE_TTL (int): Segundos de vida de un mapa de calor en caché.
+        FK_CACHE_SIZE (int): Claves foráneas existentes que se mantienen en caché al validar las altas.
+        FK_CACHE_TTL (int): Segundos de vida de una clave foránea en caché.
+        AVAILABILITY_FILTER_TTL (int): Segundos entre reconstrucciones del filtro de Bloom de apodos y correos en uso.
+        AVAILABILITY_FILTER_ERROR_RATE (float): Proporción de falsos positivos del filtro (consultas que van a la base de datos).
+        ADMIN_TOKEN (str): Token que deben enviar los endpoints de administración en `X-Admin-Token`; sin valor quedan deshabilitados.
+        RETENTION_MAX_WEEKS (int): Semanas posteriores a la creación que se calculan por cohorte en la retención.
+        HABIT_STATS_WINDOW_DAYS (int): Días, incluido hoy, que abarca la tasa de completado de las estadísticas de hábitos.
+        ANALYTICS_WORKERS (int): Procesos usados por los cálculos de analítica (0 = cantidad de CPUs).
+        ANALYTICS_FETCH_SIZE (int): Filas que se leen por bloque al cargar las tablas para la analítica.
+        EXPORT_ROW_GROUP_SIZE (int): Filas por grupo (row group) en las exportaciones columnares.
+        EXPORT_ROOT (str): Directorio dentro del cual se escriben las exportaciones (`flask export snapshot` y el trabajo `export_snapshot`).
+        CHANGES_DEFAULT_LIMIT (int): Eventos por página por defecto en el feed de cambios (/changes).
+        CHANGES_MAX_LIMIT (int): Cantidad máxima de eventos por página en el feed de cambios.
+        SSE_MAX_CONNECTIONS (int): Streams de eventos (SSE) abiertos como máximo por proceso.
+        SSE_QUEUE_SIZE (int): Eventos pendientes por cliente antes de cerrar su stream por lento.
+        SSE_HEARTBEAT_INTERVAL (int): Segundos entre comentarios de mantenimiento de los streams de eventos.
+        SSE_POLL_INTERVAL (float): Segundos máximos de espera entre lecturas de la bandeja de salida para los streams.
+        SQLALCHEMY_REPLICA_URIS (list): URIs de las réplicas de lectura (variable DB_REPLICA_URIS, separadas por coma).
+        REPLICA_MAX_LAG_SECONDS (float): Retraso máximo de una réplica para recibir lecturas.
+        REPLICA_CHECK_INTERVAL (float): Segundos entre mediciones del retraso de cada réplica.
+        REPLICA_RETRY_AFTER (float): Segundos que se excluye una réplica después de un fallo.
+        REPLICA_PIN_SECONDS (int): Segundos que las lecturas de un cliente usan el primario después de una escritura.
+        PROFILE_TOKEN (str): Token del encabezado `X-Profile-Token` que activa el perfilado de una petición.
+        PROFILE_SAMPLE_RATE (float): Proporción de peticiones perfiladas al azar (0 = ninguna).
+        PROFILE_SAMPLE_INTERVAL (float): Segundos entre muestras de la pila al generar las pilas colapsadas.
+        PROFILE_DIR (str): Directorio en el que se guardan los perfiles.
+        PROFILE_MAX_FILES (int): Cantidad de perfiles que se conservan en el directorio.
+        USER_DELETE_BATCH_SIZE (int): Cantidad máxima de filas que se eliminan por transacción al borrar el historial de un usuario.
+        SYNC_TOKEN_OVERLAP (int): Segundos que se retrocede el token de sincronización para no perder cambios de transacciones concurrentes.
+        SYNC_TOMBSTONE_RETENTION_DAYS (int): Días que se conservan las lápidas; los tokens más antiguos reciben una sincronización completa.
+        REMINDER_SENDER (str): Emisor de recordatorios: 'file' (archivo local) o la ruta de una clase emisora.
+        REMINDER_FILE_PATH (str): Archivo en el que el emisor 'file' agrega los recordatorios (una línea JSON por recordatorio).
+        REMINDER_SLOT_HOURS (list): Hora de inicio de los turnos mañana, tarde y noche (variable separada por comas).
+        REMINDER_BATCH_SIZE (int): Recordatorios por lote al planificar y enviar un turno.
+        REMINDER_WORKERS (int): Hilos que envían lotes de recordatorios en paralelo.
+        REMINDER_MAX_ATTEMPTS (int): Intentos de envío de un recordatorio antes de marcarlo como fallido.
+        REMINDER_CLAIM_TIMEOUT (int): Segundos tras los cuales un recordatorio tomado y no enviado vuelve a estar pendiente.
+        JOB_WORKER_CONCURRENCY (int): Trabajos en segundo plano que ejecuta a la vez cada proceso de `flask jobs worker`.
+        JOB_MAX_ATTEMPTS (int): Intentos de ejecución de un trabajo por defecto antes de marcarlo como fallido.
+        JOB_RETRY_DELAY (int): Segundos de espera antes del primer reintento de un trabajo (se duplica en cada intento).
+        JOB_POLL_INTERVAL (float): Segundos máximos de espera de un worker entre búsquedas de trabajos pendientes.
+        JOB_HEARTBEAT_INTERVAL (int): Segundos entre señales de vida de un worker.
+        JOB_LOCK_TIMEOUT (int): Segundos sin señales de vida tras los cuales el trabajo de un worker vuelve a la cola.
     """
 
     # URI de conexión a la base de datos MySQL, con las credenciales y el host tomados del archivo .env
@@ -26,11 +84,110 @@ class Config:
     # Desactiva el rastreo de modificaciones para mejorar el rendimiento de la aplicación
     SQLALCHEMY_TRACK_MODIFICATIONS = False
 
-    # Activa el logging de las consultas SQL en la consola
-    SQLALCHEMY_ECHO = True
+    # Activa el logging de las consultas SQL en la consola (desactivado por defecto en producción)
+    SQLALCHEMY_ECHO = os.environ.get('SQLALCHEMY_ECHO', 'false' if APP_ENV == 'production' else 'true').lower() == 'true'
+
+    # Arranque rápido (por defecto en producción): no se publica la interfaz Swagger y Flask-Migrate
+    # solo se carga al ejecutar comandos `flask`. La especificación /swagger.json se genera en la
+    # primera petición que la solicita y queda en caché
+    FAST_STARTUP = os.environ.get('FAST_STARTUP', 'true' if APP_ENV == 'production' else 'false').lower() == 'true'
+
+    # Interfaz Swagger en la raíz de la API (desactivada por defecto con arranque rápido)
+    SWAGGER_UI_ENABLED = os.environ.get('SWAGGER_UI_ENABLED', 'false' if FAST_STARTUP else 'true').lower() == 'true'
 
     # Clave secreta para funcionalidades de seguridad como sesiones y cookies
     SECRET_KEY = os.environ.get('SECRET_KEY') or 'super_secret_key'
 
     # Clave secreta para la autenticación JWT, usada para generar tokens
     JWT_SECRET_KEY = os.environ.get('JWT_SECRET_KEY') or 'jwt_super_secret_key'
+
+    # Tamaño de los lotes usados al eliminar el historial de un usuario (fechas completadas y asignaciones)
+    USER_DELETE_BATCH_SIZE = int(os.environ.get('USER_DELETE_BATCH_SIZE', 1000))
+
+    # Compresión de respuestas (gzip, y brotli/zstd si sus paquetes están instalados)
+    COMPRESS_ENABLED = os.environ.get('COMPRESS_ENABLED', 'true').lower() == 'true'
+    COMPRESS_MIN_SIZE = int(os.environ.get('COMPRESS_MIN_SIZE', 1024))  # Las respuestas más pequeñas se envían sin comprimir
+    COMPRESS_LEVEL = int(os.environ.get('COMPRESS_LEVEL', 6))
+    COMPRESS_CACHE_SIZE = int(os.environ.get('COMPRESS_CACHE_SIZE', 64))  # Cuerpos comprimidos reutilizables en memoria
+
+    # Cantidad máxima de IDs por petición en las búsquedas por lote (?ids=1,2,3)
+    BATCH_MAX_IDS = int(os.environ.get('BATCH_MAX_IDS', 100))
+
+    # Paginación de los listados paginados (por ejemplo, la búsqueda de hábitos)
+    DEFAULT_PER_PAGE = int(os.environ.get('DEFAULT_PER_PAGE', 20))
+    MAX_PER_PAGE = int(os.environ.get('MAX_PER_PAGE', 100))
+
+    # Vida del índice en memoria usado por la búsqueda de hábitos cuando la base de datos no es PostgreSQL
+    HABIT_SEARCH_INDEX_TTL = int(os.environ.get('HABIT_SEARCH_INDEX_TTL', 60))
+
+    # Hábitos relacionados que se conservan por hábito en la matriz de co-ocurrencia de las recomendaciones
+    RECOMMENDATION_TOP_K = int(os.environ.get('RECOMMENDATION_TOP_K', 50))
+
+    # Caché en memoria de los mapas de calor anuales; se invalida con cada fecha completada del usuario
+    HEATMAP_CACHE_SIZE = int(os.environ.get('HEATMAP_CACHE_SIZE', 1024))
+    HEATMAP_CACHE_TTL = int(os.environ.get('HEATMAP_CACHE_TTL', 300))
+
+    # Caché en memoria de las claves foráneas existentes (Validations.check_fk_existence); se invalida
+    # al eliminar o desactivar las filas y el TTL acota el tiempo que otro proceso puede verla vigente
+    FK_CACHE_SIZE = int(os.environ.get('FK_CACHE_SIZE', 10000))
+    FK_CACHE_TTL = int(os.environ.get('FK_CACHE_TTL', 60))
+
+    # Filtro de Bloom de apodos y correos en uso para /users/availability
+    AVAILABILITY_FILTER_TTL = int(os.environ.get('AVAILABILITY_FILTER_TTL', 3600))
+    AVAILABILITY_FILTER_ERROR_RATE = float(os.environ.get('AVAILABILITY_FILTER_ERROR_RATE', 0.01))
+
+    # Token de los endpoints de administración (/admin); si no se define, esos endpoints responden 403
+    ADMIN_TOKEN = os.environ.get('ADMIN_TOKEN')
+
+    # Cálculos de analítica por lotes (`flask analytics ...`)
+    RETENTION_MAX_WEEKS = int(os.environ.get('RETENTION_MAX_WEEKS', 12))
+    HABIT_STATS_WINDOW_DAYS = int(os.environ.get('HABIT_STATS_WINDOW_DAYS', 30))
+    ANALYTICS_WORKERS = int(os.environ.get('ANALYTICS_WORKERS', 0))
+    ANALYTICS_FETCH_SIZE = int(os.environ.get('ANALYTICS_FETCH_SIZE', 10000))
+    EXPORT_ROW_GROUP_SIZE = int(os.environ.get('EXPORT_ROW_GROUP_SIZE', 50000))
+    EXPORT_ROOT = os.environ.get('EXPORT_ROOT', 'exports')
+
+    # Tamaño de página del feed de cambios (/changes)
+    CHANGES_DEFAULT_LIMIT = int(os.environ.get('CHANGES_DEFAULT_LIMIT', 100))
+    CHANGES_MAX_LIMIT = int(os.environ.get('CHANGES_MAX_LIMIT', 1000))
+
+    # Streams de actividad en vivo (server-sent events)
+    SSE_MAX_CONNECTIONS = int(os.environ.get('SSE_MAX_CONNECTIONS', 500))
+    SSE_QUEUE_SIZE = int(os.environ.get('SSE_QUEUE_SIZE', 100))
+    SSE_HEARTBEAT_INTERVAL = int(os.environ.get('SSE_HEARTBEAT_INTERVAL', 15))
+    SSE_POLL_INTERVAL = float(os.environ.get('SSE_POLL_INTERVAL', 1))
+
+    # Réplicas de lectura: las consultas de las peticiones GET se reparten entre ellas
+    SQLALCHEMY_REPLICA_URIS = [uri.strip() for uri in os.environ.get('DB_REPLICA_URIS', '').split(',') if uri.strip()]
+    REPLICA_MAX_LAG_SECONDS = float(os.environ.get('REPLICA_MAX_LAG_SECONDS', 5))
+    REPLICA_CHECK_INTERVAL = float(os.environ.get('REPLICA_CHECK_INTERVAL', 5))
+    REPLICA_RETRY_AFTER = float(os.environ.get('REPLICA_RETRY_AFTER', 30))
+    REPLICA_PIN_SECONDS = int(os.environ.get('REPLICA_PIN_SECONDS', 10))
+
+    # Perfilado de peticiones bajo demanda; sin token ni muestreo el middleware no se instala
+    PROFILE_TOKEN = os.environ.get('PROFILE_TOKEN')
+    PROFILE_SAMPLE_RATE = float(os.environ.get('PROFILE_SAMPLE_RATE', 0))
+    PROFILE_SAMPLE_INTERVAL = float(os.environ.get('PROFILE_SAMPLE_INTERVAL', 0.001))
+    PROFILE_DIR = os.environ.get('PROFILE_DIR', 'profiles')
+    PROFILE_MAX_FILES = int(os.environ.get('PROFILE_MAX_FILES', 200))
+
+    # Recordatorios por momento del día (`flask reminders ...`)
+    REMINDER_SENDER = os.environ.get('REMINDER_SENDER', 'file')
+    REMINDER_FILE_PATH = os.environ.get('REMINDER_FILE_PATH', 'reminders.jsonl')
+    REMINDER_SLOT_HOURS = [int(hour) for hour in os.environ.get('REMINDER_SLOT_HOURS', '6,13,19').split(',')]
+    REMINDER_BATCH_SIZE = int(os.environ.get('REMINDER_BATCH_SIZE', 1000))
+    REMINDER_WORKERS = int(os.environ.get('REMINDER_WORKERS', 8))
+    REMINDER_MAX_ATTEMPTS = int(os.environ.get('REMINDER_MAX_ATTEMPTS', 3))
+    REMINDER_CLAIM_TIMEOUT = int(os.environ.get('REMINDER_CLAIM_TIMEOUT', 300))
+
+    # Trabajos en segundo plano (`flask jobs worker`)
+    JOB_WORKER_CONCURRENCY = int(os.environ.get('JOB_WORKER_CONCURRENCY', 4))
+    JOB_MAX_ATTEMPTS = int(os.environ.get('JOB_MAX_ATTEMPTS', 3))
+    JOB_RETRY_DELAY = int(os.environ.get('JOB_RETRY_DELAY', 30))
+    JOB_POLL_INTERVAL = float(os.environ.get('JOB_POLL_INTERVAL', 5))
+    JOB_HEARTBEAT_INTERVAL = int(os.environ.get('JOB_HEARTBEAT_INTERVAL', 15))
+    JOB_LOCK_TIMEOUT = int(os.environ.get('JOB_LOCK_TIMEOUT', 120))
+
+    # Sincronización incremental de los clientes móviles (/users/<id>/sync)
+    SYNC_TOKEN_OVERLAP = int(os.environ.get('SYNC_TOKEN_OVERLAP', 60))
+    SYNC_TOMBSTONE_RETENTION_DAYS = int(os.environ.get('SYNC_TOMBSTONE_RETENTION_DAYS', 90))
@@ -0,0 +1,76 @@
+from flask import jsonify, make_response, request
+from flask_restx import Namespace, Resource, fields
+from app.services.analytics_service import AnalyticsService
+from app.services.job_service import JobService
+from app.middlewares.admin_auth import admin_required
+from app.utils.query_params import QueryParams
+from app.utils.exceptions import InvalidDataError
+
+# Crear un espacio de nombres (namespace) para las operaciones de administración
+admin_ns = Namespace('admin', description='Operaciones de administración (requieren el encabezado X-Admin-Token)')
+
+# Modelo de entrada para programar un trabajo en segundo plano
+entry_job_model = admin_ns.model('JobEntry', {
+    'job_type': fields.String(required=True, description='Tipo de trabajo (delete_user, refresh_cohort_retention, refresh_habit_stats, refresh_recommendations, export_snapshot)'),
+    'params': fields.Raw(description='Argumentos del trabajo (por ejemplo: {"user_id": 1})'),
+    'max_attempts': fields.Integer(description='Intentos permitidos (por defecto JOB_MAX_ATTEMPTS)')
+})
+
+
+@admin_ns.route('/retention')
+class RetentionResource(Resource):
+    @admin_ns.doc('get_cohort_retention', params={'since': 'Fecha (AAAA-MM-DD) desde la que se retornan las cohortes'})
+    @admin_required
+    def get(self):
+        """
+        Obtener la retención semanal por cohortes de usuarios
+        ---
+        Este método retorna la matriz de retención calculada por lotes con `flask analytics retention`:
+        para cada semana de creación de usuarios, la proporción de ellos que completó algún hábito en cada
+        una de las semanas siguientes (la posición 0 es la semana de creación).
+
+        Query Parameters:
+        - since: Fecha (AAAA-MM-DD); solo se retornan las cohortes de esa semana en adelante.
+
+        Responses:
+        - 200: Retorna `computed_at` y la lista de cohortes.
+        - 401: Si el token de administración es inválido.
+        - 403: Si los endpoints de administración están deshabilitados.
+        - 422: Si la fecha es inválida.
+        """
+        try:
+            since = QueryParams.get_date('since')
+        except InvalidDataError as e:
+            return make_response(jsonify({'message': str(e)}), 422)
+        return make_response(jsonify(AnalyticsService.get_cohort_retention(since)), 200)
+
+
+@admin_ns.route('/jobs')
+class JobEnqueueResource(Resource):
+    @admin_ns.doc('enqueue_job')
+    @admin_ns.expect(entry_job_model, validate=False)
+    @admin_required
+    def post(self):
+        """
+        Programar un trabajo en segundo plano
+        ---
+        Este método registra un trabajo que ejecutará un worker (`flask jobs worker`) fuera del ciclo de la
+        petición. Su estado se consulta en `GET /jobs/<job_id>`.
+
+        Body Parameters:
+        - job_type: Tipo de trabajo (delete_user, refresh_cohort_retention, refresh_habit_stats, refresh_recommendations, export_snapshot).
+        - params: Argumentos con nombre del servicio que ejecuta el trabajo.
+        - max_attempts: Intentos permitidos (opcional).
+
+        Responses:
+        - 202: Trabajo programado; retorna su ID.
+        - 401: Si el token de administración es inválido.
+        - 403: Si los endpoints de administración están deshabilitados.
+        - 422: Si el tipo de trabajo o sus argumentos son inválidos.
+        """
+        data = request.get_json(silent=True) or {}
+        try:
+            job = JobService.enqueue(data.get('job_type'), data.get('params'), data.get('max_attempts'))
+        except InvalidDataError as e:
+            return make_response(jsonify({'message': str(e)}), 422)
+        return make_response(jsonify({'message': 'Job enqueued', 'job_id': job.job_id}), 202)
@@ -1,6 +1,11 @@
+from datetime import date
 from flask import request, jsonify, make_response
 from flask_restx import Namespace, Resource, fields, marshal
 from app.services.assignment_service import AssignmentService
+from app.utils.api_fields import Weekdays
+from app.utils.query_params import QueryParams
+from app.utils.sparse_fields import SparseFields
+from app.utils.exceptions import InvalidDataError
 
 # Crear un espacio de nombres (namespace) para las asignaciones
 assignment_ns = Namespace('assignments', description='Operaciones relacionadas a la asignación de hábitos por cada usuario')
@@ -17,7 +22,24 @@ get_assignment_response_model = assignment_ns.model('AssignmentResponse', {
     'created_date': fields.DateTime(description='Fecha de la asignación'),
     'assignment_status': fields.Boolean(description='Estado de la asignación (activado/desactivado)'),
     'fk_user_id': fields.Integer(description='ID del usuario que asignó el hábito'),
-    'fk_habit_id': fields.Integer(description='ID del hábito asignado')
+    'fk_habit_id': fields.Integer(description='ID del hábito asignado'),
+    'schedule_days': Weekdays(description='Días de la semana en que corresponde el hábito, de 0 (lunes) a 6 (domingo)'),
+    'schedule_every': fields.Integer(description='Si se indica, el hábito corresponde cada N días'),
+    'schedule_start': fields.Date(description='Primer día de la repetición cada N días')
+})
+
+# Modelo de entrada para definir la programación de una asignación
+schedule_assignment_model = assignment_ns.model('AssignmentSchedule', {
+    'schedule_days': fields.List(fields.Integer(min=0, max=6), description='Días de la semana, de 0 (lunes) a 6 (domingo); por defecto todos'),
+    'schedule_every': fields.Integer(min=1, max=365, description='Repetir cada N días (opcional)'),
+    'schedule_start': fields.Date(description='Primer día de la repetición cada N días (por defecto hoy)')
+})
+
+# Modelo de entrada para desactivar asignaciones en bloque según filtros
+bulk_assignment_status_model = assignment_ns.model('AssignmentBulkStatus', {
+    'assignment_ids': fields.List(fields.Integer, description='IDs de las asignaciones'),
+    'fk_user_id': fields.Integer(description='ID del usuario de las asignaciones'),
+    'fk_habit_id': fields.Integer(description='ID del hábito de las asignaciones')
 })
 
 @assignment_ns.route('/')
@@ -47,18 +69,34 @@ class AssignmentResource(Resource):
             # Si la asignación ya existe se responde un mensaje de error con el código 422
             return make_response(jsonify({'message': str(e)}), 422)  
         
-    @assignment_ns.doc('get_all_assignments')
+    @assignment_ns.doc('get_all_assignments', params={'ids': 'IDs separados por coma para obtener varias asignaciones en una sola consulta', 'include_inactive': 'Si es "true", incluye las asignaciones desactivadas', 'fields': 'Campos a retornar separados por coma (por ejemplo: assignment_id,fk_habit_id)'})
     def get(self):
         """
         Obtener todas las asignaciones.
         ---
-        Este método permite obtener una lista de todas las asignaciones registradas en la base de datos.
+        Este método permite obtener una lista de todas las asignaciones activas registradas en la base de datos.
+
+        Query Parameters:
+        - include_inactive: Si es "true", también se retornan las asignaciones desactivadas.
+        - ids: IDs separados por coma (por ejemplo: 1,2,3); retorna solo esas asignaciones, en ese orden.
+        - fields: Campos a retornar separados por coma; solo esas columnas se consultan en la base de datos.
 
         Responses:
         - 200: Retorna una lista de todas las asignaciones.
+        - 200 (con ids): Retorna {'items': [...], 'missing': [...]} con las asignaciones en el orden pedido y los IDs no encontrados.
+        - 422: Si se pide un campo que no existe o los IDs son inválidos.
         """
-        assignments = AssignmentService.get_all_assignments()  
-        return marshal(assignments, get_assignment_response_model), 200
+        try:
+            selected_fields = SparseFields.parse(get_assignment_response_model)
+            assignment_ids = QueryParams.get_int_list('ids')
+        except InvalidDataError as e:
+            return make_response(jsonify({'message': str(e)}), 422)
+        if assignment_ids is not None:
+            # Búsqueda por lote: todos los IDs pedidos se resuelven en una sola consulta
+            assignments, missing = AssignmentService.get_assignments_by_ids(assignment_ids, QueryParams.get_bool('include_inactive'), selected_fields)
+            return {'items': marshal(assignments, SparseFields.response_model(get_assignment_response_model, selected_fields)), 'missing': missing}, 200
+        assignments = AssignmentService.get_all_assignments(QueryParams.get_bool('include_inactive'), selected_fields)  
+        return marshal(assignments, SparseFields.response_model(get_assignment_response_model, selected_fields)), 200
     
 
 @assignment_ns.route('/<int:assignment_id>')
@@ -90,24 +128,139 @@ class AssignmentDetailResource(Resource):
 @assignment_ns.route('/user/<int:fk_user_id>')
 @assignment_ns.param('fk_user_id', 'ID del usuario')
 class AssignmentUserResource(Resource):
-    @assignment_ns.doc('get_assignments_by_user_id')
+    @assignment_ns.doc('get_assignments_by_user_id', params={'include_inactive': 'Si es "true", incluye las asignaciones desactivadas', 'fields': 'Campos a retornar separados por coma (por ejemplo: assignment_id,fk_habit_id)'})
     def get(self, fk_user_id):
         """
         Obtener todas las asignaciones de un usuario específico.
         ---
-        Este método permite obtener todas las asignaciones asociadas a un usuario basado en su ID.
+        Este método permite obtener todas las asignaciones activas asociadas a un usuario basado en su ID.
 
         Path Parameters:
         - fk_user_id: ID del usuario.
 
+        Query Parameters:
+        - include_inactive: Si es "true", también se retornan las asignaciones desactivadas.
+        - fields: Campos a retornar separados por coma; solo esas columnas se consultan en la base de datos.
+
         Responses:
         - 200: Retorna una lista de asignaciones asociadas al usuario.
         - 404: Si no se encuentran asignaciones para el usuario.
+        - 422: Si se pide un campo que no existe.
         """
         try:
+            selected_fields = SparseFields.parse(get_assignment_response_model)
             # Llama al servicio para obtener las asignaciones asociadas al ID del usuario
-            assignments = AssignmentService.get_assignments_by_user_id(fk_user_id)  
-            return marshal(assignments, get_assignment_response_model), 200
+            assignments = AssignmentService.get_assignments_by_user_id(fk_user_id, QueryParams.get_bool('include_inactive'), selected_fields)  
+            return marshal(assignments, SparseFields.response_model(get_assignment_response_model, selected_fields)), 200
+        except InvalidDataError as e:
+            return make_response(jsonify({'message': str(e)}), 422)
         except ValueError as e:
             # Si las asignaciones no son encontradas, devolvemos un mensaje de error con el código 404
             return make_response(jsonify({'message': str(e)}), 404)
+
+
+@assignment_ns.route('/deactivate')
+class AssignmentBulkDeactivateResource(Resource):
+    @assignment_ns.doc('deactivate_assignments_by_filter')
+    @assignment_ns.expect(bulk_assignment_status_model, validate=True)
+    def patch(self):
+        """
+        Desactivar asignaciones en bloque.
+        ---
+        Este método desactiva, en una sola operación, todas las asignaciones que cumplan los filtros indicados.
+
+        Body Parameters:
+        - assignment_ids: IDs de las asignaciones (opcional).
+        - fk_user_id: ID del usuario (opcional).
+        - fk_habit_id: ID del hábito (opcional).
+
+        Responses:
+        - 200: Retorna la cantidad de asignaciones desactivadas.
+        - 422: Si no se indica ningún filtro.
+        """
+        data = request.get_json()
+        try:
+            count = AssignmentService.set_assignments_status_by_filter(
+                False, data.get('assignment_ids'), data.get('fk_user_id'), data.get('fk_habit_id'))
+            return make_response(jsonify({'message': 'Assignments deactivated successfully', 'count': count}), 200)
+        except ValueError as e:
+            return make_response(jsonify({'message': str(e)}), 422)
+
+
+@assignment_ns.route('/<int:assignment_id>/deactivate')
+@assignment_ns.param('assignment_id', 'ID de la asignación')
+class AssignmentDeactivateResource(Resource):
+    @assignment_ns.doc('deactivate_assignment')
+    def patch(self, assignment_id):
+        """
+        Desactivar una asignación.
+        ---
+        Este método desactiva una asignación conservando su historial de fechas completadas.
+
+        Responses:
+        - 200: Asignación desactivada exitosamente.
+        - 404: Si la asignación no es encontrada.
+        """
+        try:
+            AssignmentService.set_assignment_status(assignment_id, False)
+            return make_response(jsonify({'message': 'Assignment deactivated successfully'}), 200)
+        except ValueError as e:
+            return make_response(jsonify({'message': str(e)}), 404)
+
+
+@assignment_ns.route('/<int:assignment_id>/reactivate')
+@assignment_ns.param('assignment_id', 'ID de la asignación')
+class AssignmentReactivateResource(Resource):
+    @assignment_ns.doc('reactivate_assignment')
+    def patch(self, assignment_id):
+        """
+        Reactivar una asignación.
+        ---
+        Este método vuelve a activar una asignación previamente desactivada.
+
+        Responses:
+        - 200: Asignación reactivada exitosamente.
+        - 404: Si la asignación no es encontrada.
+        """
+        try:
+            AssignmentService.set_assignment_status(assignment_id, True)
+            return make_response(jsonify({'message': 'Assignment reactivated successfully'}), 200)
+        except ValueError as e:
+            return make_response(jsonify({'message': str(e)}), 404)
+
+
+@assignment_ns.route('/<int:assignment_id>/schedule')
+@assignment_ns.param('assignment_id', 'ID de la asignación')
+class AssignmentScheduleResource(Resource):
+    @assignment_ns.doc('set_assignment_schedule')
+    @assignment_ns.expect(schedule_assignment_model, validate=True)
+    def put(self, assignment_id):
+        """
+        Definir la programación de una asignación.
+        ---
+        Este método define en qué días corresponde realizar el hábito. Los días de la semana y la
+        repetición cada N días se combinan; un cuerpo vacío vuelve a programar el hábito todos los días.
+
+        Body Parameters:
+        - schedule_days: Días de la semana, de 0 (lunes) a 6 (domingo) (opcional).
+        - schedule_every: Repetir cada N días, entre 1 y 365 (opcional).
+        - schedule_start: Primer día (AAAA-MM-DD) de la repetición cada N días (opcional, por defecto hoy).
+
+        Responses:
+        - 200: Retorna la asignación con su nueva programación.
+        - 404: Si la asignación no es encontrada.
+        - 422: Si la programación es inválida.
+        """
+        data = request.get_json()
+        try:
+            schedule_start = date.fromisoformat(data['schedule_start']) if data.get('schedule_start') else None
+        except ValueError:
+            return make_response(jsonify({'message': 'schedule_start must be a date (YYYY-MM-DD).'}), 422)
+        try:
+            assignment = AssignmentService.set_assignment_schedule(
+                assignment_id, data.get('schedule_days'), data.get('schedule_every'), schedule_start)
+            return marshal(assignment, get_assignment_response_model), 200
+        except InvalidDataError as e:
+            return make_response(jsonify({'message': str(e)}), 422)
+        except ValueError as e:
+            return make_response(jsonify({'message': str(e)}), 404)
@@ -0,0 +1,53 @@
+from flask import request, jsonify, make_response, current_app
+from flask_restx import Namespace, Resource, fields, marshal
+from app.services.outbox_service import OutboxService
+from app.utils.query_params import QueryParams
+from app.utils.exceptions import InvalidDataError
+
+# Crear un espacio de nombres (namespace) para el feed de cambios
+change_ns = Namespace('changes', description='Feed de cambios para sincronizar servicios externos')
+
+# Modelo de salida de un evento de cambio
+change_event_model = change_ns.model('ChangeEvent', {
+    'event_id': fields.Integer(description='ID del evento'),
+    'entity': fields.String(description='Tipo de entidad (user, habit, assignment, completed_date)'),
+    'entity_id': fields.Integer(description='ID de la entidad'),
+    'operation': fields.String(description='Operación (created, updated, deleted)'),
+    'payload': fields.Raw(description='Datos de la entidad'),
+    'created_at': fields.DateTime(description='Fecha y hora del cambio')
+})
+
+# Modelo de salida de una página del feed de cambios
+change_page_model = change_ns.model('ChangePage', {
+    'items': fields.List(fields.Nested(change_event_model)),
+    'next_cursor': fields.String(description='Valor de `after` para pedir la siguiente página'),
+    'has_more': fields.Boolean(description='Indica si quedan eventos por leer')
+})
+
+
+@change_ns.route('/')
+class ChangeResource(Resource):
+    @change_ns.doc('get_changes', params={'after': 'El next_cursor de la respuesta anterior (se omite la primera vez)', 'limit': 'Cantidad máxima de eventos'})
+    def get(self):
+        """
+        Obtener los cambios de asignaciones y fechas completadas posteriores a un cursor
+        ---
+        Este método retorna, en orden, los eventos registrados en la bandeja de salida (outbox) en la misma
+        transacción que cada cambio. Para sincronizar, se pide con `after` igual al `next_cursor` de la
+        respuesta anterior hasta que `has_more` sea falso.
+
+        Query Parameters:
+        - after: El next_cursor de la respuesta anterior (se omite para empezar desde el principio). Solo
+          se entregan eventos de transacciones terminadas, así un evento confirmado tarde no se pierde.
+        - limit: Cantidad máxima de eventos (entre 1 y CHANGES_MAX_LIMIT).
+
+        Responses:
+        - 200: Retorna los eventos, el siguiente cursor y si quedan eventos por leer.
+        - 422: Si el cursor o el límite son inválidos.
+        """
+        try:
+            limit = QueryParams.get_int('limit', current_app.config['CHANGES_DEFAULT_LIMIT'], 1, current_app.config['CHANGES_MAX_LIMIT'])
+            changes = OutboxService.get_changes(request.args.get('after'), limit)
+        except InvalidDataError as e:
+            return make_response(jsonify({'message': str(e)}), 422)
+        return marshal(changes, change_page_model), 200
@@ -1,6 +1,9 @@
 from flask import request, jsonify, make_response
 from flask_restx import Namespace, Resource, fields, marshal
 from app.services.completed_date_service import CompletedDateService
+from app.utils.sparse_fields import SparseFields
+from app.utils.query_params import QueryParams
+from app.utils.exceptions import InvalidDataError
 
 # Definición del namespace para las operaciones relacionadas con las fechas completadas de los hábitos.
 completed_date_ns = Namespace('completed_dates', description='Operaciones relacionadas con las fechas en que se completan los hábitos asignados')
@@ -24,18 +27,28 @@ class CompletedDateResource(Resource):
     Recurso para manejar operaciones de fechas completadas de hábitos.
     """
 
-    @completed_date_ns.doc('get_all_dates')
+    @completed_date_ns.doc('get_all_dates', params={'include_inactive': 'Si es "true", incluye las fechas de asignaciones o usuarios desactivados', 'fields': 'Campos a retornar separados por coma (por ejemplo: completed_date,fk_assignment_id)'})
     def get(self):
         """
         Obtener todas las fechas completadas registradas.
         ---
         Este método recupera todas las fechas en que se completaron hábitos asignados en la base de datos.
+        Por defecto se omiten las fechas de asignaciones desactivadas y de usuarios desactivados.
+        Con el parámetro `fields` solo se consultan y retornan las columnas indicadas.
+
+        Query Parameters:
+        - include_inactive: Si es "true", también se retornan las fechas de asignaciones o usuarios desactivados.
         
         Returns:
             Response: JSON con la lista de fechas completadas y el código de estado 200.
+            Response: Mensaje de error con el código de estado 422 si se pide un campo que no existe.
         """
-        dates = CompletedDateService.get_all_dates()
-        return marshal(dates, get_completed_date_response_model), 200
+        try:
+            selected_fields = SparseFields.parse(get_completed_date_response_model)
+        except InvalidDataError as e:
+            return make_response(jsonify({'message': str(e)}), 422)
+        dates = CompletedDateService.get_all_dates(QueryParams.get_bool('include_inactive'), selected_fields)
+        return marshal(dates, SparseFields.response_model(get_completed_date_response_model, selected_fields)), 200
 
     @completed_date_ns.doc('create_completed_date')
     @completed_date_ns.expect(entry_completed_date_model, validate=True)
@@ -64,12 +77,17 @@ class CompletedDateAssignmentResource(Resource):
     Recurso para manejar operaciones de fechas completadas por ID de asignación.
     """
 
-    @completed_date_ns.doc('get_all_dates_by_assignment_id')
+    @completed_date_ns.doc('get_all_dates_by_assignment_id', params={'include_inactive': 'Si es "true", incluye las fechas aunque la asignación o su usuario estén desactivados', 'fields': 'Campos a retornar separados por coma (por ejemplo: completed_date,fk_assignment_id)'})
     def get(self, fk_assignment_id):
         """
         Obtener todas las fechas de completación por ID de asignación.
         ---
         Este método permite obtener todas las fechas en que se completó un hábito para una asignación específica.
+        Si la asignación o su usuario están desactivados no se retornan fechas, salvo con `include_inactive`.
+        Con el parámetro `fields` solo se consultan y retornan las columnas indicadas.
+
+        Query Parameters:
+        - include_inactive: Si es "true", también se retornan las fechas aunque la asignación o su usuario estén desactivados.
 
         Args:
             fk_assignment_id (int): ID de la asignación a consultar.
@@ -77,12 +95,16 @@ class CompletedDateAssignmentResource(Resource):
         Returns:
             Response: Lista de fechas asociadas a la asignación y el código de estado 200.
             Response: Mensaje de error con el código de estado 404 si no existen fechas.
+            Response: Mensaje de error con el código de estado 422 si se pide un campo que no existe.
         """
         try:
+            selected_fields = SparseFields.parse(get_completed_date_response_model)
             # Llama al servicio para obtener todas las fechas asociadas a la asignación específica.
-            dates = CompletedDateService.get_all_dates_by_assignment_id(fk_assignment_id)
+            dates = CompletedDateService.get_all_dates_by_assignment_id(fk_assignment_id, QueryParams.get_bool('include_inactive'), selected_fields)
             # Si se encuentran las fechas, se formatea la respuesta con marshal.
-            return marshal(dates, get_completed_date_response_model), 200
+            return marshal(dates, SparseFields.response_model(get_completed_date_response_model, selected_fields)), 200
+        except InvalidDataError as e:
+            return make_response(jsonify({'message': str(e)}), 422)
         except ValueError as e:
             # En caso de error, se retorna un mensaje con el código de error 422.
             return make_response(jsonify({'message': str(e)}), 404)
@@ -1,7 +1,10 @@
 from flask import request, jsonify, make_response
 from flask_restx import Namespace, Resource, fields, marshal
 from app.services.habit_service import HabitService
+from app.utils.query_params import QueryParams
+from app.utils.sparse_fields import SparseFields
 from app.utils.exceptions import *
+from app.middlewares.compression import cache_compressed_response
 
 # Crear un espacio de nombres (namespace) para los hábitos
 habit_ns = Namespace('habits', description='Operaciones relacionadas con los hábitos')
@@ -20,22 +23,60 @@ get_habit_response_model = habit_ns.model('HabitResponse', {
     'habit_status': fields.Boolean(description='Estado del hábito (activo o inactivo)'),
 })
 
+# Campos de las estadísticas precalculadas que se agregan con ?include=stats
+habit_stats_fields = {
+    'active_users': fields.Integer(description='Usuarios activos con el hábito asignado'),
+    'active_assignments': fields.Integer(description='Asignaciones activas del hábito'),
+    'completion_rate': fields.Float(description='Proporción de los días programados de los últimos HABIT_STATS_WINDOW_DAYS días que se completaron'),
+    'stats_computed_at': fields.DateTime(description='Fecha y hora del cálculo de las estadísticas'),
+}
+
+# Modelo de entrada para desactivar hábitos en bloque según filtros
+bulk_habit_status_model = habit_ns.model('HabitBulkStatus', {
+    'habit_ids': fields.List(fields.Integer, description='IDs de los hábitos'),
+    'habit_name': fields.String(description='Nombre exacto de los hábitos'),
+    'time_of_day': fields.String(description='Momento del día (mañana, tarde, noche)', enum=['mañana', 'tarde', 'noche']),
+})
+
 # Definir el controlador de hábitos con decoradores para la documentación
 @habit_ns.route('/')
 class HabitResource(Resource):
 
-    @habit_ns.doc('get_all_habits')
+    @cache_compressed_response  # El catálogo cambia poco: se reutiliza su cuerpo comprimido
+    @habit_ns.doc('get_all_habits', params={'ids': 'IDs separados por coma para obtener varios hábitos en una sola consulta', 'include_inactive': 'Si es "true", incluye los hábitos desactivados', 'fields': 'Campos a retornar separados por coma (por ejemplo: habit_id,habit_name)', 'include': 'Si es "stats", agrega las estadísticas de popularidad precalculadas'})
     def get(self):
         """
         Obtener todos los hábitos con sus datos
         ---
-        Este método permite obtener una lista de todos los hábitos registrados.
+        Este método permite obtener una lista de todos los hábitos activos registrados.
+
+        Query Parameters:
+        - include_inactive: Si es "true", también se retornan los hábitos desactivados.
+        - ids: IDs separados por coma (por ejemplo: 1,2,3); retorna solo esos hábitos, en ese orden.
+        - fields: Campos a retornar separados por coma; solo esas columnas se consultan en la base de datos.
+        - include: Si es "stats", cada hábito incluye `active_users`, `active_assignments`, `completion_rate`
+          y `stats_computed_at`, leídos de las estadísticas que recalcula `flask analytics habit-stats`.
 
         Responses:
         - 200: Retorna una lista de todos los hábitos con sus datos.
+        - 200 (con ids): Retorna {'items': [...], 'missing': [...]} con los hábitos en el orden pedido y los IDs no encontrados.
+        - 422: Si se pide un campo que no existe, un valor de include desconocido o los IDs son inválidos.
         """
-        habits = HabitService.get_all_habits()  # Llama al servicio para obtener todos los hábitos
-        return marshal(habits, get_habit_response_model), 200 # Retorna todos los hábitos en el formato estipulado
+        try:
+            selected_fields = SparseFields.parse(get_habit_response_model)
+            habit_ids = QueryParams.get_int_list('ids')
+            include_stats = 'stats' in QueryParams.get_include(('stats',))
+        except InvalidDataError as e:
+            return make_response(jsonify({'message': str(e)}), 422)
+        response_model = SparseFields.response_model(get_habit_response_model, selected_fields)
+        if include_stats:
+            response_model = {**response_model, **habit_stats_fields}
+        if habit_ids is not None:
+            # Búsqueda por lote: todos los IDs pedidos se resuelven en una sola consulta
+            habits, missing = HabitService.get_habits_by_ids(habit_ids, QueryParams.get_bool('include_inactive'), selected_fields, include_stats)
+            return {'items': marshal(habits, response_model), 'missing': missing}, 200
+        habits = HabitService.get_all_habits(QueryParams.get_bool('include_inactive'), selected_fields, include_stats)  # Llama al servicio para obtener todos los hábitos
+        return marshal(habits, response_model), 200 # Retorna todos los hábitos en el formato estipulado
 
     @habit_ns.doc('create_habit')
     @habit_ns.expect(entry_habit_model, validate=True)  # Decorador para esperar el modelo en la petición
@@ -74,26 +115,71 @@ class HabitResource(Resource):
             return make_response(jsonify({'message': str(e)}), 422) 
         
 
+
+@habit_ns.route('/search')
+class HabitSearchResource(Resource):
+
+    @habit_ns.doc('search_habits', params={
+        'q': 'Término a buscar en el nombre del hábito',
+        'page': 'Número de página (por defecto 1)',
+        'per_page': 'Resultados por página (por defecto 20)'
+    })
+    def get(self):
+        """
+        Buscar hábitos por nombre
+        ---
+        Este método busca hábitos activos cuyo nombre empiece por el término, lo contenga o se le parezca.
+        Los resultados se ordenan por relevancia (primero las coincidencias por prefijo) y se paginan.
+
+        Query Parameters:
+        - q: Término de búsqueda.
+        - page: Número de página.
+        - per_page: Cantidad de resultados por página.
+
+        Responses:
+        - 200: Retorna {'items': [...], 'page', 'per_page', 'total'}.
+        - 422: Si falta el término o la paginación es inválida.
+        """
+        try:
+            page, per_page = QueryParams.get_pagination()
+            habits, total = HabitService.search_habits(request.args.get('q'), page, per_page)
+            return {
+                'items': marshal(habits, get_habit_response_model),
+                'page': page,
+                'per_page': per_page,
+                'total': total
+            }, 200
+        except InvalidDataError as e:
+            return make_response(jsonify({'message': str(e)}), 422)
+
 @habit_ns.route('/<int:habit_id>')
 @habit_ns.param('habit_id', 'ID del hábito')
 class HabitDetailResource(Resource):
 
-    @habit_ns.doc('get_habit_by_id')
+    @habit_ns.doc('get_habit_by_id', params={'include_inactive': 'Si es "true", retorna el hábito aunque esté desactivado', 'fields': 'Campos a retornar separados por coma (por ejemplo: habit_id,habit_name)'})
     def get(self, habit_id):
         """
         Obtener un hábito por su ID
         ---
         Este método permite obtener todos los datos de un hábito basado en su ID.
 
+        Query Parameters:
+        - include_inactive: Si es "true", retorna el hábito aunque esté desactivado.
+        - fields: Campos a retornar separados por coma; solo esas columnas se consultan en la base de datos.
+
         Responses:
         - 200: Retorna un JSON con todos los datos del hábito.
         - 404: Si el hábito no es encontrado.
+        - 422: Si se pide un campo que no existe.
         """
         try:
+            selected_fields = SparseFields.parse(get_habit_response_model)
             # Llama al servicio para obtener el hábito asociado al ID
-            habit = HabitService.get_habit_by_id(habit_id)
+            habit = HabitService.get_habit_by_id(habit_id, QueryParams.get_bool('include_inactive'), selected_fields)
             # Retorna todos los datos del hábito en el formato estipulado
-            return marshal(habit, get_habit_response_model), 200
+            return marshal(habit, SparseFields.response_model(get_habit_response_model, selected_fields)), 200
+        except InvalidDataError as e:
+            return make_response(jsonify({'message': str(e)}), 422)
         except NotFoundError as e:
             return make_response(jsonify({'message': str(e)}), 404) 
 
@@ -149,4 +235,77 @@ class HabitDetailResource(Resource):
             return make_response(jsonify({'message': 'Habit deleted successfully'}), 200)
         except NotFoundError as e:
             # Si el hábito no es encontrado, devolvemos un mensaje de error con el código 404
-            return make_response(jsonify({'message': str(e)}), 404) 
+            return make_response(jsonify({'message': str(e)}), 404)
+
+
+@habit_ns.route('/deactivate')
+class HabitBulkDeactivateResource(Resource):
+
+    @habit_ns.doc('deactivate_habits_by_filter')
+    @habit_ns.expect(bulk_habit_status_model, validate=True)
+    def patch(self):
+        """
+        Desactivar hábitos en bloque
+        ---
+        Este método desactiva, en una sola operación, todos los hábitos que cumplan los filtros indicados.
+
+        Body Parameters:
+        - habit_ids: IDs de los hábitos (opcional).
+        - habit_name: Nombre exacto de los hábitos (opcional).
+        - time_of_day: Momento del día de los hábitos (opcional).
+
+        Responses:
+        - 200: Retorna la cantidad de hábitos desactivados.
+        - 422: Si no se indica ningún filtro o los datos son inválidos.
+        """
+        data = request.get_json()
+        try:
+            count = HabitService.set_habits_status_by_filter(
+                False, data.get('habit_ids'), data.get('habit_name'), data.get('time_of_day'))
+            return make_response(jsonify({'message': 'Habits deactivated successfully', 'count': count}), 200)
+        except InvalidDataError as e:
+            return make_response(jsonify({'message': str(e)}), 422)
+
+
+@habit_ns.route('/<int:habit_id>/deactivate')
+@habit_ns.param('habit_id', 'ID del hábito')
+class HabitDeactivateResource(Resource):
+
+    @habit_ns.doc('deactivate_habit')
+    def patch(self, habit_id):
+        """
+        Desactivar un hábito
+        ---
+        Este método desactiva un hábito sin eliminarlo. Los hábitos desactivados no aparecen en las lecturas por defecto.
+
+        Responses:
+        - 200: Hábito desactivado con éxito.
+        - 404: Si el hábito no se encuentra.
+        """
+        try:
+            HabitService.set_habit_status(habit_id, False)
+            return make_response(jsonify({'message': 'Habit deactivated successfully'}), 200)
+        except NotFoundError as e:
+            return make_response(jsonify({'message': str(e)}), 404)
+
+
+@habit_ns.route('/<int:habit_id>/reactivate')
+@habit_ns.param('habit_id', 'ID del hábito')
+class HabitReactivateResource(Resource):
+
+    @habit_ns.doc('reactivate_habit')
+    def patch(self, habit_id):
+        """
+        Reactivar un hábito
+        ---
+        Este método vuelve a activar un hábito previamente desactivado.
+
+        Responses:
+        - 200: Hábito reactivado con éxito.
+        - 404: Si el hábito no se encuentra.
+        """
+        try:
+            HabitService.set_habit_status(habit_id, True)
+            return make_response(jsonify({'message': 'Habit reactivated successfully'}), 200)
+        except NotFoundError as e:
+            return make_response(jsonify({'message': str(e)}), 404)
@@ -0,0 +1,47 @@
+from flask import jsonify, make_response
+from flask_restx import Namespace, Resource, fields, marshal
+from app.services.job_service import JobService
+
+# Crear un espacio de nombres (namespace) para los trabajos en segundo plano
+job_ns = Namespace('jobs', description='Estado de los trabajos en segundo plano')
+
+# Modelo de salida de un trabajo
+job_model = job_ns.model('Job', {
+    'job_id': fields.String(description='ID del trabajo'),
+    'job_type': fields.String(description='Tipo de trabajo (delete_user, refresh_cohort_retention, ...)'),
+    'params': fields.Raw(description='Argumentos del trabajo'),
+    'status': fields.String(description='Estado (pending, running, finished, failed)'),
+    'progress': fields.Raw(description='Último progreso reportado por el trabajo'),
+    'result': fields.Raw(description='Resultado del trabajo, si terminó'),
+    'error': fields.String(description='Último error de ejecución'),
+    'attempts': fields.Integer(description='Intentos realizados'),
+    'max_attempts': fields.Integer(description='Intentos permitidos'),
+    'run_after': fields.DateTime(description='Momento a partir del cual puede ejecutarse (se aplaza en los reintentos)'),
+    'created_date': fields.DateTime(description='Fecha y hora de creación'),
+    'started_date': fields.DateTime(description='Inicio del último intento'),
+    'finished_date': fields.DateTime(description='Fecha y hora de finalización')
+})
+
+
+@job_ns.route('/<string:job_id>')
+@job_ns.param('job_id', 'ID del trabajo')
+class JobResource(Resource):
+    @job_ns.doc('get_job')
+    def get(self, job_id):
+        """
+        Obtener el estado de un trabajo en segundo plano
+        ---
+        Este método permite consultar el estado, el progreso y el resultado de un trabajo ejecutado por los
+        workers (`flask jobs worker`).
+
+        Path Parameters:
+        - job_id: El ID del trabajo.
+
+        Responses:
+        - 200: Retorna el estado del trabajo.
+        - 404: Si el trabajo no es encontrado.
+        """
+        try:
+            return marshal(JobService.get_job(job_id), job_model), 200
+        except ValueError as e:
+            return make_response(jsonify({'message': str(e)}), 404)
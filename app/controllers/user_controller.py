@@ -1,6 +1,16 @@
-from flask import request, jsonify, make_response
+from datetime import date
+from flask import request, jsonify, make_response, current_app, Response
 from flask_restx import Namespace, Resource, fields, marshal
 from app.services.user_service import UserService
+from app.services.recommendation_service import RecommendationService
+from app.services.completed_date_service import CompletedDateService
+from app.services.event_broker import EventBroker
+from app.services.assignment_service import AssignmentService
+from app.services.sync_service import SyncService
+from app.utils.api_fields import Weekdays
+from app.utils.query_params import QueryParams
+from app.utils.sparse_fields import SparseFields
+from app.utils.exceptions import InvalidDataError
 
 # Crear un espacio de nombres (namespace) para los usuarios
 user_ns = Namespace('users', description='Operaciones relacionadas con los usuarios')
@@ -25,23 +35,115 @@ get_user_response_model = user_ns.model('GetResponse', {
     'user_created_date': fields.DateTime(description='Fecha y hora de creación del usuario')
 })
 
+# Modelo de salida de las recomendaciones de hábitos para un usuario
+get_recommendation_response_model = user_ns.model('RecommendationResponse', {
+    'habit_id': fields.Integer(description='ID del hábito recomendado'),
+    'habit_name': fields.String(description='Nombre del hábito recomendado'),
+    'time_of_day': fields.String(description='Momento del día (mañana, tarde, noche)'),
+    'score': fields.Integer(description='Usuarios que registran este hábito junto con los hábitos del usuario')
+})
+
+# Modelo de salida de los hábitos pendientes de un usuario en un día
+get_due_assignment_response_model = user_ns.model('DueAssignmentResponse', {
+    'assignment_id': fields.Integer(description='ID de la asignación'),
+    'fk_habit_id': fields.Integer(description='ID del hábito'),
+    'habit_name': fields.String(description='Nombre del hábito'),
+    'time_of_day': fields.String(description='Momento del día (mañana, tarde, noche)'),
+    'schedule_days': Weekdays(description='Días de la semana en que corresponde el hábito, de 0 (lunes) a 6 (domingo)'),
+    'schedule_every': fields.Integer(description='Si se indica, el hábito corresponde cada N días'),
+    'schedule_start': fields.Date(description='Primer día de la repetición cada N días')
+})
+
+# Modelos de salida de la sincronización incremental de la aplicación móvil
+sync_user_model = user_ns.inherit('SyncUser', get_user_response_model, {
+    'updated_at': fields.DateTime(description='Fecha y hora de la última modificación')
+})
+
+sync_habit_model = user_ns.model('SyncHabit', {
+    'habit_id': fields.Integer(description='ID del hábito'),
+    'habit_name': fields.String(description='Nombre del hábito'),
+    'time_of_day': fields.String(description='Momento del día (mañana, tarde, noche)'),
+    'habit_status': fields.Boolean(description='Estado del hábito (activo o inactivo)'),
+    'updated_at': fields.DateTime(description='Fecha y hora de la última modificación')
+})
+
+sync_assignment_model = user_ns.model('SyncAssignment', {
+    'assignment_id': fields.Integer(description='ID de la asignación'),
+    'fk_habit_id': fields.Integer(description='ID del hábito'),
+    'assignment_status': fields.Boolean(description='Estado de la asignación (activa o inactiva)'),
+    'created_date': fields.DateTime(description='Fecha y hora de creación de la asignación'),
+    'schedule_days': Weekdays(description='Días de la semana en que corresponde el hábito, de 0 (lunes) a 6 (domingo)'),
+    'schedule_every': fields.Integer(description='Si se indica, el hábito corresponde cada N días'),
+    'schedule_start': fields.Date(description='Primer día de la repetición cada N días'),
+    'updated_at': fields.DateTime(description='Fecha y hora de la última modificación')
+})
+
+sync_completed_date_model = user_ns.model('SyncCompletedDate', {
+    'completed_date_id': fields.Integer(description='ID de la fecha completada'),
+    'fk_assignment_id': fields.Integer(description='ID de la asignación'),
+    'completed_date': fields.Date(description='Fecha en que se completó el hábito'),
+    'updated_at': fields.DateTime(description='Fecha y hora de la última modificación')
+})
+
+sync_deleted_model = user_ns.model('SyncDeleted', {
+    'habits': fields.List(fields.Integer, description='IDs de los hábitos eliminados'),
+    'assignments': fields.List(fields.Integer, description='IDs de las asignaciones eliminadas'),
+    'completed_dates': fields.List(fields.Integer, description='IDs de las fechas completadas eliminadas')
+})
+
+sync_response_model = user_ns.model('SyncResponse', {
+    'token': fields.String(description='Token para enviar como `since` en la siguiente sincronización'),
+    'full_sync': fields.Boolean(description='Si es true, el cliente debe reemplazar sus datos en lugar de aplicar los cambios'),
+    'user': fields.Nested(sync_user_model, allow_null=True, description='Datos del usuario, si cambiaron'),
+    'habits': fields.List(fields.Nested(sync_habit_model)),
+    'assignments': fields.List(fields.Nested(sync_assignment_model)),
+    'completed_dates': fields.List(fields.Nested(sync_completed_date_model)),
+    'deleted': fields.Nested(sync_deleted_model, description='IDs eliminados desde la sincronización anterior')
+})
+
+# Modelo de salida del estado de una eliminación en segundo plano (el ID de la tarea es el del trabajo en /jobs)
+user_deletion_task_model = user_ns.model('UserDeletionTask', {
+    'task_id': fields.String(attribute='job_id', description='ID de la tarea'),
+    'status': fields.String(description='Estado (pending, running, finished, failed)'),
+    'progress': fields.Raw(description='Filas eliminadas y totales'),
+    'error': fields.String(description='Último error'),
+    'created_date': fields.DateTime(description='Fecha y hora en que se programó'),
+    'finished_date': fields.DateTime(description='Fecha y hora de finalización')
+})
+
 # Definir el controlador de usuarios con decoradores para la documentación
 @user_ns.route('/')
 class UserResource(Resource):
-    @user_ns.doc('get_all_users')
+    @user_ns.doc('get_all_users', params={'ids': 'IDs separados por coma para obtener varios usuarios en una sola consulta', 'include_inactive': 'Si es "true", incluye los usuarios desactivados', 'fields': 'Campos a retornar separados por coma (por ejemplo: user_id,nickname)'})
     def get(self):
         """
         Obtener todos los usuarios con sus datos
         ---
-        Este método permite obtener una lista de todos los usuarios registrados en la base de datos.
+        Este método permite obtener una lista de todos los usuarios activos registrados en la base de datos.
+
+        Query Parameters:
+        - include_inactive: Si es "true", también se retornan los usuarios desactivados.
+        - ids: IDs separados por coma (por ejemplo: 1,2,3); retorna solo esos usuarios, en ese orden.
+        - fields: Campos a retornar separados por coma; solo esas columnas se consultan en la base de datos.
 
         Responses:
         - 200: Retorna todos los datos de todos los usuarios.
+        - 200 (con ids): Retorna {'items': [...], 'missing': [...]} con los usuarios en el orden pedido y los IDs no encontrados.
+        - 422: Si se pide un campo que no existe o los IDs son inválidos.
         """
+        try:
+            selected_fields = SparseFields.parse(get_user_response_model)
+            user_ids = QueryParams.get_int_list('ids')
+        except InvalidDataError as e:
+            return make_response(jsonify({'message': str(e)}), 422)
+        if user_ids is not None:
+            # Búsqueda por lote: todos los IDs pedidos se resuelven en una sola consulta
+            users, missing = UserService.get_users_by_ids(user_ids, QueryParams.get_bool('include_inactive'), selected_fields)
+            return {'items': marshal(users, SparseFields.response_model(get_user_response_model, selected_fields)), 'missing': missing}, 200
         # Llama al servicio para obtener todos los usuarios
-        users = UserService.get_all_users()  
+        users = UserService.get_all_users(QueryParams.get_bool('include_inactive'), selected_fields)  
         # Usamos marshal para garantizar que la lista de usuarios se retorne conforme al modelo get_user_response_model.
-        return marshal(users, get_user_response_model), 200 # Retorna todos los datos de los usuarios    
+        return marshal(users, SparseFields.response_model(get_user_response_model, selected_fields)), 200 # Retorna todos los datos de los usuarios    
     
     @user_ns.doc('create_user')
     @user_ns.expect(entry_user_model, validate=True)  # Decorador para esperar el modelo en la petición
@@ -84,48 +186,90 @@ class UserResource(Resource):
             # Si el nickname o el email ya existen se responde un mensaje de error con el codigo 422
             return make_response(jsonify({'message': str(e)}), 422)   
 
+@user_ns.route('/availability')
+class UserAvailabilityResource(Resource):
+    @user_ns.doc('check_user_availability', params={'nickname': 'Apodo a consultar', 'email': 'Email a consultar'})
+    def get(self):
+        """
+        Consultar si un apodo y un email están disponibles
+        ---
+        Este método permite validar los datos del formulario de registro mientras el usuario escribe.
+        La respuesta es orientativa: la creación del usuario vuelve a validar ambos valores.
+
+        Query Parameters:
+        - nickname: Apodo a consultar.
+        - email: Email a consultar.
+
+        Responses:
+        - 200: Retorna, por cada campo consultado, true si está disponible o false si ya está en uso.
+        - 422: Si no se indica ni nickname ni email.
+        """
+        try:
+            availability = UserService.check_availability(request.args.get('nickname'), request.args.get('email'))
+            return make_response(jsonify(availability), 200)
+        except InvalidDataError as e:
+            return make_response(jsonify({'message': str(e)}), 422)
+
+
 @user_ns.route('/<int:user_id>')
 @user_ns.param('user_id', 'ID del usuario')
 class UserDetailResource(Resource):
-    @user_ns.doc('get_user_by_user_id')
+    @user_ns.doc('get_user_by_user_id', params={'include_inactive': 'Si es "true", retorna el usuario aunque esté desactivado', 'fields': 'Campos a retornar separados por coma (por ejemplo: user_id,nickname)'})
     def get(self, user_id):
         """
         Obtener datos de usuario
         ---
         Este método permite obtener todos los datos de un usuario basado en su ID.
 
+        Query Parameters:
+        - include_inactive: Si es "true", retorna el usuario aunque esté desactivado.
+        - fields: Campos a retornar separados por coma; solo esas columnas se consultan en la base de datos.
+
         Responses:
         - 200: Retorna un JSON con todos los datos del usuario.
         - 404: Si el usuario no es encontrado.
+        - 422: Si se pide un campo que no existe.
         """
         try:
+            selected_fields = SparseFields.parse(get_user_response_model)
             # Llama al servicio para obtener el usuario asociado al ID
-            user = UserService.get_user_by_user_id(user_id)            
+            user = UserService.get_user_by_user_id(user_id, QueryParams.get_bool('include_inactive'), selected_fields)            
             # Si el usuario se encuentra, aplicamos manualmente marshal para formatear la respuesta
-            return marshal(user, get_user_response_model), 200
+            return marshal(user, SparseFields.response_model(get_user_response_model, selected_fields)), 200
+        except InvalidDataError as e:
+            return make_response(jsonify({'message': str(e)}), 422)
         except ValueError as e:
             # Si el usuario no es encontrado, devolvemos un mensaje de error con el código 404
             return make_response(jsonify({'message': str(e)}), 404)
 
-    @user_ns.doc('delete_user')
+    @user_ns.doc('delete_user', params={'background': 'Si es "true", la eliminación se ejecuta en segundo plano'})
     def delete(self, user_id):
         """
         Eliminar un usuario
         ---
-        Este método permite eliminar un usuario existente basado en el ID del usuario.
+        Este método permite eliminar un usuario existente basado en el ID del usuario, junto con
+        sus asignaciones y fechas completadas. El historial se elimina por lotes.
 
         Path Parameters:
         - user_id: El ID del usuario a eliminar.
 
+        Query Parameters:
+        - background: Si es "true", la eliminación se programa en segundo plano y se retorna el ID de la tarea.
+
         Responses:
         - 200: Usuario eliminado con éxito.
+        - 202: Eliminación programada en segundo plano.
         - 404: Si el usuario no se encuentra.
         """
         try:
+            if QueryParams.get_bool('background'):
+                # Programa la eliminación en segundo plano y retorna el ID de la tarea
+                task_id = UserService.delete_user_in_background(user_id)
+                return make_response(jsonify({'message': 'User deletion scheduled', 'task_id': task_id}), 202)
             # Llama al servicio para eliminar al usuario
-            UserService.delete_user(user_id)  
+            deleted = UserService.delete_user(user_id)  
             # Usamos jsonify para enviar un mensaje de éxito en formato JSON.
-            return make_response(jsonify({'message': 'User deleted successfully'}), 200)
+            return make_response(jsonify({'message': 'User deleted successfully', **deleted}), 200)
         except ValueError as e:
             # Si el usuario no es encontrado, devolvemos un mensaje de error con el código 404
             return make_response(jsonify({'message': str(e)}), 404)
@@ -161,5 +305,223 @@ class UserDetailResource(Resource):
             return make_response(jsonify({'message': 'User updated successfully'}), 200)
         except ValueError as e:
             # Si el usuario no es encontrado, devolvemos un mensaje de error con el código 404
-            return make_response(jsonify({'message': str(e)}), 404)     
+            return make_response(jsonify({'message': str(e)}), 404)
+
+
+@user_ns.route('/<int:user_id>/deactivate')
+@user_ns.param('user_id', 'ID del usuario')
+class UserDeactivateResource(Resource):
+    @user_ns.doc('deactivate_user')
+    def patch(self, user_id):
+        """
+        Desactivar un usuario
+        ---
+        Este método desactiva un usuario sin eliminar sus datos. Los usuarios desactivados no aparecen en las lecturas por defecto.
+
+        Responses:
+        - 200: Usuario desactivado con éxito.
+        - 404: Si el usuario no se encuentra.
+        """
+        try:
+            UserService.set_user_status(user_id, False)
+            return make_response(jsonify({'message': 'User deactivated successfully'}), 200)
+        except ValueError as e:
+            return make_response(jsonify({'message': str(e)}), 404)
+
+
+@user_ns.route('/<int:user_id>/reactivate')
+@user_ns.param('user_id', 'ID del usuario')
+class UserReactivateResource(Resource):
+    @user_ns.doc('reactivate_user')
+    def patch(self, user_id):
+        """
+        Reactivar un usuario
+        ---
+        Este método vuelve a activar un usuario previamente desactivado.
+
+        Responses:
+        - 200: Usuario reactivado con éxito.
+        - 404: Si el usuario no se encuentra.
+        """
+        try:
+            UserService.set_user_status(user_id, True)
+            return make_response(jsonify({'message': 'User reactivated successfully'}), 200)
+        except ValueError as e:
+            return make_response(jsonify({'message': str(e)}), 404)
+
+
+@user_ns.route('/<int:user_id>/recommendations')
+@user_ns.param('user_id', 'ID del usuario')
+class UserRecommendationResource(Resource):
+    @user_ns.doc('get_recommendations_by_user_id', params={'limit': 'Cantidad máxima de recomendaciones (por defecto 10)'})
+    def get(self, user_id):
+        """
+        Obtener hábitos recomendados para un usuario
+        ---
+        Este método retorna hábitos que suelen registrar los usuarios con hábitos en común con este usuario,
+        excluyendo los que ya tiene asignados. Las recomendaciones se leen de una matriz precalculada
+        (`flask recommendations refresh`).
+
+        Query Parameters:
+        - limit: Cantidad máxima de recomendaciones (entre 1 y MAX_PER_PAGE).
+
+        Responses:
+        - 200: Retorna la lista de hábitos recomendados ordenada por puntaje.
+        - 404: Si el usuario no se encuentra.
+        - 422: Si el límite es inválido.
+        """
+        try:
+            limit = QueryParams.get_int('limit', 10, 1, current_app.config['MAX_PER_PAGE'])
+            recommendations = RecommendationService.get_recommendations_by_user_id(user_id, limit)
+            return marshal(recommendations, get_recommendation_response_model), 200
+        except InvalidDataError as e:
+            return make_response(jsonify({'message': str(e)}), 422)
+        except ValueError as e:
+            return make_response(jsonify({'message': str(e)}), 404)
+
+
+@user_ns.route('/<int:user_id>/heatmap')
+@user_ns.param('user_id', 'ID del usuario')
+class UserHeatmapResource(Resource):
+    @user_ns.doc('get_heatmap_by_user_id', params={'year': 'Año a consultar (por defecto el año actual)'})
+    def get(self, user_id):
+        """
+        Obtener el mapa de calor anual de hábitos completados de un usuario
+        ---
+        Este método retorna, para cada día del año, la cantidad de hábitos que el usuario completó
+        sumando todas sus asignaciones.
+
+        Query Parameters:
+        - year: Año a consultar (entre 1970 y 9998). Por defecto el año actual.
+
+        Responses:
+        - 200: Retorna `counts` con un valor por día a partir de `start_date` (1 de enero), junto con `days`, `total` y `max`.
+        - 404: Si el usuario no se encuentra.
+        - 422: Si el año es inválido.
+        """
+        try:
+            year = QueryParams.get_int('year', date.today().year, 1970, 9998)
+            heatmap = CompletedDateService.get_heatmap_by_user_id(user_id, year)
+            return make_response(jsonify(heatmap), 200)
+        except InvalidDataError as e:
+            return make_response(jsonify({'message': str(e)}), 422)
+        except ValueError as e:
+            return make_response(jsonify({'message': str(e)}), 404)
+
+
+@user_ns.route('/<int:user_id>/due')
+@user_ns.param('user_id', 'ID del usuario')
+class UserDueResource(Resource):
+    @user_ns.doc('get_due_assignments', params={'date': 'Día a consultar (AAAA-MM-DD, por defecto hoy)'})
+    def get(self, user_id):
+        """
+        Obtener los hábitos pendientes de un usuario en un día
+        ---
+        Este método retorna las asignaciones activas del usuario que, según su programación, corresponden
+        al día indicado y todavía no tienen una fecha completada ese día.
+
+        Query Parameters:
+        - date: Día a consultar (AAAA-MM-DD). Por defecto hoy.
+
+        Responses:
+        - 200: Retorna la lista de asignaciones pendientes, ordenadas por momento del día.
+        - 404: Si el usuario no se encuentra.
+        - 422: Si la fecha es inválida.
+        """
+        try:
+            day = QueryParams.get_date('date', date.today())
+            assignments = AssignmentService.get_due_assignments(user_id, day)
+            return marshal(assignments, get_due_assignment_response_model), 200
+        except InvalidDataError as e:
+            return make_response(jsonify({'message': str(e)}), 422)
+        except ValueError as e:
+            return make_response(jsonify({'message': str(e)}), 404)
+
+
+@user_ns.route('/<int:user_id>/sync')
+@user_ns.param('user_id', 'ID del usuario')
+class UserSyncResource(Resource):
+    @user_ns.doc('sync_user', params={'since': 'Token retornado por la sincronización anterior (se omite en la primera)'})
+    def get(self, user_id):
+        """
+        Sincronizar los datos de un usuario con la aplicación móvil
+        ---
+        Este método retorna solo lo que cambió desde la sincronización anterior: el usuario (si cambió), los
+        hábitos, asignaciones y fechas completadas creados o modificados, y los IDs de los eliminados. Sin
+        `since`, o si el token es demasiado antiguo, retorna todos los datos con `full_sync` en true.
+
+        Query Parameters:
+        - since: Token retornado por la sincronización anterior.
+
+        Responses:
+        - 200: Retorna los cambios y el token para la siguiente sincronización.
+        - 404: Si el usuario no se encuentra.
+        - 422: Si el token es inválido.
+        """
+        try:
+            since = SyncService.parse_token(request.args.get('since'))
+            changes = SyncService.get_changes(user_id, since)
+            return marshal(changes, sync_response_model), 200
+        except InvalidDataError as e:
+            return make_response(jsonify({'message': str(e)}), 422)
+        except ValueError as e:
+            return make_response(jsonify({'message': str(e)}), 404)
+
+
+@user_ns.route('/<int:user_id>/events')
+@user_ns.param('user_id', 'ID del usuario')
+class UserEventsResource(Resource):
+    @user_ns.doc('get_user_events')
+    def get(self, user_id):
+        """
+        Recibir en vivo la actividad de un usuario (server-sent events)
+        ---
+        Este método abre un stream `text/event-stream` que envía los cambios del usuario a medida que
+        ocurren: `completed_date.created`, `completed_date.deleted`, `assignment.created`, `assignment.updated`,
+        `assignment.deleted`, `streak.updated` (racha actual de la asignación) y `user.deleted`.
 
+        Solo se atiende con servidores que ejecutan varias peticiones por proceso (workers gevent o gthread de
+        Gunicorn, o el servidor de desarrollo): con el worker sync cada conexión abierta ocuparía un worker
+        completo, que además Gunicorn reiniciaría al superar `timeout`.
+
+        Responses:
+        - 200: Stream de eventos.
+        - 404: Si el usuario no se encuentra.
+        - 503: Si el proceso alcanzó el máximo de streams abiertos (`SSE_MAX_CONNECTIONS`), o si el servidor
+               atiende una petición a la vez por proceso.
+        """
+        if not request.environ.get('wsgi.multithread'):
+            return make_response(jsonify({'message': 'Event streams require a gevent or gthread worker'}), 503)
+        try:
+            UserService.get_user_by_user_id(user_id, fields=['user_id'])
+        except ValueError as e:
+            return make_response(jsonify({'message': str(e)}), 404)
+        subscriber = EventBroker.subscribe(user_id)
+        if subscriber is None:
+            return make_response(jsonify({'message': 'Too many open event streams, try again later'}), 503)
+        return Response(
+            EventBroker.stream(user_id, subscriber, current_app.config['SSE_HEARTBEAT_INTERVAL']),
+            mimetype='text/event-stream',
+            headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+
+@user_ns.route('/deletions/<string:task_id>')
+@user_ns.param('task_id', 'ID de la tarea de eliminación')
+class UserDeletionTaskResource(Resource):
+    @user_ns.doc('get_user_deletion_task')
+    def get(self, task_id):
+        """
+        Obtener el estado de una eliminación de usuario en segundo plano
+        ---
+        Este método permite consultar el estado y el progreso de una eliminación programada con `background=true`.
+        La eliminación la ejecuta un worker (`flask jobs worker`); también puede consultarse en `/jobs/<task_id>`.
+
+        Responses:
+        - 200: Retorna el estado y el progreso de la tarea.
+        - 404: Si la tarea no es encontrada.
+        """
+        try:
+            task = UserService.get_delete_task(task_id)
+            return marshal(task, user_deletion_task_model), 200
+        except ValueError as e:
+            return make_response(jsonify({'message': str(e)}), 404)
@@ -0,0 +1,20 @@
+import hmac
+from functools import wraps
+from flask import current_app, jsonify, make_response, request
+
+
+def admin_required(view):
+    """
+    Decorador que restringe una vista a los administradores: la petición debe enviar en el encabezado
+    `X-Admin-Token` el valor de `ADMIN_TOKEN`. Si `ADMIN_TOKEN` no está configurado, la vista queda
+    deshabilitada.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        admin_token = current_app.config['ADMIN_TOKEN']
+        if not admin_token:
+            return make_response(jsonify({'message': 'Admin endpoints are disabled'}), 403)
+        if not hmac.compare_digest(request.headers.get('X-Admin-Token', '').encode(), admin_token.encode()):
+            return make_response(jsonify({'message': 'Invalid admin token'}), 401)
+        return view(*args, **kwargs)
+    return wrapper
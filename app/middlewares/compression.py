@@ -0,0 +1,141 @@
+import gzip
+import hashlib
+from functools import wraps
+from flask import g, request
+from app.utils.cache import LRUCache
+
+# Los algoritmos brotli y zstd son opcionales: solo se ofrecen si su paquete está instalado
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+def cache_compressed_response(view):
+    """
+    Decorador para marcar una vista cuya respuesta suele repetirse idéntica (por ejemplo, el catálogo
+    de hábitos). Los cuerpos comprimidos de estas respuestas se guardan en caché y se reutilizan
+    mientras el contenido no cambie, en lugar de volver a comprimirlos en cada petición.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        g.cache_compressed_response = True
+        return view(*args, **kwargs)
+    return wrapper
+
+
+class Compression():
+    """
+    Extensión que comprime las respuestas según el encabezado `Accept-Encoding` del cliente.
+
+    Se ofrecen, en orden de preferencia del servidor, los algoritmos de `COMPRESS_ALGORITHMS` que estén
+    disponibles (br y zstd requieren los paquetes `brotli` y `zstandard`; gzip siempre está disponible).
+    Solo se comprimen respuestas de tipos textuales cuyo tamaño alcance `COMPRESS_MIN_SIZE` bytes.
+    """
+
+    COMPRESSIBLE_MIMETYPES = ('application/json', 'text/html', 'text/plain', 'text/css', 'application/javascript')
+
+    def __init__(self, app=None):
+        self.cache = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """
+        Registra la compresión en la aplicación.
+
+        Args:
+            app (Flask): La aplicación Flask.
+        """
+        app.config.setdefault('COMPRESS_ENABLED', True)
+        app.config.setdefault('COMPRESS_MIN_SIZE', 1024)
+        app.config.setdefault('COMPRESS_LEVEL', 6)
+        app.config.setdefault('COMPRESS_ALGORITHMS', ['br', 'zstd', 'gzip'])
+        app.config.setdefault('COMPRESS_CACHE_SIZE', 64)
+        self.cache = LRUCache(maxsize=app.config['COMPRESS_CACHE_SIZE'])
+        self.algorithms = [algorithm for algorithm in app.config['COMPRESS_ALGORITHMS'] if self._is_available(algorithm)]
+        self.level = app.config['COMPRESS_LEVEL']
+        self.min_size = app.config['COMPRESS_MIN_SIZE']
+        if app.config['COMPRESS_ENABLED']:
+            app.after_request(self.after_request)
+
+    @staticmethod
+    def _is_available(algorithm):
+        if algorithm == 'br':
+            return brotli is not None
+        if algorithm == 'zstd':
+            return zstandard is not None
+        return algorithm == 'gzip'
+
+    def _negotiate(self, accept_encoding):
+        """Elige el primer algoritmo del servidor que el cliente acepte con calidad mayor que cero."""
+        accepted = {}
+        for item in accept_encoding.split(','):
+            parts = item.strip().split(';')
+            coding = parts[0].strip().lower()
+            quality = 1.0
+            for param in parts[1:]:
+                name, _, value = param.strip().partition('=')
+                if name == 'q':
+                    try:
+                        quality = float(value)
+                    except ValueError:
+                        quality = 0.0
+            if coding:
+                accepted[coding] = quality
+        for algorithm in self.algorithms:
+            quality = accepted.get(algorithm, accepted.get('*', 0.0))
+            if quality > 0:
+                return algorithm
+        return None
+
+    def compress(self, algorithm, data):
+        """
+        Comprime un cuerpo de respuesta con el algoritmo indicado.
+
+        Args:
+            algorithm (str): 'br', 'zstd' o 'gzip'.
+            data (bytes): Cuerpo sin comprimir.
+
+        Returns:
+            bytes: El cuerpo comprimido.
+        """
+        if algorithm == 'br':
+            # Brotli usa una escala de calidad de 0 a 11; se mapea el nivel de gzip (1 a 9) a ella
+            return brotli.compress(data, quality=min(11, self.level))
+        if algorithm == 'zstd':
+            return zstandard.ZstdCompressor(level=self.level).compress(data)
+        return gzip.compress(data, compresslevel=self.level, mtime=0)
+
+    def after_request(self, response):
+        response.vary.add('Accept-Encoding')
+        if (response.direct_passthrough or response.is_streamed
+                or response.status_code < 200 or response.status_code in (204, 206, 304)
+                or 'Content-Encoding' in response.headers
+                or response.mimetype not in self.COMPRESSIBLE_MIMETYPES):
+            return response
+        algorithm = self._negotiate(request.headers.get('Accept-Encoding', ''))
+        if algorithm is None:
+            return response
+        data = response.get_data()
+        if len(data) < self.min_size:
+            return response
+
+        if g.get('cache_compressed_response') and request.method == 'GET':
+            # Calcular el hash del cuerpo es mucho más barato que comprimirlo de nuevo
+            key = (algorithm, hashlib.blake2b(data, digest_size=16).digest())
+            compressed = self.cache.get(key)
+            if compressed is None:
+                compressed = self.compress(algorithm, data)
+                self.cache.set(key, compressed)
+        else:
+            compressed = self.compress(algorithm, data)
+
+        response.set_data(compressed)
+        response.headers['Content-Encoding'] = algorithm
+        return response
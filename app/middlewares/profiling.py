@@ -0,0 +1,159 @@
+import cProfile
+import hmac
+import os
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from flask import request
+
+
+class _StackSampler(threading.Thread):
+    """
+    Hilo que toma muestras periódicas de la pila de otro hilo y las acumula en formato "collapsed"
+    (marcos separados por ';', de la raíz a la hoja), listo para generar un flamegraph.
+    """
+
+    def __init__(self, thread_id, interval):
+        super().__init__(daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.samples = Counter()
+        self._stopped = threading.Event()
+
+    def run(self):
+        while not self._stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f'{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})')
+                frame = frame.f_back
+            if stack:
+                self.samples[';'.join(reversed(stack))] += 1
+
+    def stop(self):
+        self._stopped.set()
+        self.join()
+
+
+class ProfilingMiddleware():
+    """
+    Middleware WSGI que perfila las peticiones seleccionadas y guarda el resultado en un directorio.
+
+    Una petición se perfila si envía el encabezado `X-Profile-Token` con el valor de `PROFILE_TOKEN`, o
+    al azar con probabilidad `PROFILE_SAMPLE_RATE`. Por cada petición perfilada se escriben dos archivos
+    con el mismo nombre `<ID>_<método>_<endpoint>_<ms>ms`, donde el ID es la fecha y hora de la petición:
+
+        - `.pstats`: estadísticas de cProfile (por ejemplo, `python -m pstats archivo.pstats` o snakeviz).
+        - `.collapsed`: pilas muestreadas cada `PROFILE_SAMPLE_INTERVAL` segundos, para flamegraph.pl o speedscope.
+
+    El ID se informa en el encabezado `X-Profile-Id` de la respuesta. Solo se perfila una petición a
+    la vez por proceso; el resto se atiende sin perfilar. Solo se mide la generación de la respuesta,
+    no el envío de los cuerpos en streaming. Si los archivos no se pueden escribir, el error se registra en
+    el log y la respuesta se entrega igual.
+    """
+
+    def __init__(self, wsgi_app, config, logger):
+        self.wsgi_app = wsgi_app
+        self.logger = logger
+        self.token = config['PROFILE_TOKEN']
+        self.sample_rate = config['PROFILE_SAMPLE_RATE']
+        self.sample_interval = config['PROFILE_SAMPLE_INTERVAL']
+        self.directory = config['PROFILE_DIR']
+        self.max_files = config['PROFILE_MAX_FILES']
+        self._lock = threading.Lock()
+
+    def _wants_profile(self, environ):
+        token = environ.get('HTTP_X_PROFILE_TOKEN')
+        if token is not None and self.token and hmac.compare_digest(token.encode(), self.token.encode()):
+            return True
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    def __call__(self, environ, start_response):
+        if not self._wants_profile(environ) or not self._lock.acquire(blocking=False):
+            return self.wsgi_app(environ, start_response)
+        try:
+            return self._profile(environ, start_response)
+        finally:
+            self._lock.release()
+
+    def _profile(self, environ, start_response):
+        profile_id = f'{datetime.now():%Y%m%d-%H%M%S-%f}'
+
+        def profiled_start_response(status, headers, exc_info=None):
+            return start_response(status, headers + [('X-Profile-Id', profile_id)], exc_info)
+
+        sampler = _StackSampler(threading.get_ident(), self.sample_interval)
+        profiler = cProfile.Profile()
+        sampler.start()
+        start = time.perf_counter()
+        profiler.enable()
+        try:
+            return self.wsgi_app(environ, profiled_start_response)
+        finally:
+            profiler.disable()
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            sampler.stop()
+            endpoint = environ.get('profiling.endpoint') or environ.get('PATH_INFO', '')
+            try:
+                self._save(profile_id, environ.get('REQUEST_METHOD', ''), endpoint, elapsed_ms, profiler, sampler.samples)
+            except OSError:
+                # Un disco lleno o de solo lectura no debe convertir la respuesta en un error
+                self.logger.exception('Could not save profile %s in %s', profile_id, self.directory)
+
+    def _save(self, profile_id, method, endpoint, elapsed_ms, profiler, samples):
+        os.makedirs(self.directory, exist_ok=True)
+        safe_endpoint = re.sub(r'[^A-Za-z0-9_.-]+', '_', endpoint).strip('_') or 'root'
+        base = os.path.join(self.directory, f'{profile_id}_{method}_{safe_endpoint}_{elapsed_ms:.0f}ms')
+        profiler.dump_stats(base + '.pstats')
+        with open(base + '.collapsed', 'w', encoding='utf-8') as file:
+            for stack, count in samples.most_common():
+                file.write(f'{stack} {count}\n')
+        self._prune()
+
+    def _prune(self):
+        # Se conservan los PROFILE_MAX_FILES perfiles más recientes (dos archivos por perfil)
+        files = sorted(os.listdir(self.directory))
+        for name in files[:max(0, len(files) - self.max_files * 2)]:
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except FileNotFoundError:
+                # Otro proceso que comparte el directorio ya lo eliminó
+                pass
+
+
+class Profiler():
+    """
+    Extensión que instala `ProfilingMiddleware` solo si está habilitado (`PROFILE_TOKEN` o
+    `PROFILE_SAMPLE_RATE` configurados). Deshabilitado no agrega ningún costo a las peticiones.
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """
+        Registra el perfilado de peticiones en la aplicación.
+
+        Args:
+            app (Flask): La aplicación Flask.
+        """
+        app.config.setdefault('PROFILE_TOKEN', None)
+        app.config.setdefault('PROFILE_SAMPLE_RATE', 0.0)
+        app.config.setdefault('PROFILE_SAMPLE_INTERVAL', 0.001)
+        app.config.setdefault('PROFILE_DIR', 'profiles')
+        app.config.setdefault('PROFILE_MAX_FILES', 200)
+        if not app.config['PROFILE_TOKEN'] and not app.config['PROFILE_SAMPLE_RATE']:
+            return
+        app.wsgi_app = ProfilingMiddleware(app.wsgi_app, app.config, app.logger)
+        app.before_request(self._before_request)
+
+    @staticmethod
+    def _before_request():
+        # El middleware WSGI no conoce la ruta resuelta por Flask; se la deja en el entorno de la petición
+        request.environ['profiling.endpoint'] = request.endpoint or request.path
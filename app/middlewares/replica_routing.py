@@ -0,0 +1,239 @@
+import itertools
+import threading
+import time
+import sqlalchemy as sa
+from flask import current_app, g, has_request_context, request
+from flask_sqlalchemy.session import Session
+
+# Métodos HTTP cuyas consultas pueden leerse desde una réplica
+READ_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+# Segundos de retraso de una réplica de PostgreSQL. Si ya aplicó todo lo recibido el retraso es 0,
+# aunque la última transacción reproducida sea antigua (el primario puede no haber tenido escrituras)
+REPLICA_LAG_QUERY = sa.text(
+    'SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 '
+    'ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END'
+)
+
+
+class RoutingSession(Session):
+    """
+    Sesión de Flask-SQLAlchemy que envía las consultas SELECT a una réplica de lectura cuando la
+    petición en curso lo permite (ver `ReplicaRouter`).
+
+    Las sentencias de escritura, los SELECT ... FOR UPDATE y cualquier consulta posterior a una escritura
+    dentro de la misma transacción usan siempre el primario. Si una lectura falla en la réplica por un
+    error de conexión, la réplica se excluye y la lectura se repite una vez en el primario, al igual que
+    las siguientes de la petición.
+    """
+
+    def __init__(self, db, **kwargs):
+        super().__init__(db, **kwargs)
+        self._has_writes = False
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None:
+            if self._flushing or (clause is not None and not isinstance(clause, sa.Select)):
+                self._has_writes = True
+            elif not self._has_writes and isinstance(clause, sa.Select) and clause._for_update_arg is None:
+                engine = ReplicaRouter.engine_for_read()
+                if engine is not None:
+                    return engine
+        return super().get_bind(mapper, clause=clause, bind=bind, **kwargs)
+
+    def execute(self, statement, *args, **kwargs):
+        try:
+            return super().execute(statement, *args, **kwargs)
+        except sa.exc.OperationalError:
+            if not self.fall_back_to_primary(statement):
+                raise
+        return super().execute(statement, *args, **kwargs)
+
+    def scalar(self, statement, *args, **kwargs):
+        try:
+            return super().scalar(statement, *args, **kwargs)
+        except sa.exc.OperationalError:
+            if not self.fall_back_to_primary(statement):
+                raise
+        return super().scalar(statement, *args, **kwargs)
+
+    def scalars(self, statement, *args, **kwargs):
+        try:
+            return super().scalars(statement, *args, **kwargs)
+        except sa.exc.OperationalError:
+            if not self.fall_back_to_primary(statement):
+                raise
+        return super().scalars(statement, *args, **kwargs)
+
+    def fall_back_to_primary(self, statement):
+        """
+        Tras un error de conexión, determina si la sentencia se leyó de una réplica y, en ese caso, excluye
+        la réplica y envía al primario esta y las siguientes lecturas de la petición.
+
+        Args:
+            statement: La sentencia que falló.
+
+        Returns:
+            bool: True si la sentencia puede repetirse en el primario.
+        """
+        if self._has_writes or not isinstance(statement, sa.Select) or statement._for_update_arg is not None:
+            return False
+        engine = ReplicaRouter.engine_for_read()
+        if engine is None:
+            return False
+        current_app.extensions['replica_router'].mark_failed(engine)
+        g.replica_engine = None
+        # La transacción no tiene escrituras: se descarta junto con la conexión rota
+        self.rollback()
+        return True
+
+    def commit(self):
+        super().commit()
+        self._has_writes = False
+
+    def rollback(self):
+        super().rollback()
+        self._has_writes = False
+
+
+class _Replica():
+    """Estado de salud de una réplica de lectura."""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.lag = 0.0
+        self.checked_at = float('-inf')
+        self.failed_until = float('-inf')
+        self.lock = threading.Lock()
+
+
+class ReplicaRouter():
+    """
+    Extensión que reparte las lecturas de las peticiones GET entre las réplicas de `SQLALCHEMY_REPLICA_URIS`.
+
+    - Las réplicas se eligen en turnos (round robin); una petición usa la misma réplica en todas sus consultas.
+    - Cada `REPLICA_CHECK_INTERVAL` segundos se mide el retraso de cada réplica; las que superan
+      `REPLICA_MAX_LAG_SECONDS` o fallan se excluyen (las que fallan, durante `REPLICA_RETRY_AFTER`
+      segundos). Sin réplicas disponibles las lecturas vuelven al primario.
+    - Lectura de las propias escrituras: después de una petición de escritura exitosa se envía la cookie
+      `PIN_COOKIE`, y durante `REPLICA_PIN_SECONDS` segundos las lecturas de ese cliente usan el primario.
+      Los clientes sin cookies pueden enviar el encabezado `X-Read-Primary: true` con el mismo efecto.
+
+    Las consultas fuera de una petición (comandos, hilos en segundo plano) y las de las peticiones de
+    escritura, incluidas las lecturas de validación que hacen los servicios, usan siempre el primario.
+    """
+
+    PIN_COOKIE = 'read_primary_until'
+
+    def __init__(self, app=None):
+        self.replicas = []
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """
+        Registra el enrutamiento a réplicas en la aplicación.
+
+        Args:
+            app (Flask): La aplicación Flask.
+        """
+        app.config.setdefault('SQLALCHEMY_REPLICA_URIS', [])
+        app.config.setdefault('REPLICA_MAX_LAG_SECONDS', 5)
+        app.config.setdefault('REPLICA_CHECK_INTERVAL', 5)
+        app.config.setdefault('REPLICA_RETRY_AFTER', 30)
+        app.config.setdefault('REPLICA_PIN_SECONDS', 10)
+        engine_options = app.config.get('SQLALCHEMY_ENGINE_OPTIONS', {})
+        self.replicas = [_Replica(sa.create_engine(uri, **engine_options)) for uri in app.config['SQLALCHEMY_REPLICA_URIS']]
+        self._turns = itertools.count()
+        for replica in self.replicas:
+            sa.event.listen(replica.engine, 'handle_error', self._on_error(replica, app))
+        app.extensions['replica_router'] = self
+        if self.replicas:
+            app.before_request(self._before_request)
+            app.after_request(self._after_request)
+
+    @property
+    def engines(self):
+        """Motores de las réplicas configuradas."""
+        return [replica.engine for replica in self.replicas]
+
+    @staticmethod
+    def engine_for_read():
+        """
+        Retorna el motor de réplica a usar en la petición en curso, o None si las lecturas deben ir al primario.
+        """
+        if not has_request_context() or not g.get('use_replica'):
+            return None
+        if 'replica_engine' not in g:
+            g.replica_engine = current_app.extensions['replica_router'].choose()
+        return g.replica_engine
+
+    def choose(self):
+        """
+        Elige, en turnos, una réplica disponible y con un retraso aceptable.
+
+        Returns:
+            Engine | None: El motor de la réplica, o None si no hay ninguna disponible.
+        """
+        now = time.monotonic()
+        available = [replica for replica in self.replicas if self._is_available(replica, now)]
+        if not available:
+            return None
+        return available[next(self._turns) % len(available)].engine
+
+    def mark_failed(self, engine):
+        """
+        Excluye una réplica durante `REPLICA_RETRY_AFTER` segundos.
+
+        Args:
+            engine (Engine): El motor de la réplica.
+        """
+        for replica in self.replicas:
+            if replica.engine is engine:
+                current_app.logger.warning('Read replica %s failed; reading from the primary', engine.url.render_as_string())
+                replica.failed_until = time.monotonic() + current_app.config['REPLICA_RETRY_AFTER']
+
+    def _is_available(self, replica, now):
+        if now < replica.failed_until:
+            return False
+        config = current_app.config
+        # Solo un hilo mide la réplica; los demás usan la última medición
+        if now - replica.checked_at >= config['REPLICA_CHECK_INTERVAL'] and replica.lock.acquire(blocking=False):
+            try:
+                with replica.engine.connect() as connection:
+                    lag = connection.scalar(REPLICA_LAG_QUERY) if replica.engine.dialect.name == 'postgresql' else 0
+                replica.lag = float(lag or 0)
+            except sa.exc.SQLAlchemyError:
+                current_app.logger.warning('Read replica %s is unavailable', replica.engine.url.render_as_string())
+                replica.failed_until = now + config['REPLICA_RETRY_AFTER']
+                return False
+            finally:
+                replica.checked_at = now
+                replica.lock.release()
+        return replica.lag <= config['REPLICA_MAX_LAG_SECONDS']
+
+    @staticmethod
+    def _on_error(replica, app):
+        def handle_error(context):
+            # Una conexión perdida excluye a la réplica hasta el próximo reintento
+            if context.is_disconnect:
+                replica.failed_until = time.monotonic() + app.config['REPLICA_RETRY_AFTER']
+        return handle_error
+
+    def _is_pinned(self):
+        if request.headers.get('X-Read-Primary', '').lower() in ('true', '1', 'yes'):
+            return True
+        try:
+            return float(request.cookies.get(self.PIN_COOKIE, 0)) > time.time()
+        except ValueError:
+            return False
+
+    def _before_request(self):
+        g.use_replica = request.method in READ_METHODS and not self._is_pinned()
+
+    def _after_request(self, response):
+        if request.method not in READ_METHODS and response.status_code < 400:
+            pin_seconds = current_app.config['REPLICA_PIN_SECONDS']
+            response.set_cookie(self.PIN_COOKIE, str(time.time() + pin_seconds), max_age=pin_seconds,
+                                httponly=True, samesite='Lax')
+        return response
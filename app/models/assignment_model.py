@@ -12,16 +12,34 @@ class Assignment(db.Model):
         assignment_status (bool): Estado de la asignación (True si está activa, False si está inactiva).
         fk_user_id (int): ID del usuario asociado a la asignación (clave foránea).
         fk_habit_id (int): ID del hábito asociado a la asignación (clave foránea).
+        schedule_days (int): Días de la semana en que corresponde el hábito, como máscara de bits
+                             (bit 0 = lunes ... bit 6 = domingo). Por defecto todos los días.
+        schedule_every (int): Si se indica, el hábito corresponde cada N días a partir de `schedule_start`.
+        schedule_start (date): Primer día de la repetición cada N días.
+        updated_at (datetime): Fecha y hora de la última modificación, usada por la sincronización incremental.
         completed_dates (list): Lista de fechas en que el usuario ha completado el hábito.
     """
 
     __tablename__ = 'assignments'
 
+    # Máscara de `schedule_days` con todos los días de la semana
+    ALL_DAYS = 0b1111111
+    __table_args__ = (
+        # Índice parcial con las asignaciones activas de cada usuario, usado por las lecturas por defecto
+        db.Index('ix_assignments_active_fk_user_id', 'fk_user_id', postgresql_where=db.text('assignment_status')),
+        # Asignaciones de un usuario modificadas desde un momento (sincronización incremental)
+        db.Index('ix_assignments_fk_user_id_updated_at', 'fk_user_id', 'updated_at'),
+    )
+
     assignment_id = db.Column(db.Integer, primary_key=True)
     created_date = db.Column(db.DateTime, server_default=db.func.now(), nullable=False)
     assignment_status = db.Column(db.Boolean, server_default=db.true(), nullable=False)
-    fk_user_id = db.Column(db.Integer, db.ForeignKey('users.user_id'), nullable=False)
+    fk_user_id = db.Column(db.Integer, db.ForeignKey('users.user_id'), nullable=False, index=True)
     fk_habit_id = db.Column(db.Integer, db.ForeignKey('habits.habit_id'), nullable=False)
+    schedule_days = db.Column(db.SmallInteger, server_default=db.text(str(ALL_DAYS)), nullable=False)
+    schedule_every = db.Column(db.SmallInteger, nullable=True)
+    schedule_start = db.Column(db.Date, nullable=True)
+    updated_at = db.Column(db.DateTime, server_default=db.func.now(), onupdate=db.func.now(), nullable=False)
     completed_dates = db.relationship('CompletedDate', backref='assignment', lazy=True)
 
     def __init__(self, fk_user_id, fk_habit_id, created_date):
@@ -0,0 +1,47 @@
+from app import db
+
+
+class CohortRetention(db.Model):
+    """
+    Modelo que representa una celda de la matriz de retención por cohortes.
+
+    Una cohorte agrupa a los usuarios creados en una misma semana (de lunes a domingo). Cada fila indica
+    cuántos usuarios de la cohorte completaron al menos un hábito `week_offset` semanas después de la
+    semana de creación. La tabla se recalcula completa con `flask analytics retention`.
+
+    Atributos:
+        cohort_week (date): Lunes de la semana en que se crearon los usuarios (clave primaria compuesta).
+        week_offset (int): Semanas transcurridas desde la semana de la cohorte (clave primaria compuesta).
+        cohort_size (int): Cantidad de usuarios de la cohorte.
+        retained_users (int): Usuarios de la cohorte que completaron algún hábito en esa semana.
+        retention_rate (float): Proporción `retained_users / cohort_size`.
+        computed_at (datetime): Fecha y hora del cálculo.
+    """
+
+    __tablename__ = 'cohort_retention'
+
+    cohort_week = db.Column(db.Date, primary_key=True)
+    week_offset = db.Column(db.Integer, primary_key=True)
+    cohort_size = db.Column(db.Integer, nullable=False)
+    retained_users = db.Column(db.Integer, nullable=False)
+    retention_rate = db.Column(db.Float, nullable=False)
+    computed_at = db.Column(db.DateTime, nullable=False)
+
+    def __init__(self, cohort_week, week_offset, cohort_size, retained_users, retention_rate, computed_at):
+        """
+        Constructor de la clase CohortRetention.
+
+        Args:
+            cohort_week (date): Lunes de la semana de la cohorte.
+            week_offset (int): Semanas transcurridas desde la semana de la cohorte.
+            cohort_size (int): Cantidad de usuarios de la cohorte.
+            retained_users (int): Usuarios de la cohorte activos en esa semana.
+            retention_rate (float): Proporción de usuarios retenidos.
+            computed_at (datetime): Fecha y hora del cálculo.
+        """
+        self.cohort_week = cohort_week
+        self.week_offset = week_offset
+        self.cohort_size = cohort_size
+        self.retained_users = retained_users
+        self.retention_rate = retention_rate
+        self.computed_at = computed_at
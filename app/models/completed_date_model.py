@@ -9,13 +9,21 @@ class CompletedDate(db.Model):
         completed_date_id (int): Identificador único de la fecha de finalización (clave primaria).
         completed_date (date): Fecha en la que se completó la asignación.
         fk_assignment_id (int): ID de la asignación asociada (clave foránea).
+        updated_at (datetime): Fecha y hora de la última modificación, usada por la sincronización incremental.
     """
 
     __tablename__ = 'completed_dates'
+    __table_args__ = (
+        # Fechas de cada asignación: resuelve la búsqueda por asignación y el anti-join de los hábitos pendientes
+        db.Index('ix_completed_dates_fk_assignment_id_completed_date', 'fk_assignment_id', 'completed_date'),
+        # Fechas de cada asignación modificadas desde un momento (sincronización incremental)
+        db.Index('ix_completed_dates_fk_assignment_id_updated_at', 'fk_assignment_id', 'updated_at'),
+    )
     
     completed_date_id = db.Column(db.Integer, primary_key=True)
     completed_date = db.Column(db.Date, server_default=db.func.now(), nullable=False)
     fk_assignment_id = db.Column(db.Integer, db.ForeignKey('assignments.assignment_id'), nullable=False)
+    updated_at = db.Column(db.DateTime, server_default=db.func.now(), onupdate=db.func.now(), nullable=False)
     
     def __init__(self, fk_assignment_id, completed_date):
         """
@@ -0,0 +1,39 @@
+from app import db
+
+
+class HabitCooccurrence(db.Model):
+    """
+    Modelo que representa una entrada de la matriz dispersa de co-ocurrencia de hábitos.
+
+    Cada fila indica cuántos usuarios tienen asignados, a la vez, el hábito `habit_id` y el hábito
+    `related_habit_id`. Solo se guardan las `RECOMMENDATION_TOP_K` entradas con mayor puntaje de cada
+    hábito, por lo que la tabla se recalcula completa en cada actualización.
+
+    Atributos:
+        habit_id (int): ID del hábito de origen (clave primaria compuesta).
+        related_habit_id (int): ID del hábito relacionado (clave primaria compuesta).
+        score (int): Cantidad de usuarios que tienen ambos hábitos asignados.
+    """
+
+    __tablename__ = 'habit_cooccurrences'
+    __table_args__ = (
+        # Permite leer las entradas de un hábito ya ordenadas por puntaje
+        db.Index('ix_habit_cooccurrences_habit_id_score', 'habit_id', db.text('score DESC')),
+    )
+
+    habit_id = db.Column(db.Integer, db.ForeignKey('habits.habit_id', ondelete='CASCADE'), primary_key=True)
+    related_habit_id = db.Column(db.Integer, db.ForeignKey('habits.habit_id', ondelete='CASCADE'), primary_key=True)
+    score = db.Column(db.Integer, nullable=False)
+
+    def __init__(self, habit_id, related_habit_id, score):
+        """
+        Constructor de la clase HabitCooccurrence.
+
+        Args:
+            habit_id (int): ID del hábito de origen.
+            related_habit_id (int): ID del hábito relacionado.
+            score (int): Cantidad de usuarios que tienen ambos hábitos.
+        """
+        self.habit_id = habit_id
+        self.related_habit_id = related_habit_id
+        self.score = score
@@ -9,16 +9,24 @@ class Habit(db.Model):
         habit_name (str): Nombre del hábito.
         time_of_day (Enum): Momento del día en que se realiza el hábito ('mañana', 'tarde' o 'noche').
         habit_status (bool): Estado del hábito (activo o inactivo).
+        updated_at (datetime): Fecha y hora de la última modificación, usada por la sincronización incremental.
         assignments (list): Lista de asignaciones relacionadas con el hábito.
     """
 
     __tablename__ = 'habits'  # Nombre de la tabla en la base de datos
+    __table_args__ = (
+        # Índice parcial que solo contiene los hábitos activos, usado por las lecturas por defecto
+        db.Index('ix_habits_active_habit_name', 'habit_name', postgresql_where=db.text('habit_status')),
+        # La búsqueda por nombre usa además los índices de expresión ix_habits_habit_name_prefix y
+        # ix_habits_habit_name_trgm (pg_trgm), creados en la migración e4b27f90c6a1
+    )
 
     # Definición de columnas de la tabla
     habit_id = db.Column(db.Integer, primary_key=True) # Clave primaria
     habit_name = db.Column(db.String(100), nullable=False) # Nombre del hábito
     time_of_day = db.Column(db.Enum('mañana', 'tarde', 'noche', name='time_of_day_enum'), nullable=True) # Jornada en que se realizará el hábito
     habit_status = db.Column(db.Boolean, server_default=db.true(), nullable=False) # Status del hábito (activo/inactivo)
+    updated_at = db.Column(db.DateTime, server_default=db.func.now(), onupdate=db.func.now(), nullable=False) # Última modificación, con el reloj de la base de datos
     assignments = db.relationship('Assignment', backref='habit', lazy=True)  # Relación con la tabla 'assignments'
 
     def __init__(self, habit_name, time_of_day):
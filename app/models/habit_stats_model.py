@@ -0,0 +1,28 @@
+from app import db
+
+
+class HabitStats(db.Model):
+    """
+    Modelo que representa las estadísticas de popularidad de un hábito, precalculadas para el catálogo.
+
+    La tabla se recalcula completa con `flask analytics habit-stats` (o el trabajo `refresh_habit_stats`),
+    de modo que `GET /habits/?include=stats` solo la lee en lugar de agregar las asignaciones y las fechas
+    completadas en cada petición.
+
+    Atributos:
+        habit_id (int): ID del hábito (clave primaria y foránea).
+        active_users (int): Usuarios activos con una asignación activa del hábito.
+        active_assignments (int): Asignaciones activas del hábito de usuarios activos.
+        completions (int): Fechas completadas de esas asignaciones dentro de la ventana del cálculo.
+        completion_rate (float): Proporción de los días programados de la ventana que se completaron.
+        computed_at (datetime): Fecha y hora del cálculo.
+    """
+
+    __tablename__ = 'habit_stats'
+
+    habit_id = db.Column(db.Integer, db.ForeignKey('habits.habit_id', ondelete='CASCADE'), primary_key=True)
+    active_users = db.Column(db.Integer, nullable=False)
+    active_assignments = db.Column(db.Integer, nullable=False)
+    completions = db.Column(db.Integer, nullable=False)
+    completion_rate = db.Column(db.Float, nullable=False)
+    computed_at = db.Column(db.DateTime, nullable=False)
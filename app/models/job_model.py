@@ -0,0 +1,64 @@
+from app import db
+
+
+class Job(db.Model):
+    """
+    Modelo que representa un trabajo en segundo plano, ejecutado por los procesos de `flask jobs worker`.
+
+    Los workers toman los trabajos pendientes cuyo `run_after` ya pasó, en orden, con
+    `SELECT ... FOR UPDATE SKIP LOCKED` en PostgreSQL, así varios workers no toman el mismo trabajo.
+
+    Atributos:
+        job_id (str): Identificador del trabajo (clave primaria, hexadecimal de un UUID).
+        job_type (str): Tipo de trabajo; determina la función del servicio que se ejecuta.
+        params (dict): Argumentos con nombre de la función.
+        status (str): 'pending', 'running', 'finished' o 'failed'.
+        progress (dict): Último progreso reportado por el trabajo.
+        result (JSON): Valor retornado por la función, si terminó.
+        error (str): Último error de ejecución.
+        attempts (int): Intentos de ejecución realizados.
+        max_attempts (int): Intentos permitidos antes de marcar el trabajo como fallido.
+        run_after (datetime): Momento a partir del cual el trabajo puede ejecutarse (se aplaza en los reintentos).
+        locked_by (str): Worker que está ejecutando el trabajo.
+        heartbeat_at (datetime): Última señal de vida del worker que ejecuta el trabajo.
+        created_date (datetime): Fecha y hora de creación.
+        started_date (datetime): Fecha y hora del inicio del último intento.
+        finished_date (datetime): Fecha y hora de finalización.
+    """
+
+    __tablename__ = 'jobs'
+    __table_args__ = (
+        # Cola de trabajos pendientes en el orden en que se toman, y búsqueda de los que están en ejecución
+        db.Index('ix_jobs_status_run_after', 'status', 'run_after'),
+    )
+
+    job_id = db.Column(db.String(32), primary_key=True)
+    job_type = db.Column(db.String(50), nullable=False)
+    params = db.Column(db.JSON, nullable=False)
+    status = db.Column(db.String(10), server_default='pending', nullable=False)
+    progress = db.Column(db.JSON, nullable=True)
+    result = db.Column(db.JSON, nullable=True)
+    error = db.Column(db.String(255), nullable=True)
+    attempts = db.Column(db.SmallInteger, server_default=db.text('0'), nullable=False)
+    max_attempts = db.Column(db.SmallInteger, nullable=False)
+    run_after = db.Column(db.DateTime, server_default=db.func.now(), nullable=False)
+    locked_by = db.Column(db.String(100), nullable=True)
+    heartbeat_at = db.Column(db.DateTime, nullable=True)
+    created_date = db.Column(db.DateTime, server_default=db.func.now(), nullable=False, index=True)
+    started_date = db.Column(db.DateTime, nullable=True)
+    finished_date = db.Column(db.DateTime, nullable=True)
+
+    def __init__(self, job_id, job_type, params, max_attempts):
+        """
+        Constructor de la clase Job.
+
+        Args:
+            job_id (str): Identificador del trabajo.
+            job_type (str): Tipo de trabajo.
+            params (dict): Argumentos con nombre de la función.
+            max_attempts (int): Intentos permitidos.
+        """
+        self.job_id = job_id
+        self.job_type = job_type
+        self.params = params
+        self.max_attempts = max_attempts
@@ -0,0 +1,47 @@
+from app import db
+
+
+class OutboxEvent(db.Model):
+    """
+    Modelo que representa un evento de cambio de la bandeja de salida (outbox) transaccional.
+
+    Los servicios agregan el evento en la misma transacción que el cambio que describe, por lo que un
+    evento existe si y solo si el cambio fue confirmado. Los consumidores leen los eventos en orden de
+    `event_id`, por ventanas de transacciones terminadas, con `GET /changes?after=<next_cursor>`.
+
+    Atributos:
+        event_id (int): Identificador creciente del evento (clave primaria), usado como cursor.
+        entity (str): Tipo de la entidad modificada ('user', 'habit', 'assignment' o 'completed_date').
+        entity_id (int): ID de la entidad modificada.
+        operation (str): Operación realizada ('created', 'updated' o 'deleted').
+        payload (dict): Datos de la entidad después del cambio (o sus claves, si fue eliminada).
+        xact_id (int): ID de la transacción que registró el evento (`pg_current_xact_id()` en PostgreSQL, 0
+                       en otros motores y en los eventos anteriores a la columna).
+        created_at (datetime): Fecha y hora del cambio.
+    """
+
+    __tablename__ = 'outbox_events'
+
+    event_id = db.Column(db.BigInteger().with_variant(db.Integer, 'sqlite'), primary_key=True)
+    entity = db.Column(db.String(50), nullable=False)
+    entity_id = db.Column(db.Integer, nullable=False)
+    operation = db.Column(db.String(20), nullable=False)
+    payload = db.Column(db.JSON, nullable=False)
+    # En PostgreSQL la migración define como valor por defecto el ID de la transacción en curso
+    xact_id = db.Column(db.BigInteger, server_default=db.text('0'), nullable=False, index=True)
+    created_at = db.Column(db.DateTime, server_default=db.func.now(), nullable=False, index=True)
+
+    def __init__(self, entity, entity_id, operation, payload):
+        """
+        Constructor de la clase OutboxEvent.
+
+        Args:
+            entity (str): Tipo de la entidad modificada.
+            entity_id (int): ID de la entidad modificada.
+            operation (str): Operación realizada.
+            payload (dict): Datos de la entidad.
+        """
+        self.entity = entity
+        self.entity_id = entity_id
+        self.operation = operation
+        self.payload = payload
@@ -0,0 +1,36 @@
+from app import db
+
+
+class ReminderDispatch(db.Model):
+    """
+    Modelo que registra el envío de un recordatorio: uno por asignación, día y momento del día.
+
+    La clave primaria hace idempotente la planificación (volver a planificar un turno no duplica los
+    recordatorios) y el estado evita reenviar los que ya se enviaron.
+
+    Atributos:
+        dispatch_date (date): Día del recordatorio (clave primaria).
+        time_of_day (str): Momento del día del recordatorio ('mañana', 'tarde' o 'noche') (clave primaria).
+        fk_assignment_id (int): ID de la asignación pendiente (clave primaria y foránea).
+        fk_user_id (int): ID del usuario a notificar.
+        status (str): 'pending', 'sending' (tomado por un proceso), 'sent', 'failed' o 'skipped' (la
+                      asignación se completó o desactivó antes del envío).
+        attempts (int): Intentos de envío realizados.
+        claimed_at (datetime): Fecha y hora en que un proceso tomó el recordatorio para enviarlo.
+        sent_at (datetime): Fecha y hora del envío.
+        error (str): Último error de envío.
+    """
+
+    __tablename__ = 'reminder_dispatches'
+
+    dispatch_date = db.Column(db.Date, primary_key=True)
+    time_of_day = db.Column(db.String(10), primary_key=True)
+    # Índice propio para el borrado en cascada de las asignaciones (la clave primaria empieza por el día)
+    fk_assignment_id = db.Column(db.Integer, db.ForeignKey('assignments.assignment_id', ondelete='CASCADE'),
+                                 primary_key=True, index=True)
+    fk_user_id = db.Column(db.Integer, nullable=False)
+    status = db.Column(db.String(10), server_default='pending', nullable=False)
+    attempts = db.Column(db.SmallInteger, server_default=db.text('0'), nullable=False)
+    claimed_at = db.Column(db.DateTime, nullable=True)
+    sent_at = db.Column(db.DateTime, nullable=True)
+    error = db.Column(db.String(255), nullable=True)
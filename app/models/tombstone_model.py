@@ -0,0 +1,44 @@
+from app import db
+
+
+class Tombstone(db.Model):
+    """
+    Modelo que registra la eliminación de una fila, para que la sincronización incremental
+    (`GET /users/<id>/sync`) informe a los clientes qué filas deben borrar.
+
+    Las lápidas se agregan en la misma transacción que la eliminación y se conservan
+    `SYNC_TOMBSTONE_RETENTION_DAYS` días; los clientes con un token más antiguo reciben una
+    sincronización completa.
+
+    Atributos:
+        tombstone_id (int): Identificador de la lápida (clave primaria).
+        entity (str): Tipo de la fila eliminada ('habit', 'assignment' o 'completed_date').
+        entity_id (int): ID de la fila eliminada.
+        fk_user_id (int): ID del usuario dueño de la fila, o None para los hábitos (compartidos por todos).
+        deleted_at (datetime): Fecha y hora de la eliminación, con el reloj de la base de datos.
+    """
+
+    __tablename__ = 'tombstones'
+    __table_args__ = (
+        # Eliminaciones de un usuario (o de hábitos, con fk_user_id nulo) desde un momento
+        db.Index('ix_tombstones_fk_user_id_deleted_at', 'fk_user_id', 'deleted_at'),
+    )
+
+    tombstone_id = db.Column(db.BigInteger().with_variant(db.Integer, 'sqlite'), primary_key=True)
+    entity = db.Column(db.String(20), nullable=False)
+    entity_id = db.Column(db.Integer, nullable=False)
+    fk_user_id = db.Column(db.Integer, nullable=True)
+    deleted_at = db.Column(db.DateTime, server_default=db.func.now(), nullable=False, index=True)
+
+    def __init__(self, entity, entity_id, fk_user_id=None):
+        """
+        Constructor de la clase Tombstone.
+
+        Args:
+            entity (str): Tipo de la fila eliminada.
+            entity_id (int): ID de la fila eliminada.
+            fk_user_id (int, opcional): ID del usuario dueño de la fila.
+        """
+        self.entity = entity
+        self.entity_id = entity_id
+        self.fk_user_id = fk_user_id
@@ -16,9 +16,14 @@ class User(db.Model):
         user_password (str): Contraseña encriptada del usuario.
         user_status (bool): Estado del usuario, indica si está activo o inactivo (True = activo, False = inactivo).
         user_created_date (datetime): Fecha de creación del usuario.
+        updated_at (datetime): Fecha y hora de la última modificación, usada por la sincronización incremental.
     """
 
     __tablename__ = 'users'  # Especifica el nombre de la tabla en la base de datos
+    __table_args__ = (
+        # Índice parcial que solo contiene a los usuarios activos, usado por las lecturas por defecto
+        db.Index('ix_users_active_user_id', 'user_id', postgresql_where=db.text('user_status')),
+    )
 
     # Definición de columnas de la tabla
     user_id = db.Column(db.Integer, primary_key=True)  # Clave primaria de la tabla
@@ -29,6 +34,7 @@ class User(db.Model):
     user_password = db.Column(db.String(200), nullable=False)  # Contraseña encriptada del usuario, no puede ser nula
     user_status = db.Column(db.Boolean, server_default=db.true(), nullable=False)  # Estado del usuario, por defecto es activo
     user_created_date = db.Column(db.DateTime, server_default=db.func.now(), nullable=False) # Fecha de creación del usuario, no puede ser nula
+    updated_at = db.Column(db.DateTime, server_default=db.func.now(), onupdate=db.func.now(), nullable=False) # Última modificación, con el reloj de la base de datos
     assignments = db.relationship('Assignment', backref='user', lazy=True) # Relación con la tabla assignments
 
     def __init__(self, first_name, last_name, nickname, email, user_password, user_created_date):
@@ -0,0 +1,254 @@
+import os
+from array import array
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, date, time, timedelta
+from flask import current_app
+from app import db
+from app.models.user_model import User
+from app.models.habit_model import Habit
+from app.models.assignment_model import Assignment
+from app.models.completed_date_model import CompletedDate
+from app.models.cohort_retention_model import CohortRetention
+from app.models.habit_stats_model import HabitStats
+from app.utils.read_query import ReadQuery
+
+
+def _week_index(day):
+    """Número de semana (de lunes a domingo) de una fecha; el 1 de enero del año 1 fue lunes."""
+    return (day.toordinal() - 1) // 7
+
+
+def _cohort_counts(task):
+    """
+    Cuenta los usuarios distintos de una cohorte activos en cada semana. Se ejecuta en los procesos
+    del pool, por lo que solo recibe y retorna tipos simples.
+
+    Args:
+        task (tuple): (semana de la cohorte, semanas a calcular, arreglo de claves usuario * semanas + desplazamiento).
+
+    Returns:
+        tuple: (semana de la cohorte, lista con la cantidad de usuarios retenidos por desplazamiento).
+    """
+    cohort_week, weeks, keys = task
+    counts = array('l', bytes(array('l').itemsize * weeks))
+    for key in set(keys):
+        counts[key % weeks] += 1
+    return cohort_week, counts.tolist()
+
+
+def _scheduled_days(first_day, last_day, schedule_days, schedule_every, schedule_start):
+    """Cantidad de días entre `first_day` y `last_day` (inclusive) en que corresponde una programación."""
+    count = 0
+    day = first_day
+    while day <= last_day:
+        if schedule_days >> day.weekday() & 1 and (
+                schedule_every is None
+                or (day >= schedule_start and (day - schedule_start).days % schedule_every == 0)):
+            count += 1
+        day += timedelta(days=1)
+    return count
+
+
+class AnalyticsService:
+    """
+    Servicio de analítica calculada por lotes.
+
+    Los cálculos leen cada tabla una sola vez, en forma secuencial y por bloques (`ANALYTICS_FETCH_SIZE`
+    filas), y cruzan los datos en memoria sobre arreglos columnares indexados por ID. Así la base de datos
+    no ejecuta joins ad hoc sobre millones de filas y las peticiones solo leen el resultado guardado.
+    """
+
+    @staticmethod
+    def _stream(statement):
+        return db.session.execute(statement.execution_options(yield_per=current_app.config['ANALYTICS_FETCH_SIZE']))
+
+    @staticmethod
+    def refresh_cohort_retention(max_weeks=None, workers=None):
+        """
+        Recalcula la matriz de retención semanal por cohortes y la guarda en `cohort_retention`.
+
+        Las cohortes se procesan en paralelo con un pool de procesos. El borrado y la inserción del
+        resultado ocurren en la misma transacción, de modo que las lecturas concurrentes ven la matriz
+        anterior hasta que la nueva está completa.
+
+        Args:
+            max_weeks (int, opcional): Semanas posteriores a la creación a calcular por cohorte. Por defecto
+                                       se usa `RETENTION_MAX_WEEKS` de la configuración.
+            workers (int, opcional): Procesos a usar. Por defecto `ANALYTICS_WORKERS` o la cantidad de CPUs.
+
+        Returns:
+            int: Cantidad de celdas guardadas en la matriz.
+        """
+        max_weeks = max_weeks or current_app.config['RETENTION_MAX_WEEKS']
+        workers = workers or current_app.config['ANALYTICS_WORKERS'] or os.cpu_count() or 1
+        weeks = max_weeks + 1
+        current_week = _week_index(date.today())
+
+        # Columnas de usuarios: semana de creación indexada por user_id (-1 si el ID no existe). Cada lectura
+        # se limita a los IDs que caben en su arreglo: las filas insertadas mientras corre el cálculo (y las
+        # que hacen referencia a ellas) quedan para el siguiente
+        max_user_id = db.session.scalar(db.select(db.func.max(User.user_id))) or 0
+        user_cohort = array('l', [-1]) * (max_user_id + 1)
+        cohort_sizes = Counter()
+        for user_id, created_date in AnalyticsService._stream(
+                db.select(User.user_id, User.user_created_date).where(User.user_id <= max_user_id)):
+            cohort_week = _week_index(created_date)
+            user_cohort[user_id] = cohort_week
+            cohort_sizes[cohort_week] += 1
+
+        # Columnas de asignaciones: usuario dueño indexado por assignment_id
+        max_assignment_id = db.session.scalar(db.select(db.func.max(Assignment.assignment_id))) or 0
+        assignment_user = array('l', bytes(array('l').itemsize * (max_assignment_id + 1)))
+        for assignment_id, user_id in AnalyticsService._stream(
+                db.select(Assignment.assignment_id, Assignment.fk_user_id)
+                .where(Assignment.assignment_id <= max_assignment_id, Assignment.fk_user_id <= max_user_id)):
+            assignment_user[assignment_id] = user_id
+
+        # Actividad por cohorte, codificada como user_id * weeks + desplazamiento para deduplicar con un set
+        activity = {cohort_week: array('q') for cohort_week in cohort_sizes}
+        for assignment_id, completed_date in AnalyticsService._stream(
+                db.select(CompletedDate.fk_assignment_id, CompletedDate.completed_date)
+                .where(CompletedDate.fk_assignment_id <= max_assignment_id)):
+            user_id = assignment_user[assignment_id]
+            cohort_week = user_cohort[user_id]
+            offset = _week_index(completed_date) - cohort_week
+            if cohort_week >= 0 and 0 <= offset < weeks:
+                activity[cohort_week].append(user_id * weeks + offset)
+
+        tasks = [(cohort_week, weeks, keys) for cohort_week, keys in activity.items()]
+        if workers > 1 and len(tasks) > 1:
+            with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as executor:
+                results = list(executor.map(_cohort_counts, tasks, chunksize=max(1, len(tasks) // (workers * 4))))
+        else:
+            results = [_cohort_counts(task) for task in tasks]
+
+        computed_at = datetime.now()
+        rows = []
+        for cohort_week, counts in results:
+            size = cohort_sizes[cohort_week]
+            # Solo se guardan las semanas que ya transcurrieron
+            for offset in range(min(weeks, current_week - cohort_week + 1)):
+                rows.append({
+                    'cohort_week': date.fromordinal(cohort_week * 7 + 1),
+                    'week_offset': offset,
+                    'cohort_size': size,
+                    'retained_users': counts[offset],
+                    'retention_rate': counts[offset] / size,
+                    'computed_at': computed_at
+                })
+
+        db.session.execute(db.delete(CohortRetention))
+        if rows:
+            db.session.execute(db.insert(CohortRetention), rows)
+        db.session.commit()
+        return len(rows)
+
+    @staticmethod
+    def get_cohort_retention(since=None):
+        """
+        Obtiene la matriz de retención por cohortes guardada.
+
+        Args:
+            since (date, opcional): Si se indica, solo se retornan las cohortes de esa semana en adelante.
+
+        Returns:
+            dict: `computed_at` (None si la matriz nunca se calculó) y `cohorts`, una lista ordenada por semana
+                  con `cohort_week`, `cohort_size`, `retained_users` y `retention` (una proporción por semana).
+        """
+        query = ReadQuery(CohortRetention).order_by(CohortRetention.cohort_week, CohortRetention.week_offset)
+        if since is not None:
+            query = query.filter(CohortRetention.cohort_week >= since)
+
+        cohorts = {}
+        computed_at = None
+        for cell in query.all():
+            cohort = cohorts.setdefault(cell.cohort_week, {
+                'cohort_week': cell.cohort_week.isoformat(),
+                'cohort_size': cell.cohort_size,
+                'retained_users': [],
+                'retention': []
+            })
+            cohort['retained_users'].append(cell.retained_users)
+            cohort['retention'].append(round(cell.retention_rate, 4))
+            computed_at = cell.computed_at
+
+        return {
+            'computed_at': computed_at.isoformat() if computed_at else None,
+            'cohorts': list(cohorts.values())
+        }
+
+    @staticmethod
+    def refresh_habit_stats(window_days=None):
+        """
+        Recalcula las estadísticas de popularidad de todos los hábitos y las guarda en `habit_stats`.
+
+        Se consideran las asignaciones activas de usuarios activos. La tasa de completado de un hábito es
+        la proporción de los días de la ventana (desde la creación de cada asignación, si es posterior) en
+        que sus asignaciones correspondían según su programación y se completaron. Las agregaciones se
+        hacen en la base de datos, agrupadas por hábito; solo los días programados se cuentan en Python,
+        por grupo de asignaciones con el mismo día de inicio y la misma programación.
+
+        El borrado y la inserción ocurren en la misma transacción, de modo que las lecturas concurrentes
+        ven las estadísticas anteriores hasta que las nuevas están completas.
+
+        Args:
+            window_days (int, opcional): Días hacia atrás, incluido hoy, que abarca la tasa de completado.
+                                         Por defecto se usa `HABIT_STATS_WINDOW_DAYS` de la configuración.
+
+        Returns:
+            int: Cantidad de hábitos con estadísticas guardadas.
+        """
+        window_days = window_days or current_app.config['HABIT_STATS_WINDOW_DAYS']
+        today = date.today()
+        start = today - timedelta(days=window_days - 1)
+        # Asignaciones activas de usuarios activos, agrupadas por hábito
+        by_habit = (
+            db.select(Assignment.fk_habit_id)
+            .join(User, User.user_id == Assignment.fk_user_id)
+            .where(Assignment.assignment_status, User.user_status)
+            .group_by(Assignment.fk_habit_id)
+        )
+
+        users = {
+            habit_id: (active_users, active_assignments)
+            for habit_id, active_users, active_assignments in db.session.execute(
+                by_habit.add_columns(db.func.count(Assignment.fk_user_id.distinct()), db.func.count()))
+        }
+
+        # Días programados de la ventana por hábito: las asignaciones se agrupan por día de inicio dentro de
+        # la ventana (su creación, o el inicio de la ventana si se crearon antes) y por programación
+        first_day = db.case(
+            (Assignment.created_date < datetime.combine(start, time.min), db.literal(start, db.Date)),
+            else_=db.func.date(Assignment.created_date, type_=db.Date))
+        schedule = (first_day, Assignment.schedule_days, Assignment.schedule_every, Assignment.schedule_start)
+        expected = Counter()
+        for habit_id, group_start, schedule_days, schedule_every, schedule_start, assignments in db.session.execute(
+                by_habit.add_columns(*schedule, db.func.count()).group_by(*schedule)):
+            expected[habit_id] += assignments * _scheduled_days(
+                group_start, today, schedule_days, schedule_every, schedule_start)
+
+        completions = dict(db.session.execute(
+            by_habit.add_columns(db.func.count())
+            .join(CompletedDate, CompletedDate.fk_assignment_id == Assignment.assignment_id)
+            .where(CompletedDate.completed_date.between(start, today))).all())
+
+        computed_at = datetime.now()
+        rows = []
+        for habit_id in db.session.scalars(db.select(Habit.habit_id)):
+            active_users, active_assignments = users.get(habit_id, (0, 0))
+            done = completions.get(habit_id, 0)
+            rows.append({
+                'habit_id': habit_id,
+                'active_users': active_users,
+                'active_assignments': active_assignments,
+                'completions': done,
+                'completion_rate': min(done / expected[habit_id], 1.0) if expected[habit_id] else 0.0,
+                'computed_at': computed_at
+            })
+
+        db.session.execute(db.delete(HabitStats))
+        if rows:
+            db.session.execute(db.insert(HabitStats), rows)
+        db.session.commit()
+        return len(rows)
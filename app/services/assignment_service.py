@@ -2,8 +2,16 @@ from app import db
 from app.models.assignment_model import Assignment
 from app.models.habit_model import Habit
 from app.models.user_model import User
+from app.models.completed_date_model import CompletedDate
+from app.services.completed_date_service import CompletedDateService
+from app.services.outbox_service import OutboxService
+from app.services.sync_service import SyncService
 from app.utils.validations import Validations
-from datetime import datetime
+from app.utils.sparse_fields import SparseFields
+from app.utils.batch_lookup import BatchLookup
+from app.utils.read_query import ReadQuery
+from app.utils.exceptions import InvalidDataError
+from datetime import datetime, date, time, timedelta
 
 class AssignmentService:
     """
@@ -28,8 +36,8 @@ class AssignmentService:
             ValueError: Si ya existe una asignación con el mismo usuario y hábito.
         """
         # Verificar que la el id del usuario y del hábitos existan en sus respectivas tablas
-        Validations.check_fk_existence(User.user_id, fk_user_id, 'users')
-        Validations.check_fk_existence(Habit.habit_id, fk_habit_id, 'habits')
+        Validations.check_fk_existence(User.user_id, fk_user_id, 'users', User.user_status)
+        Validations.check_fk_existence(Habit.habit_id, fk_habit_id, 'habits', Habit.habit_status)
 
         # Verificar que no exista una asignación duplicada para el mismo usuario y hábito
         Validations.check_data_pair_existence(Assignment.fk_user_id, fk_user_id, Assignment.fk_habit_id, fk_habit_id, 'assignment')
@@ -37,29 +45,40 @@ class AssignmentService:
         # Crear una nueva asignación
         new_assignment = Assignment(fk_user_id, fk_habit_id, created_date=datetime.now())
         
-        # Guardar la nueva asignación en la base de datos
+        # Guardar la nueva asignación en la base de datos, junto con su evento en la bandeja de salida
         db.session.add(new_assignment)
+        db.session.flush()
+        OutboxService.record('assignment', 'created', OutboxService.assignment_payload(new_assignment))
         db.session.commit()
 
         return new_assignment
     
     @staticmethod
-    def get_all_assignments():
+    def get_all_assignments(include_inactive=False, fields=None):
         """
         Obtener todas las asignaciones de la base de datos.
 
+        Args:
+            include_inactive (bool): Si es True también se incluyen las asignaciones desactivadas.
+            fields (list, opcional): Columnas a seleccionar; si se indican se retornan filas con solo esas columnas.
+
         Returns:
             List[Assignment]: Lista de todas las asignaciones en la base de datos.
         """
-        return Assignment.query.all()
+        query = SparseFields.query(Assignment, fields)
+        if not include_inactive:
+            query = query.filter(Assignment.assignment_status)
+        return query.all()
     
     @staticmethod
-    def get_assignments_by_user_id(fk_user_id):
+    def get_assignments_by_user_id(fk_user_id, include_inactive=False, fields=None):
         """
         Obtener todas las asignaciones de un usuario por su ID.
 
         Args:
             fk_user_id (int): El ID del usuario para buscar sus asignaciones.
+            include_inactive (bool): Si es True también se incluyen las asignaciones desactivadas.
+            fields (list, opcional): Columnas a seleccionar; si se indican se retornan filas con solo esas columnas.
 
         Returns:
             List[Assignment]: Lista de asignaciones del usuario.
@@ -68,7 +87,11 @@ class AssignmentService:
             ValueError: Si no se encuentran asignaciones para el usuario dado.
         """
         # Buscar asignaciones por el ID del usuario
-        assignments = Assignment.query.filter_by(fk_user_id=fk_user_id).all()
+        query = SparseFields.query(Assignment, fields).filter(Assignment.fk_user_id == fk_user_id)
+        if not include_inactive:
+            # Las asignaciones activas de un usuario se resuelven con el índice parcial ix_assignments_active_fk_user_id
+            query = query.filter(Assignment.assignment_status)
+        assignments = query.all()
         # Verificar si se encontraron asignaciones
         assignments_validated = Validations.check_if_exists(assignments, 'Assignment')
         
@@ -89,19 +112,27 @@ class AssignmentService:
             ValueError: Si la asignación no se encuentra.
         """
         # Obtener la asignación por su ID
-        assignment = AssignmentService.get_assignment_by_assignment_id(assignment_id)
+        assignment = AssignmentService.get_assignment_by_assignment_id(assignment_id, include_inactive=True)
+        user_id = assignment.fk_user_id
+        payload = OutboxService.assignment_payload(assignment)
         
         # Eliminar la asignación de la base de datos
         db.session.delete(assignment)
+        OutboxService.record('assignment', 'deleted', payload)
+        SyncService.record_tombstone('assignment', assignment_id, user_id)
         db.session.commit()
+        # Sus fechas completadas dejan de contar en el mapa de calor del usuario
+        CompletedDateService.invalidate_heatmap(user_id)
+        Validations.invalidate_fk_existence('assignments', [assignment_id])
 
     @staticmethod
-    def get_assignment_by_assignment_id(assignment_id):
+    def get_assignment_by_assignment_id(assignment_id, include_inactive=False):
         """
         Obtener una asignación por su ID.
 
         Args:
             assignment_id (int): El ID de la asignación a buscar.
+            include_inactive (bool): Si es True también se retorna la asignación aunque esté desactivada.
 
         Returns:
             Assignment: La asignación que coincide con el ID proporcionado.
@@ -110,8 +141,197 @@ class AssignmentService:
             ValueError: Si la asignación no se encuentra.
         """
         # Buscar la asignación por su ID
-        assignment = Assignment.query.filter_by(assignment_id=assignment_id).first()
+        query = Assignment.query.filter_by(assignment_id=assignment_id)
+        if not include_inactive:
+            query = query.filter(Assignment.assignment_status)
+        assignment = query.first()
         # Validar que la asignación exista
         assignment_validated = Validations.check_if_exists(assignment, 'Assignment')
         
         return assignment_validated
+
+    @staticmethod
+    def set_assignment_status(assignment_id, status):
+        """
+        Activa o desactiva una asignación sin eliminar su historial.
+
+        Args:
+            assignment_id (int): El ID de la asignación.
+            status (bool): True para reactivar la asignación, False para desactivarla.
+
+        Returns:
+            Assignment: La asignación actualizada.
+
+        Raises:
+            ValueError: Si la asignación no se encuentra.
+        """
+        assignment = AssignmentService.get_assignment_by_assignment_id(assignment_id, include_inactive=True)
+        if assignment.assignment_status != status:
+            assignment.assignment_status = status
+            OutboxService.record('assignment', 'updated', OutboxService.assignment_payload(assignment))
+        db.session.commit()
+        if not status:
+            Validations.invalidate_fk_existence('assignments', [assignment_id])
+        return assignment
+
+    @staticmethod
+    def set_assignments_status_by_filter(status, assignment_ids=None, fk_user_id=None, fk_habit_id=None):
+        """
+        Activa o desactiva en una sola sentencia UPDATE todas las asignaciones que cumplan los filtros.
+
+        Args:
+            status (bool): El nuevo estado de las asignaciones.
+            assignment_ids (list, opcional): IDs de las asignaciones.
+            fk_user_id (int, opcional): ID del usuario de las asignaciones.
+            fk_habit_id (int, opcional): ID del hábito de las asignaciones.
+
+        Returns:
+            int: Cantidad de asignaciones modificadas.
+
+        Raises:
+            ValueError: Si no se indica ningún filtro.
+        """
+        conditions = []
+        if assignment_ids:
+            conditions.append(Assignment.assignment_id.in_(assignment_ids))
+        if fk_user_id is not None:
+            conditions.append(Assignment.fk_user_id == fk_user_id)
+        if fk_habit_id is not None:
+            conditions.append(Assignment.fk_habit_id == fk_habit_id)
+        if not conditions:
+            raise InvalidDataError('At least one filter (assignment_ids, fk_user_id, fk_habit_id) is required.')
+        # Solo se modifican las filas cuyo estado realmente cambia
+        conditions.append(Assignment.assignment_status.is_(not status))
+        updated = db.session.execute(
+            db.update(Assignment).where(*conditions).values(assignment_status=status)
+            .returning(Assignment.assignment_id, Assignment.fk_user_id, Assignment.fk_habit_id,
+                       Assignment.assignment_status, Assignment.created_date)
+            .execution_options(synchronize_session=False)).all()
+        OutboxService.record_many('assignment', 'updated', [OutboxService.assignment_payload(row) for row in updated])
+        db.session.commit()
+        if not status:
+            Validations.invalidate_fk_existence('assignments', [row.assignment_id for row in updated])
+        return len(updated)
+
+    @staticmethod
+    def get_assignments_by_ids(assignment_ids, include_inactive=False, fields=None):
+        """
+        Obtiene varias asignaciones por sus IDs en una sola consulta.
+
+        Args:
+            assignment_ids (list): IDs de las asignaciones en el orden en que deben retornarse.
+            include_inactive (bool): Si es True también se incluyen las asignaciones desactivadas.
+            fields (list, opcional): Columnas a seleccionar; si se indican se retornan filas con solo esas columnas.
+
+        Returns:
+            tuple: (List[Assignment] en el orden pedido, lista de IDs que no se encontraron).
+        """
+        # El ID siempre se selecciona para poder ordenar el resultado según la petición
+        columns = fields if not fields or 'assignment_id' in fields else fields + ['assignment_id']
+        query = SparseFields.query(Assignment, columns).filter(BatchLookup.id_condition(Assignment.assignment_id, assignment_ids))
+        if not include_inactive:
+            query = query.filter(Assignment.assignment_status)
+        return BatchLookup.order_results(query.all(), assignment_ids, 'assignment_id')
+
+    @staticmethod
+    def set_assignment_schedule(assignment_id, schedule_days=None, schedule_every=None, schedule_start=None):
+        """
+        Define en qué días corresponde realizar el hábito de una asignación.
+
+        Los días de la semana y la repetición cada N días se combinan: el hábito corresponde los días que
+        cumplen ambas condiciones. Sin argumentos la asignación vuelve a corresponder todos los días.
+
+        Args:
+            assignment_id (int): El ID de la asignación.
+            schedule_days (list, opcional): Días de la semana, de 0 (lunes) a 6 (domingo). Por defecto todos.
+            schedule_every (int, opcional): Repetir cada N días (entre 1 y 365).
+            schedule_start (date, opcional): Primer día de la repetición cada N días. Por defecto hoy.
+
+        Returns:
+            Assignment: La asignación actualizada.
+
+        Raises:
+            ValueError: Si la asignación no se encuentra o si la programación es inválida.
+        """
+        if schedule_days is None:
+            mask = Assignment.ALL_DAYS
+        else:
+            if not schedule_days or any(not isinstance(day, int) or not 0 <= day <= 6 for day in schedule_days):
+                raise InvalidDataError('schedule_days must be a non-empty list of weekdays from 0 (Monday) to 6 (Sunday).')
+            mask = sum(1 << day for day in set(schedule_days))
+        if schedule_every is not None and (not isinstance(schedule_every, int) or not 1 <= schedule_every <= 365):
+            raise InvalidDataError('schedule_every must be an integer between 1 and 365.')
+
+        assignment = AssignmentService.get_assignment_by_assignment_id(assignment_id, include_inactive=True)
+        assignment.schedule_days = mask
+        assignment.schedule_every = schedule_every
+        assignment.schedule_start = (schedule_start or date.today()) if schedule_every is not None else None
+        OutboxService.record('assignment', 'updated', OutboxService.assignment_payload(assignment))
+        db.session.commit()
+        return assignment
+
+    @staticmethod
+    def _days_since(column, day):
+        # Días entre una columna de fecha y un día, en SQL (la resta de fechas depende del motor)
+        if db.engine.dialect.name == 'postgresql':
+            return db.literal(day, db.Date) - column
+        return db.cast(db.func.julianday(day.isoformat()) - db.func.julianday(column), db.Integer)
+
+    @staticmethod
+    def get_due_assignments(user_id, day):
+        """
+        Obtiene las asignaciones activas de un usuario que corresponden a un día y todavía no se completaron.
+
+        Se resuelve con una única consulta: las asignaciones activas del usuario (índice parcial
+        ix_assignments_active_fk_user_id) cuya programación incluye el día, sin una fecha completada ese
+        día (anti-join con NOT EXISTS sobre ix_completed_dates_fk_assignment_id_completed_date).
+
+        Args:
+            user_id (int): El ID del usuario.
+            day (date): El día a consultar.
+
+        Returns:
+            list: Filas con `assignment_id`, `fk_habit_id`, `habit_name`, `time_of_day` y la programación,
+                  ordenadas por momento del día y nombre del hábito.
+
+        Raises:
+            ValueError: Si el usuario no existe.
+        """
+        user = ReadQuery(User, ['user_id']).filter(User.user_id == user_id, User.user_status).first()
+        Validations.check_if_exists(user, 'User')
+        time_of_day_order = db.case({'mañana': 0, 'tarde': 1, 'noche': 2}, value=Habit.time_of_day, else_=3)
+
+        return ReadQuery(statement=(
+            db.select(Assignment.assignment_id, Assignment.fk_habit_id, Habit.habit_name, Habit.time_of_day,
+                      Assignment.schedule_days, Assignment.schedule_every, Assignment.schedule_start)
+            .join(Habit, Habit.habit_id == Assignment.fk_habit_id)
+            .where(Assignment.fk_user_id == user_id, Habit.habit_status, *AssignmentService.due_conditions(day))
+            .order_by(time_of_day_order, Habit.habit_name, Assignment.assignment_id)
+        )).all()
+
+    @staticmethod
+    def due_conditions(day):
+        """
+        Construye las condiciones SQL de una asignación activa que corresponde a un día según su
+        programación y todavía no tiene una fecha completada ese día.
+
+        Args:
+            day (date): El día.
+
+        Returns:
+            list: Condiciones para la cláusula WHERE de una consulta sobre `assignments`.
+        """
+        completed = db.select(CompletedDate.completed_date_id).where(
+            CompletedDate.fk_assignment_id == Assignment.assignment_id, CompletedDate.completed_date == day)
+        every_n_days = db.or_(
+            Assignment.schedule_every.is_(None),
+            db.and_(Assignment.schedule_start <= day,
+                    AssignmentService._days_since(Assignment.schedule_start, day) % Assignment.schedule_every == 0))
+        return [
+            Assignment.assignment_status,
+            # Las asignaciones creadas después del día consultado todavía no correspondían
+            Assignment.created_date < datetime.combine(day + timedelta(days=1), time.min),
+            Assignment.schedule_days.op('&')(1 << day.weekday()) != 0,
+            every_n_days,
+            ~completed.exists()
+        ]
@@ -1,8 +1,17 @@
+from array import array
+from flask import current_app
 from app import db
 from app.models.completed_date_model import CompletedDate
 from app.models.assignment_model import Assignment
+from app.models.user_model import User
+from app.services.user_service import UserService
+from app.services.outbox_service import OutboxService
+from app.services.sync_service import SyncService
 from app.utils.validations import Validations
-from datetime import datetime
+from app.utils.sparse_fields import SparseFields
+from app.utils.cache import LRUCache
+from app.utils.cache_invalidation import CacheInvalidation
+from datetime import datetime, timedelta
 
 class CompletedDateService:
     """
@@ -10,6 +19,15 @@ class CompletedDateService:
     relacionadas con las fechas en que un usuario completó un hábito.
     """
 
+    # Caché de los mapas de calor por usuario ({user_id: {year: heatmap}}); se crea en el primer uso
+    _heatmap_cache = None
+
+    # Generaciones de los mapas de calor, por usuario agrupado en `HEATMAP_GENERATION_SLOTS` posiciones;
+    # cada invalidación avanza la del usuario. Dos usuarios pueden compartir posición: solo se guarda en
+    # caché algo menos
+    HEATMAP_GENERATION_SLOTS = 4096
+    _heatmap_generations = [0] * HEATMAP_GENERATION_SLOTS
+
     @staticmethod
     def create_completed_date(assignment_id, completed_date):
         """
@@ -27,13 +45,17 @@ class CompletedDateService:
         Raises:
             ValueError: Si la asignación no existe o si la fecha de completación ya existe.
         """
-        Validations.check_fk_existence(Assignment.assignment_id, assignment_id, 'assignments')
+        Validations.check_fk_existence(Assignment.assignment_id, assignment_id, 'assignments', Assignment.assignment_status)
         Validations.check_data_pair_existence(CompletedDate.fk_assignment_id, assignment_id, CompletedDate.completed_date, completed_date, 'date')
         
         new_completed_date = CompletedDate(assignment_id, completed_date=datetime.now())
 
+        user_id = CompletedDateService._get_user_id_by_assignment_id(assignment_id)
         db.session.add(new_completed_date)
+        db.session.flush()
+        OutboxService.record('completed_date', 'created', OutboxService.completed_date_payload(new_completed_date, user_id))
         db.session.commit()
+        CompletedDateService.invalidate_heatmap(user_id)
 
         return new_completed_date
     
@@ -56,29 +78,53 @@ class CompletedDateService:
         return validated_date
     
     @staticmethod
-    def get_all_dates_by_assignment_id(assignment_id):
+    def _of_active_assignment():
+        # Condición de una fecha cuya asignación y cuyo usuario están activos
+        return db.select(Assignment.assignment_id).join(User, User.user_id == Assignment.fk_user_id).where(
+            Assignment.assignment_id == CompletedDate.fk_assignment_id, Assignment.assignment_status, User.user_status
+        ).exists()
+
+    @staticmethod
+    def get_all_dates_by_assignment_id(assignment_id, include_inactive=False, fields=None):
         """
         Obtener todas las fechas de completación asociadas a una asignación específica.
 
         Args:
             assignment_id (int): ID de la asignación para la cual se buscan las fechas de completación.
+            include_inactive (bool): Si es True también se retornan las fechas de una asignación desactivada
+                                     o de un usuario desactivado.
+            fields (list, opcional): Columnas a seleccionar; si se indican se retornan filas con solo esas columnas.
 
         Returns:
             List[CompletedDate]: Lista de fechas de completación asociadas a la asignación.
+
+        Raises:
+            ValueError: Si no se encuentran fechas para la asignación.
         """
-        dates = CompletedDate.query.filter_by(fk_assignment_id=assignment_id).all()
+        query = SparseFields.query(CompletedDate, fields).filter(CompletedDate.fk_assignment_id == assignment_id)
+        if not include_inactive:
+            query = query.filter(CompletedDateService._of_active_assignment())
+        dates = query.all()
         validated_date = Validations.check_if_exists(dates, 'Dates')
         return validated_date
     
     @staticmethod
-    def get_all_dates():
+    def get_all_dates(include_inactive=False, fields=None):
         """
         Obtener todas las fechas de completación en la base de datos.
 
+        Args:
+            include_inactive (bool): Si es True también se incluyen las fechas de asignaciones desactivadas
+                                     y de usuarios desactivados.
+            fields (list, opcional): Columnas a seleccionar; si se indican se retornan filas con solo esas columnas.
+
         Returns:
             List[CompletedDate]: Lista de todas las fechas de completación en la base de datos.
         """
-        return CompletedDate.query.all()
+        query = SparseFields.query(CompletedDate, fields)
+        if not include_inactive:
+            query = query.filter(CompletedDateService._of_active_assignment())
+        return query.all()
     
     @staticmethod
     def delete_date(completed_date_id):
@@ -97,6 +143,145 @@ class CompletedDateService:
         # Obtener la fecha de completación por su ID
         date = CompletedDateService.get_date_by_date_id(completed_date_id)
         
+        user_id = CompletedDateService._get_user_id_by_assignment_id(date.fk_assignment_id)
         # Eliminar la fecha de completación de la base de datos
         db.session.delete(date)
+        OutboxService.record('completed_date', 'deleted', OutboxService.completed_date_payload(date, user_id))
+        SyncService.record_tombstone('completed_date', completed_date_id, user_id)
         db.session.commit()
+        CompletedDateService.invalidate_heatmap(user_id)
+
+    @staticmethod
+    def get_current_streak(assignment_id):
+        """
+        Calcula la racha actual de una asignación: días consecutivos completados hasta hoy, o hasta ayer
+        si el hábito todavía no se completó hoy.
+
+        Args:
+            assignment_id (int): El ID de la asignación.
+
+        Returns:
+            int: La cantidad de días de la racha (0 si no hay racha vigente).
+        """
+        dates = db.session.scalars(
+            db.select(CompletedDate.completed_date).where(CompletedDate.fk_assignment_id == assignment_id)
+            .distinct().order_by(CompletedDate.completed_date.desc())
+            .execution_options(yield_per=100))
+        expected = datetime.now().date()
+        streak = 0
+        for completed_date in dates:
+            if streak == 0 and completed_date == expected - timedelta(days=1):
+                expected = completed_date
+            if completed_date != expected:
+                break
+            streak += 1
+            expected -= timedelta(days=1)
+        dates.close()
+        return streak
+
+    @staticmethod
+    def _get_user_id_by_assignment_id(assignment_id):
+        """Obtiene el ID del usuario dueño de una asignación."""
+        return db.session.scalar(db.select(Assignment.fk_user_id).where(Assignment.assignment_id == assignment_id))
+
+    @staticmethod
+    def _get_heatmap_cache():
+        if CompletedDateService._heatmap_cache is None:
+            CompletedDateService._heatmap_cache = LRUCache(
+                maxsize=current_app.config['HEATMAP_CACHE_SIZE'], ttl=current_app.config['HEATMAP_CACHE_TTL'])
+            CacheInvalidation.register('heatmap', CompletedDateService._discard_heatmaps)
+        return CompletedDateService._heatmap_cache
+
+    @staticmethod
+    def _discard_heatmaps(keys):
+        cache = CompletedDateService._get_heatmap_cache()
+        generations = CompletedDateService._heatmap_generations
+        if keys is None:
+            for slot in range(len(generations)):
+                generations[slot] += 1
+            cache.clear()
+            return
+        for user_id in keys:
+            generations[user_id % len(generations)] += 1
+            cache.pop(user_id)
+
+    @staticmethod
+    def invalidate_heatmap(user_id):
+        """
+        Descarta los mapas de calor en caché de un usuario (todos los años), en este proceso y en los demás
+        (ver `CacheInvalidation`). Debe llamarse después de confirmar la transacción.
+
+        Args:
+            user_id (int): El ID del usuario.
+        """
+        CompletedDateService._get_heatmap_cache()
+        CacheInvalidation.publish('heatmap', [user_id])
+
+    @staticmethod
+    def get_heatmap_by_user_id(user_id, year):
+        """
+        Obtiene el mapa de calor anual de un usuario: cantidad de hábitos completados en cada día del año,
+        sumando todas sus asignaciones.
+
+        Los conteos se obtienen con una única consulta agregada (GROUP BY fecha) y se vuelcan en un arreglo
+        de enteros indexado por día del año, por lo que el trabajo en Python depende de los días con
+        actividad y no de la cantidad de registros. El resultado queda en caché hasta la siguiente fecha
+        completada o eliminada del usuario, o hasta que expire `HEATMAP_CACHE_TTL`.
+
+        Para no guardar en caché un mapa anterior a la última invalidación, la consulta se hace siempre en
+        el primario (una réplica atrasada podría no tener la última fecha completada) y el resultado no se
+        guarda si el usuario se invalidó mientras se consultaba.
+
+        Args:
+            user_id (int): El ID del usuario.
+            year (int): El año a consultar.
+
+        Returns:
+            dict: `start_date`, `days` (cantidad de días del año), `counts` (un entero por día, empezando
+                  el 1 de enero), `total` y `max`.
+
+        Raises:
+            ValueError: Si el usuario no existe.
+        """
+        UserService.get_user_by_user_id(user_id, include_inactive=True)
+        cache = CompletedDateService._get_heatmap_cache()
+        user_heatmaps = cache.get(user_id)
+        if user_heatmaps is not None and year in user_heatmaps:
+            return user_heatmaps[year]
+
+        generations = CompletedDateService._heatmap_generations
+        slot = user_id % len(generations)
+        generation = generations[slot]
+        start, end = datetime(year, 1, 1).date(), datetime(year + 1, 1, 1).date()
+        rows = db.session.execute(
+            db.select(CompletedDate.completed_date, db.func.count())
+            .join(Assignment, Assignment.assignment_id == CompletedDate.fk_assignment_id)
+            .where(Assignment.fk_user_id == user_id, CompletedDate.completed_date >= start, CompletedDate.completed_date < end)
+            .group_by(CompletedDate.completed_date),
+            bind_arguments={'bind': db.engine}
+        ).all()
+
+        days = (end - start).days
+        counts = array('I', bytes(array('I').itemsize * days))
+        start_ordinal = start.toordinal()
+        # Una fila por día con actividad: como mucho 366 iteraciones
+        for completed_date, count in rows:
+            counts[completed_date.toordinal() - start_ordinal] = count
+
+        heatmap = {
+            'user_id': user_id,
+            'year': year,
+            'start_date': start.isoformat(),
+            'days': days,
+            'counts': counts.tolist(),
+            'total': sum(counts),
+            'max': max(counts)
+        }
+        CacheInvalidation.ensure_listening()
+        if generations[slot] != generation:
+            # Se invalidó durante la consulta: el resultado puede no incluir la última fecha completada
+            return heatmap
+        user_heatmaps = dict(cache.get(user_id) or {})
+        user_heatmaps[year] = heatmap
+        cache.set(user_id, user_heatmaps)
+        return heatmap
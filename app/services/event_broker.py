@@ -0,0 +1,172 @@
+import json
+import queue
+import threading
+import time
+from flask import current_app
+from app import db
+from app.services.outbox_service import OutboxService
+from app.services.completed_date_service import CompletedDateService
+from app.utils.pg_listen import listen
+
+
+class EventBroker():
+    """
+    Distribuidor en memoria de la actividad en vivo de los usuarios para los streams de eventos (SSE).
+
+    Cada proceso tiene un único hilo distribuidor que lee los eventos nuevos de la bandeja de salida
+    (`outbox_events`) y los reparte en las colas de los clientes suscritos a cada usuario, de modo que
+    la base de datos recibe una consulta por proceso y no una por conexión abierta. En PostgreSQL el
+    hilo espera las notificaciones del canal `OutboxService.CHANNEL` (LISTEN/NOTIFY); con otros motores
+    consulta la tabla cada `SSE_POLL_INTERVAL` segundos.
+    """
+
+    # Eventos leídos por consulta
+    BATCH_SIZE = 500
+
+    _subscribers = {}  # {user_id: set(queue.Queue)}
+    _connections = 0
+    _dispatcher = None
+    _lock = threading.Lock()
+
+    @staticmethod
+    def subscribe(user_id):
+        """
+        Registra un cliente interesado en la actividad de un usuario y arranca el hilo distribuidor si
+        todavía no está en ejecución en este proceso.
+
+        Args:
+            user_id (int): El ID del usuario.
+
+        Returns:
+            queue.Queue | None: La cola en la que se recibirán los eventos, o None si el proceso ya
+                                atiende `SSE_MAX_CONNECTIONS` streams.
+        """
+        app = current_app._get_current_object()
+        with EventBroker._lock:
+            if EventBroker._connections >= app.config['SSE_MAX_CONNECTIONS']:
+                return None
+            if EventBroker._dispatcher is None or not EventBroker._dispatcher.is_alive():
+                EventBroker._dispatcher = threading.Thread(target=EventBroker._run, args=(app,), daemon=True)
+                EventBroker._dispatcher.start()
+            subscriber = queue.Queue(maxsize=app.config['SSE_QUEUE_SIZE'])
+            EventBroker._subscribers.setdefault(user_id, set()).add(subscriber)
+            EventBroker._connections += 1
+            return subscriber
+
+    @staticmethod
+    def unsubscribe(user_id, subscriber):
+        """
+        Da de baja la cola de un cliente.
+
+        Args:
+            user_id (int): El ID del usuario.
+            subscriber (queue.Queue): La cola retornada por `subscribe`.
+        """
+        with EventBroker._lock:
+            subscribers = EventBroker._subscribers.get(user_id)
+            if subscribers is None or subscriber not in subscribers:
+                return
+            subscribers.discard(subscriber)
+            if not subscribers:
+                del EventBroker._subscribers[user_id]
+            EventBroker._connections -= 1
+
+    @staticmethod
+    def stream(user_id, subscriber, heartbeat_interval):
+        """
+        Genera el cuerpo de una respuesta `text/event-stream` a partir de la cola de un cliente.
+
+        Cuando no hay eventos se envía un comentario cada `heartbeat_interval` segundos para mantener la
+        conexión abierta a través de los proxies. La cola se da de baja al cerrarse la conexión.
+
+        Args:
+            user_id (int): El ID del usuario.
+            subscriber (queue.Queue): La cola retornada por `subscribe`.
+            heartbeat_interval (int): Segundos entre comentarios de mantenimiento.
+
+        Yields:
+            str: Bloques de texto en el formato de server-sent events.
+        """
+        try:
+            yield 'retry: 3000\n\n'
+            while True:
+                try:
+                    message = subscriber.get(timeout=heartbeat_interval)
+                except queue.Empty:
+                    yield ': keep-alive\n\n'
+                    continue
+                if message is None:
+                    # El cliente no consumía sus eventos a tiempo; al reconectarse recibirá los nuevos
+                    return
+                event_id, event, data = message
+                yield f'id: {event_id}\nevent: {event}\ndata: {json.dumps(data)}\n\n'
+        finally:
+            EventBroker.unsubscribe(user_id, subscriber)
+
+    @staticmethod
+    def _publish(user_id, message):
+        with EventBroker._lock:
+            subscribers = list(EventBroker._subscribers.get(user_id, ()))
+        for subscriber in subscribers:
+            try:
+                subscriber.put_nowait(message)
+            except queue.Full:
+                # Se descarta al cliente lento en lugar de acumular eventos sin límite en memoria
+                EventBroker.unsubscribe(user_id, subscriber)
+                with subscriber.mutex:
+                    subscriber.queue.clear()
+                subscriber.put_nowait(None)
+
+    @staticmethod
+    def _dispatch(cursor):
+        """Reparte los eventos posteriores al cursor del feed de cambios y retorna el nuevo cursor."""
+        while True:
+            # Mismo cursor que el feed: los eventos de transacciones confirmadas tarde no se pierden
+            changes = OutboxService.get_changes(cursor, EventBroker.BATCH_SIZE)
+            cursor = changes['next_cursor']
+            for event in changes['items']:
+                user_id = event.entity_id if event.entity == 'user' else event.payload.get('fk_user_id')
+                if user_id not in EventBroker._subscribers:
+                    continue
+                EventBroker._publish(user_id, (event.event_id, f'{event.entity}.{event.operation}', event.payload))
+                if event.entity == 'completed_date':
+                    assignment_id = event.payload['fk_assignment_id']
+                    EventBroker._publish(user_id, (event.event_id, 'streak.updated', {
+                        'assignment_id': assignment_id,
+                        'current_streak': CompletedDateService.get_current_streak(assignment_id)
+                    }))
+            if not changes['has_more']:
+                return cursor
+
+    @staticmethod
+    def _listener():
+        """
+        Retorna una función que bloquea hasta que llegue una notificación o pase el tiempo indicado, y
+        otra que libera sus recursos. En PostgreSQL usa una conexión dedicada con LISTEN; con otros
+        motores solo espera.
+        """
+        if db.engine.dialect.name != 'postgresql':
+            return time.sleep, lambda: None
+        return listen(db.engine, OutboxService.CHANNEL)
+
+    @staticmethod
+    def _run(app):
+        poll_interval = app.config['SSE_POLL_INTERVAL']
+        with app.app_context():
+            cursor = OutboxService.start_cursor()
+            wait = close = None
+            while True:
+                try:
+                    if wait is None:
+                        wait, close = EventBroker._listener()
+                    wait(poll_interval)
+                    cursor = EventBroker._dispatch(cursor)
+                except Exception:
+                    app.logger.exception('Live event dispatcher failed; retrying')
+                    if close is not None:
+                        close()
+                    wait = close = None
+                    time.sleep(poll_interval)
+                finally:
+                    # Libera la conexión de la sesión entre una ronda y la siguiente
+                    db.session.remove()
@@ -0,0 +1,185 @@
+import gzip
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from datetime import date, datetime
+from flask import current_app
+from app import db
+from app.models.user_model import User
+from app.models.habit_model import Habit
+from app.models.assignment_model import Assignment
+from app.models.completed_date_model import CompletedDate
+from app.utils.exceptions import InvalidDataError
+
+# pyarrow es opcional: si está instalado se exporta a Parquet; si no, al formato columnar en JSON comprimido
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+
+class ExportService:
+    """
+    Servicio para exportar una copia completa de los datos en un formato columnar y comprimido, pensado
+    para el análisis fuera de línea sin pasar por los endpoints de la API.
+
+    Cada tabla se lee con un cursor en el servidor, por bloques de `EXPORT_ROW_GROUP_SIZE` filas, y cada
+    bloque se escribe como un grupo de filas (row group) con sus valores agrupados por columna. Todas las
+    tablas se leen del mismo snapshot, así los archivos son consistentes entre sí: en PostgreSQL se exportan
+    en paralelo, una por hilo y con su propia conexión, que adopta el snapshot exportado por una conexión
+    coordinadora (`pg_export_snapshot()`); con otros motores se leen en orden en una sola transacción.
+
+    Los archivos se escriben siempre dentro de `EXPORT_ROOT`.
+
+    Formatos:
+        - parquet: archivo Parquet comprimido con zstd (requiere el paquete opcional `pyarrow`).
+        - json: archivo gzip con una línea JSON por grupo de filas, `{"columns": {"columna": [valores]}}`.
+    """
+
+    # Tablas exportables y columnas que se excluyen de cada una
+    TABLES = {
+        'users': (User, ('user_password',)),
+        'habits': (Habit, ()),
+        'assignments': (Assignment, ()),
+        'completed_dates': (CompletedDate, ())
+    }
+
+    EXTENSIONS = {'parquet': '.parquet', 'json': '.columns.json.gz'}
+
+    @staticmethod
+    def default_format():
+        """Retorna el formato por defecto: parquet si `pyarrow` está instalado, o json en caso contrario."""
+        return 'parquet' if pyarrow is not None else 'json'
+
+    @staticmethod
+    def export_snapshot(output_dir, tables=None, export_format=None, row_group_size=None):
+        """
+        Exporta las tablas indicadas a archivos `<tabla><extensión>` dentro de un directorio.
+
+        Args:
+            output_dir (str): Directorio de destino, relativo a `EXPORT_ROOT` (o absoluto dentro de él); se
+                              crea si no existe.
+            tables (list, opcional): Tablas a exportar. Por defecto todas las de `TABLES`.
+            export_format (str, opcional): 'parquet' o 'json'. Por defecto se usa `default_format()`.
+            row_group_size (int, opcional): Filas por grupo. Por defecto `EXPORT_ROW_GROUP_SIZE`.
+
+        Returns:
+            dict: Cantidad de filas exportadas por tabla.
+
+        Raises:
+            InvalidDataError: Si una tabla, el formato o el directorio no son válidos, o si se pide parquet
+                              sin `pyarrow` instalado.
+        """
+        tables = tables or list(ExportService.TABLES)
+        export_format = export_format or ExportService.default_format()
+        row_group_size = row_group_size or current_app.config['EXPORT_ROW_GROUP_SIZE']
+
+        unknown = [table for table in tables if table not in ExportService.TABLES]
+        if unknown:
+            raise InvalidDataError(f'Unknown tables: {", ".join(unknown)}')
+        if export_format not in ExportService.EXTENSIONS:
+            raise InvalidDataError(f'Unknown export format: {export_format}')
+        if export_format == 'parquet' and pyarrow is None:
+            raise InvalidDataError('The parquet format requires the pyarrow package')
+
+        output_dir = ExportService.resolve_output_dir(output_dir)
+        os.makedirs(output_dir, exist_ok=True)
+
+        def export_table(connection, table):
+            path = os.path.join(output_dir, table + ExportService.EXTENSIONS[export_format])
+            return table, ExportService._export_table(connection, table, path, export_format, row_group_size)
+
+        engine = db.engine
+        if engine.dialect.name != 'postgresql':
+            with engine.connect() as connection, connection.begin():
+                return dict(export_table(connection, table) for table in tables)
+
+        def export_in_snapshot(table, snapshot_id):
+            with engine.connect() as connection:
+                connection = connection.execution_options(isolation_level='REPEATABLE READ')
+                with connection.begin():
+                    # Debe ser la primera sentencia de la transacción
+                    connection.execute(db.text('SET TRANSACTION SNAPSHOT :snapshot_id'), {'snapshot_id': snapshot_id})
+                    return export_table(connection, table)
+
+        with ExitStack() as stack:
+            # La conexión coordinadora mantiene abierto el snapshot hasta que terminen todos los hilos
+            coordinator = stack.enter_context(engine.connect()).execution_options(isolation_level='REPEATABLE READ')
+            stack.enter_context(coordinator.begin())
+            snapshot_id = coordinator.scalar(db.select(db.func.pg_export_snapshot()))
+            with ThreadPoolExecutor(max_workers=len(tables)) as executor:
+                return dict(executor.map(export_in_snapshot, tables, [snapshot_id] * len(tables)))
+
+    @staticmethod
+    def resolve_output_dir(output_dir):
+        """
+        Convierte el directorio de destino de una exportación en una ruta dentro de `EXPORT_ROOT`.
+
+        Args:
+            output_dir (str): Directorio relativo a `EXPORT_ROOT`, o absoluto dentro de él.
+
+        Returns:
+            str: La ruta absoluta del directorio.
+
+        Raises:
+            InvalidDataError: Si el directorio queda fuera de `EXPORT_ROOT`.
+        """
+        root = os.path.realpath(current_app.config['EXPORT_ROOT'])
+        path = os.path.realpath(os.path.join(root, output_dir))
+        if os.path.commonpath([root, path]) != root:
+            raise InvalidDataError(f'output_dir must be inside the export root ({root}).')
+        return path
+
+    @staticmethod
+    def _export_table(connection, table, path, export_format, row_group_size):
+        model, excluded = ExportService.TABLES[table]
+        columns = [column for column in model.__table__.columns if column.name not in excluded]
+        result = connection.execute(
+            db.select(*columns).order_by(*model.__table__.primary_key.columns)
+            .execution_options(yield_per=row_group_size))
+
+        # Se escribe en un archivo temporal para no dejar una exportación incompleta con el nombre final
+        tmp_path = path + '.tmp'
+        if export_format == 'parquet':
+            rows = ExportService._write_parquet(result, columns, tmp_path)
+        else:
+            rows = ExportService._write_json(result, columns, tmp_path)
+        os.replace(tmp_path, path)
+        return rows
+
+    @staticmethod
+    def _arrow_type(column):
+        python_type = column.type.python_type
+        if python_type is datetime:
+            return pyarrow.timestamp('us')
+        if python_type is date:
+            return pyarrow.date32()
+        return {int: pyarrow.int64(), bool: pyarrow.bool_(), float: pyarrow.float64()}.get(python_type, pyarrow.string())
+
+    @staticmethod
+    def _write_parquet(result, columns, path):
+        schema = pyarrow.schema([pyarrow.field(column.name, ExportService._arrow_type(column), nullable=column.nullable)
+                                 for column in columns])
+        rows = 0
+        with pyarrow.parquet.ParquetWriter(path, schema, compression='zstd') as writer:
+            for partition in result.partitions():
+                values = list(zip(*partition))
+                writer.write_table(pyarrow.Table.from_arrays(
+                    [pyarrow.array(column_values, type=field.type) for column_values, field in zip(values, schema)],
+                    schema=schema))
+                rows += len(partition)
+        return rows
+
+    @staticmethod
+    def _write_json(result, columns, path):
+        names = [column.name for column in columns]
+        rows = 0
+        with gzip.open(path, 'wt', encoding='utf-8') as file:
+            for partition in result.partitions():
+                values = zip(*partition)
+                file.write(json.dumps({'columns': dict(zip(names, values))}, default=lambda value: value.isoformat()))
+                file.write('\n')
+                rows += len(partition)
+        return rows
@@ -0,0 +1,86 @@
+import difflib
+import threading
+import time
+from flask import current_app
+from app import db
+from app.models.habit_model import Habit
+from app.utils.trie import Trie
+
+
+class HabitSearchIndex():
+    """
+    Índice en memoria de los nombres de los hábitos activos, usado para la búsqueda cuando la base
+    de datos no es PostgreSQL (sin pg_trgm).
+
+    Los nombres se guardan en un árbol de prefijos para resolver las coincidencias por prefijo sin
+    recorrer el catálogo; las coincidencias por subcadena y las aproximadas recorren la lista en memoria.
+    El índice se construye en la primera búsqueda, se descarta cuando el proceso modifica un hábito y
+    se reconstruye como máximo cada `HABIT_SEARCH_INDEX_TTL` segundos para incorporar cambios hechos
+    por otros procesos.
+    """
+
+    _trie = None
+    _entries = []
+    _built_at = 0.0
+    _lock = threading.Lock()
+
+    # Similitud mínima para considerar una coincidencia aproximada (equivalente al umbral de pg_trgm)
+    FUZZY_CUTOFF = 0.6
+
+    @staticmethod
+    def invalidate():
+        """Descarta el índice para que se reconstruya en la próxima búsqueda."""
+        with HabitSearchIndex._lock:
+            HabitSearchIndex._trie = None
+
+    @staticmethod
+    def _ensure_built():
+        ttl = current_app.config['HABIT_SEARCH_INDEX_TTL']
+        with HabitSearchIndex._lock:
+            if HabitSearchIndex._trie is not None and time.monotonic() - HabitSearchIndex._built_at < ttl:
+                return HabitSearchIndex._trie, HabitSearchIndex._entries
+            rows = db.session.execute(db.select(Habit.habit_id, Habit.habit_name).where(Habit.habit_status)).all()
+            trie = Trie()
+            entries = []
+            for habit_id, habit_name in rows:
+                key = habit_name.lower()
+                trie.insert(key, habit_id)
+                entries.append((key, habit_id))
+            HabitSearchIndex._trie, HabitSearchIndex._entries = trie, entries
+            HabitSearchIndex._built_at = time.monotonic()
+            return trie, entries
+
+    @staticmethod
+    def search(term):
+        """
+        Busca los hábitos cuyo nombre coincide con el término, ordenados por relevancia: primero las
+        coincidencias por prefijo, luego por subcadena y por último las aproximadas.
+
+        Args:
+            term (str): El término de búsqueda, en minúsculas.
+
+        Returns:
+            list: IDs de los hábitos encontrados, ordenados por relevancia.
+        """
+        trie, entries = HabitSearchIndex._ensure_built()
+        ranked = [habit_id for _, habit_id in trie.starts_with(term)]
+        seen = set(ranked)
+        if len(term) < 3:
+            return ranked
+
+        substring = sorted((key.find(term), key, habit_id) for key, habit_id in entries
+                           if habit_id not in seen and term in key)
+        for _, _, habit_id in substring:
+            ranked.append(habit_id)
+            seen.add(habit_id)
+
+        fuzzy = []
+        matcher = difflib.SequenceMatcher(b=term)
+        for key, habit_id in entries:
+            if habit_id in seen:
+                continue
+            matcher.set_seq1(key)
+            if matcher.real_quick_ratio() >= HabitSearchIndex.FUZZY_CUTOFF and matcher.ratio() >= HabitSearchIndex.FUZZY_CUTOFF:
+                fuzzy.append((-matcher.ratio(), key, habit_id))
+        ranked.extend(habit_id for _, _, habit_id in sorted(fuzzy))
+        return ranked
@@ -1,6 +1,14 @@
 from app import db
 from app.models.habit_model import Habit
+from app.models.habit_stats_model import HabitStats
 from app.utils.validations import Validations
+from app.utils.sparse_fields import SparseFields
+from app.utils.batch_lookup import BatchLookup
+from app.utils.read_query import ReadQuery
+from app.services.habit_search_index import HabitSearchIndex
+from app.services.sync_service import SyncService
+from app.services.outbox_service import OutboxService
+from app.utils.exceptions import InvalidDataError
 
 class HabitService:
     """
@@ -31,6 +39,7 @@ class HabitService:
         # Agregar el nuevo hábito a la base de datos y confirmar la transacción
         db.session.add(new_habit)
         db.session.commit()
+        HabitSearchIndex.invalidate()
         # Retornar el hábito creado
         return new_habit
 
@@ -57,8 +66,10 @@ class HabitService:
         # Actualizar el nombre y el momento del día del hábito
         habit.habit_name = habit_name
         habit.time_of_day = time_of_day
-        # Guardar los cambios en la base de datos
+        # Guardar los cambios en la base de datos, junto con su evento
+        OutboxService.record('habit', 'updated', OutboxService.habit_payload(habit))
         db.session.commit()
+        HabitSearchIndex.invalidate()
         return habit
 
     @staticmethod
@@ -73,28 +84,61 @@ class HabitService:
             ValueError: Si el hábito no se encuentra.
         """
         # Obtener el hábito por su ID
-        habit = HabitService.get_habit_by_id(habit_id)
-        # Eliminar el hábito de la base de datos y confirmar la transacción
+        habit = HabitService.get_habit_by_id(habit_id, include_inactive=True)
+        # Eliminar el hábito de la base de datos y confirmar la transacción, junto con su lápida y su evento
+        payload = OutboxService.habit_payload(habit)
         db.session.delete(habit)
+        SyncService.record_tombstone('habit', habit_id)
+        OutboxService.record('habit', 'deleted', payload)
         db.session.commit()
+        HabitSearchIndex.invalidate()
+        Validations.invalidate_fk_existence('habits', [habit_id])
+
+    # Columnas de `habit_stats` que se agregan a los hábitos con `include_stats`
+    STATS_COLUMNS = (HabitStats.active_users, HabitStats.active_assignments, HabitStats.completion_rate,
+                     HabitStats.computed_at.label('stats_computed_at'))
+
+    @staticmethod
+    def _query(fields, include_stats):
+        # Consulta base de los hábitos; con estadísticas se leen de la tabla precalculada con un LEFT JOIN
+        # por clave primaria (las columnas quedan nulas para los hábitos creados después del último cálculo)
+        if not include_stats:
+            return SparseFields.query(Habit, fields)
+        columns = Habit.__table__.columns
+        return ReadQuery(statement=(
+            db.select(*(columns[field] for field in fields) if fields else columns, *HabitService.STATS_COLUMNS)
+            .outerjoin(HabitStats, HabitStats.habit_id == Habit.habit_id)
+        ))
 
     @staticmethod
-    def get_all_habits():
+    def get_all_habits(include_inactive=False, fields=None, include_stats=False):
         """
         Obtiene todos los hábitos almacenados en la base de datos.
 
+        Args:
+            include_inactive (bool): Si es True también se incluyen los hábitos desactivados.
+            fields (list, opcional): Columnas a seleccionar; si se indican se retornan filas con solo esas columnas.
+            include_stats (bool): Si es True se agregan `active_users`, `active_assignments`, `completion_rate`
+                                  y `stats_computed_at` de las estadísticas precalculadas.
+
         Returns:
             List[Habit]: Una lista con todos los hábitos registrados.
         """
-        return Habit.query.all()
+        query = HabitService._query(fields, include_stats)
+        if not include_inactive:
+            # Por defecto solo se leen los hábitos activos (índice parcial ix_habits_active_habit_name)
+            query = query.filter(Habit.habit_status)
+        return query.all()
     
     @staticmethod
-    def get_habit_by_id(habit_id):
+    def get_habit_by_id(habit_id, include_inactive=False, fields=None):
         """
         Obtiene un hábito por su ID.
 
         Args:
             habit_id (int): El ID del hábito a buscar.
+            include_inactive (bool): Si es True también se retorna el hábito aunque esté desactivado.
+            fields (list, opcional): Columnas a seleccionar; si se indican se retornan filas con solo esas columnas.
 
         Returns:
             Habit: El hábito que coincide con el ID proporcionado.
@@ -103,7 +147,144 @@ class HabitService:
             ValueError: Si el hábito no se encuentra.
         """
         # Buscar el hábito por su ID
-        habit = Habit.query.filter_by(habit_id=habit_id).first()
+        query = SparseFields.query(Habit, fields).filter(Habit.habit_id == habit_id)
+        if not include_inactive:
+            query = query.filter(Habit.habit_status)
+        habit = query.first()
         # Validar que el hábito exista
         habit_validated = Validations.check_if_exists(habit, 'Habit')
         return habit_validated
+
+    @staticmethod
+    def set_habit_status(habit_id, status):
+        """
+        Activa o desactiva un hábito sin eliminarlo.
+
+        Args:
+            habit_id (int): El ID del hábito.
+            status (bool): True para reactivar el hábito, False para desactivarlo.
+
+        Returns:
+            Habit: El hábito actualizado.
+
+        Raises:
+            ValueError: Si el hábito no se encuentra.
+        """
+        habit = HabitService.get_habit_by_id(habit_id, include_inactive=True)
+        if habit.habit_status != status:
+            habit.habit_status = status
+            OutboxService.record('habit', 'updated', OutboxService.habit_payload(habit))
+        db.session.commit()
+        HabitSearchIndex.invalidate()
+        if not status:
+            Validations.invalidate_fk_existence('habits', [habit_id])
+        return habit
+
+    @staticmethod
+    def set_habits_status_by_filter(status, habit_ids=None, habit_name=None, time_of_day=None):
+        """
+        Activa o desactiva en una sola sentencia UPDATE todos los hábitos que cumplan los filtros.
+
+        Args:
+            status (bool): El nuevo estado de los hábitos.
+            habit_ids (list, opcional): IDs de los hábitos.
+            habit_name (str, opcional): Nombre exacto de los hábitos.
+            time_of_day (str, opcional): Momento del día de los hábitos ("mañana", "tarde" o "noche").
+
+        Returns:
+            int: Cantidad de hábitos modificados.
+
+        Raises:
+            ValueError: Si no se indica ningún filtro o si el momento del día es inválido.
+        """
+        conditions = []
+        if habit_ids:
+            conditions.append(Habit.habit_id.in_(habit_ids))
+        if habit_name:
+            conditions.append(Habit.habit_name == habit_name)
+        if time_of_day:
+            Validations.Check_data_time_of_day(time_of_day)
+            conditions.append(Habit.time_of_day == time_of_day)
+        if not conditions:
+            raise InvalidDataError('At least one filter (habit_ids, habit_name, time_of_day) is required.')
+        # Solo se modifican las filas cuyo estado realmente cambia
+        conditions.append(Habit.habit_status.is_(not status))
+        updated = db.session.execute(
+            db.update(Habit).where(*conditions).values(habit_status=status)
+            .returning(Habit.habit_id, Habit.habit_name, Habit.time_of_day, Habit.habit_status)
+            .execution_options(synchronize_session=False)).all()
+        OutboxService.record_many('habit', 'updated', [OutboxService.habit_payload(row) for row in updated])
+        db.session.commit()
+        HabitSearchIndex.invalidate()
+        if not status:
+            Validations.invalidate_fk_existence('habits', [row.habit_id for row in updated])
+        return len(updated)
+
+    @staticmethod
+    def get_habits_by_ids(habit_ids, include_inactive=False, fields=None, include_stats=False):
+        """
+        Obtiene varios hábitos por sus IDs en una sola consulta.
+
+        Args:
+            habit_ids (list): IDs de hábitos en el orden en que deben retornarse.
+            include_inactive (bool): Si es True también se incluyen hábitos desactivados.
+            fields (list, opcional): Columnas a seleccionar; si se indican se retornan filas con solo esas columnas.
+            include_stats (bool): Si es True se agregan las estadísticas precalculadas (ver `get_all_habits`).
+
+        Returns:
+            tuple: (List[Habit] en el orden pedido, lista de IDs que no se encontraron).
+        """
+        # El ID siempre se selecciona para poder ordenar el resultado según la petición
+        columns = fields if not fields or 'habit_id' in fields else fields + ['habit_id']
+        query = HabitService._query(columns, include_stats).filter(BatchLookup.id_condition(Habit.habit_id, habit_ids))
+        if not include_inactive:
+            query = query.filter(Habit.habit_status)
+        return BatchLookup.order_results(query.all(), habit_ids, 'habit_id')
+
+    @staticmethod
+    def search_habits(query_text, page=1, per_page=20):
+        """
+        Busca hábitos activos por nombre, con coincidencias por prefijo, por subcadena y aproximadas.
+
+        Los resultados se ordenan por relevancia: primero los nombres que empiezan por el término, luego
+        los más parecidos. En PostgreSQL la búsqueda usa los índices ix_habits_habit_name_prefix
+        (prefijo) e ix_habits_habit_name_trgm (subcadena y similitud con pg_trgm); en otros motores se
+        usa un índice en memoria. Con términos de menos de 3 caracteres solo se busca por prefijo.
+
+        Args:
+            query_text (str): El término a buscar.
+            page (int): Número de página, empezando en 1.
+            per_page (int): Cantidad de resultados por página.
+
+        Returns:
+            tuple: (filas de los hábitos de la página pedida, total de resultados).
+
+        Raises:
+            ValueError: Si el término de búsqueda está vacío.
+        """
+        term = (query_text or '').strip().lower()
+        if not term:
+            raise InvalidDataError('The search term (q) is required.')
+        offset = (page - 1) * per_page
+
+        if db.engine.dialect.name != 'postgresql':
+            habit_ids = HabitSearchIndex.search(term)
+            habits, _ = HabitService.get_habits_by_ids(habit_ids[offset:offset + per_page],
+                                                       fields=[column.name for column in Habit.__table__.columns])
+            return habits, len(habit_ids)
+
+        name = db.func.lower(Habit.habit_name)
+        # Se escapan los comodines de LIKE para que el término se busque de forma literal
+        escaped = term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+        is_prefix = name.like(escaped + '%', escape='\\')
+        conditions = [is_prefix]
+        score = db.literal(0.0)
+        if len(term) >= 3:
+            # El índice de trigramas solo ayuda con términos de al menos 3 caracteres
+            conditions.append(name.like('%' + escaped + '%', escape='\\'))
+            conditions.append(name.bool_op('%')(term))
+            score = db.func.similarity(name, term)
+
+        matches = ReadQuery(Habit).filter(Habit.habit_status, db.or_(*conditions))
+        habits = matches.order_by(is_prefix.desc(), score.desc(), Habit.habit_name).limit(per_page).offset(offset).all()
+        return habits, matches.count()
@@ -0,0 +1,287 @@
+import inspect
+import os
+import socket
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from datetime import datetime, timedelta
+from flask import current_app
+from app import db
+from app.models.job_model import Job
+from app.utils.pg_listen import listen
+from app.utils.read_query import ReadQuery
+from app.utils.validations import Validations
+from app.utils.exceptions import InvalidDataError
+
+
+class JobService:
+    """
+    Servicio de trabajos en segundo plano.
+
+    Las peticiones solo registran el trabajo en la tabla `jobs` (`enqueue`) y responden de inmediato; los
+    procesos de `flask jobs worker` lo toman y ejecutan la función del servicio correspondiente, fuera
+    del ciclo de las peticiones. Cada worker ejecuta como mucho `JOB_WORKER_CONCURRENCY` trabajos a la
+    vez, así la concurrencia total queda acotada por la cantidad de workers que se inicien.
+
+    Un trabajo que falla se reintenta con espera exponencial hasta `max_attempts` intentos, salvo que el
+    error sea de validación (`ValueError`), que no cambiaría al reintentar. Si un worker deja de enviar
+    señales de vida por más de `JOB_LOCK_TIMEOUT` segundos, otro worker devuelve su trabajo a la cola.
+    """
+
+    CHANNEL = 'jobs'
+
+    @staticmethod
+    def handlers():
+        """
+        Funciones de los servicios que pueden ejecutarse como trabajos, por tipo de trabajo. Las que
+        aceptan `progress_callback` reportan su progreso en el trabajo.
+
+        Returns:
+            dict: Función por tipo de trabajo.
+        """
+        # Importaciones locales: los servicios encolan trabajos, así se evitan las importaciones circulares
+        from app.services.user_service import UserService
+        from app.services.analytics_service import AnalyticsService
+        from app.services.recommendation_service import RecommendationService
+        from app.services.export_service import ExportService
+        return {
+            'delete_user': UserService.delete_user,
+            'refresh_cohort_retention': AnalyticsService.refresh_cohort_retention,
+            'refresh_habit_stats': AnalyticsService.refresh_habit_stats,
+            'refresh_recommendations': RecommendationService.refresh_cooccurrences,
+            'export_snapshot': ExportService.export_snapshot
+        }
+
+    @staticmethod
+    def enqueue(job_type, params=None, max_attempts=None):
+        """
+        Registra un trabajo para que lo ejecute un worker.
+
+        Args:
+            job_type (str): Tipo de trabajo (ver `handlers`).
+            params (dict, opcional): Argumentos con nombre de la función; deben poder guardarse como JSON.
+            max_attempts (int, opcional): Intentos permitidos. Por defecto `JOB_MAX_ATTEMPTS`.
+
+        Returns:
+            Job: El trabajo creado.
+
+        Raises:
+            ValueError: Si el tipo de trabajo, sus argumentos o la cantidad de intentos no son válidos.
+        """
+        handler = JobService.handlers().get(job_type)
+        if handler is None:
+            raise InvalidDataError(f"job_type must be one of {', '.join(JobService.handlers())}.")
+        params = params or {}
+        if not isinstance(params, dict) or 'progress_callback' in params:
+            raise InvalidDataError('params must be an object with the arguments of the job.')
+        try:
+            inspect.signature(handler).bind(**params)
+        except TypeError as e:
+            raise InvalidDataError(f'Invalid params for {job_type}: {e}.')
+        if max_attempts is not None and (not isinstance(max_attempts, int) or not 1 <= max_attempts <= 10):
+            raise InvalidDataError('max_attempts must be an integer between 1 and 10.')
+
+        job = Job(uuid.uuid4().hex, job_type, params, max_attempts or current_app.config['JOB_MAX_ATTEMPTS'])
+        db.session.add(job)
+        if db.session.get_bind().dialect.name == 'postgresql':
+            # Despierta a los workers en espera al confirmar la transacción
+            db.session.execute(db.select(db.func.pg_notify(JobService.CHANNEL, '')))
+        db.session.commit()
+        return job
+
+    @staticmethod
+    def get_job(job_id, job_type=None):
+        """
+        Obtiene el estado de un trabajo.
+
+        Args:
+            job_id (str): El ID del trabajo.
+            job_type (str, opcional): Si se indica, el trabajo debe ser de ese tipo.
+
+        Returns:
+            ReadRow: El trabajo, con su estado, progreso y resultado.
+
+        Raises:
+            ValueError: Si el trabajo no existe (o no es del tipo indicado).
+        """
+        query = ReadQuery(Job).filter(Job.job_id == job_id)
+        if job_type is not None:
+            query = query.filter(Job.job_type == job_type)
+        return Validations.check_if_exists(query.first(), 'Job')
+
+    @staticmethod
+    def prune(older_than_days):
+        """
+        Elimina los trabajos terminados o fallidos más antiguos que la cantidad de días indicada.
+
+        Args:
+            older_than_days (int): Antigüedad mínima, en días, de los trabajos a eliminar.
+
+        Returns:
+            int: Cantidad de trabajos eliminados.
+        """
+        cutoff = datetime.now() - timedelta(days=older_than_days)
+        result = db.session.execute(
+            db.delete(Job).where(Job.status.in_(('finished', 'failed')), Job.finished_date < cutoff)
+            .execution_options(synchronize_session=False))
+        db.session.commit()
+        return result.rowcount
+
+    @staticmethod
+    def claim(worker_id):
+        """
+        Toma el siguiente trabajo pendiente cuyo momento de ejecución ya llegó.
+
+        Args:
+            worker_id (str): Identificador del worker.
+
+        Returns:
+            Row | None: `job_id`, `job_type`, `params`, `attempts` y `max_attempts` del trabajo tomado, o
+                        None si no hay trabajos pendientes.
+        """
+        now = datetime.now()
+        # SKIP LOCKED (solo PostgreSQL) hace que los workers concurrentes tomen trabajos distintos sin
+        # esperarse; la condición sobre el estado en el UPDATE evita tomar dos veces el mismo trabajo
+        next_job = (
+            db.select(Job.job_id)
+            .where(Job.status == 'pending', Job.run_after <= now)
+            .order_by(Job.run_after)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        job = db.session.execute(
+            db.update(Job)
+            .where(Job.job_id == next_job, Job.status == 'pending')
+            .values(status='running', locked_by=worker_id, heartbeat_at=now, started_date=now,
+                    attempts=Job.attempts + 1, error=None)
+            .returning(Job.job_id, Job.job_type, Job.params, Job.attempts, Job.max_attempts)
+            .execution_options(synchronize_session=False)
+        ).first()
+        db.session.commit()
+        return job
+
+    @staticmethod
+    def _update(job_id, worker_id, **values):
+        # Actualiza un trabajo en ejecución de este worker. Usa su propia conexión para no mezclarse con la
+        # transacción de la función que ejecuta el trabajo; si otro worker lo retomó, no lo modifica
+        with db.engine.begin() as connection:
+            connection.execute(
+                db.update(Job)
+                .where(Job.job_id == job_id, Job.locked_by == worker_id, Job.status == 'running')
+                .values(**values))
+
+    @staticmethod
+    def heartbeat(worker_id):
+        """Renueva la señal de vida de los trabajos en ejecución de un worker."""
+        with db.engine.begin() as connection:
+            connection.execute(
+                db.update(Job)
+                .where(Job.status == 'running', Job.locked_by == worker_id)
+                .values(heartbeat_at=datetime.now()))
+
+    @staticmethod
+    def requeue_stale():
+        """
+        Devuelve a la cola los trabajos cuyo worker dejó de enviar señales de vida por más de
+        `JOB_LOCK_TIMEOUT` segundos (o los marca como fallidos si ya agotaron sus intentos).
+
+        Returns:
+            int: Cantidad de trabajos recuperados.
+        """
+        now = datetime.now()
+        exhausted = Job.attempts >= Job.max_attempts
+        result = db.session.execute(
+            db.update(Job)
+            .where(Job.status == 'running',
+                   Job.heartbeat_at < now - timedelta(seconds=current_app.config['JOB_LOCK_TIMEOUT']))
+            .values(status=db.case((exhausted, 'failed'), else_='pending'),
+                    finished_date=db.case((exhausted, now), else_=None),
+                    locked_by=None, run_after=now, error='Worker stopped responding')
+            .execution_options(synchronize_session=False))
+        db.session.commit()
+        return result.rowcount
+
+    @staticmethod
+    def _execute(app, worker_id, job):
+        """Ejecuta un trabajo tomado y registra su resultado. Se ejecuta en los hilos del worker."""
+        with app.app_context():
+            handler = JobService.handlers()[job.job_type]
+            params = dict(job.params)
+            if 'progress_callback' in inspect.signature(handler).parameters:
+                params['progress_callback'] = lambda progress: JobService._update(
+                    job.job_id, worker_id, progress=dict(progress), heartbeat_at=datetime.now())
+            try:
+                result = handler(**params)
+            except Exception as e:
+                db.session.rollback()
+                now = datetime.now()
+                retry = not isinstance(e, ValueError) and job.attempts < job.max_attempts
+                app.logger.exception('Job %s (%s) failed on attempt %s', job.job_id, job.job_type, job.attempts)
+                delay = timedelta(seconds=app.config['JOB_RETRY_DELAY'] * 2 ** (job.attempts - 1))
+                JobService._update(job.job_id, worker_id, locked_by=None, error=str(e)[:255],
+                                   **({'status': 'pending', 'run_after': now + delay} if retry
+                                      else {'status': 'failed', 'finished_date': now}))
+            else:
+                JobService._update(job.job_id, worker_id, status='finished', result=result, locked_by=None,
+                                   finished_date=datetime.now())
+            finally:
+                db.session.remove()
+
+    @staticmethod
+    def _listener():
+        # En PostgreSQL espera las notificaciones de los trabajos nuevos; con otros motores solo espera
+        if db.engine.dialect.name != 'postgresql':
+            return time.sleep, lambda: None
+        return listen(db.engine, JobService.CHANNEL)
+
+    @staticmethod
+    def work(concurrency=None, burst=False, stop_event=None):
+        """
+        Ejecuta trabajos hasta que se detenga el worker.
+
+        El hilo principal toma los trabajos, envía las señales de vida y recupera los trabajos de workers
+        caídos; los trabajos se ejecutan en un pool de `concurrency` hilos. Al detenerse, espera a que
+        terminen los trabajos en ejecución.
+
+        Args:
+            concurrency (int, opcional): Trabajos simultáneos. Por defecto `JOB_WORKER_CONCURRENCY`.
+            burst (bool): Si es True, termina cuando no quedan trabajos pendientes.
+            stop_event (threading.Event, opcional): Evento que detiene el worker.
+
+        Returns:
+            int: Cantidad de trabajos ejecutados.
+        """
+        app = current_app._get_current_object()
+        config = app.config
+        concurrency = concurrency or config['JOB_WORKER_CONCURRENCY']
+        stop_event = stop_event or threading.Event()
+        worker_id = f'{socket.gethostname()}:{os.getpid()}'
+        executed, last_heartbeat = 0, 0
+        running = set()
+        wait_for_jobs, close = JobService._listener()
+        try:
+            with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='jobs') as executor:
+                while not stop_event.is_set():
+                    if time.monotonic() - last_heartbeat >= config['JOB_HEARTBEAT_INTERVAL']:
+                        JobService.heartbeat(worker_id)
+                        JobService.requeue_stale()
+                        last_heartbeat = time.monotonic()
+                    running = {future for future in running if not future.done()}
+                    job = JobService.claim(worker_id) if len(running) < concurrency else None
+                    if job is not None:
+                        running.add(executor.submit(JobService._execute, app, worker_id, job))
+                        executed += 1
+                        continue
+                    if burst and not running:
+                        break
+                    if len(running) >= concurrency:
+                        wait(running, timeout=config['JOB_POLL_INTERVAL'], return_when=FIRST_COMPLETED)
+                    else:
+                        wait_for_jobs(config['JOB_POLL_INTERVAL'])
+                    # Libera la conexión de la sesión mientras el worker espera
+                    db.session.remove()
+        finally:
+            close()
+        return executed
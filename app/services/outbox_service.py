@@ -0,0 +1,219 @@
+from datetime import datetime, timedelta
+from app import db
+from app.models.outbox_event_model import OutboxEvent
+from app.utils.read_query import ReadQuery
+from app.utils.exceptions import InvalidDataError
+
+
+class OutboxService:
+    """
+    Servicio de la bandeja de salida (outbox) transaccional y del feed de cambios.
+
+    `record` y `record_many` solo agregan los eventos a la transacción en curso: es el servicio que
+    realiza el cambio quien confirma ambos con su `db.session.commit()`. En PostgreSQL también emiten
+    un NOTIFY en el canal `CHANNEL`, que se entrega al confirmar la transacción y despierta a los
+    procesos que distribuyen los eventos en vivo (ver `EventBroker`).
+
+    En PostgreSQL los `event_id` se asignan al insertar pero los eventos se ven al confirmar, así que
+    un evento con un ID menor puede aparecer después de que un consumidor leyó uno mayor. Por eso el feed
+    se lee por ventanas de transacciones terminadas: cada evento guarda el ID de su transacción
+    (`xact_id`) y solo se entregan los de transacciones anteriores a la más antigua todavía en curso
+    (`pg_snapshot_xmin`). Dentro de una ventana los eventos se entregan en orden de `event_id`.
+    """
+
+    CHANNEL = 'outbox_events'
+
+    @staticmethod
+    def _notify():
+        if db.session.get_bind().dialect.name == 'postgresql':
+            # Las notificaciones iguales de una misma transacción se entregan una sola vez
+            db.session.execute(db.select(db.func.pg_notify(OutboxService.CHANNEL, '')))
+
+    @staticmethod
+    def user_payload(user):
+        """Datos de un usuario incluidos en sus eventos (sin la contraseña)."""
+        return {
+            'user_id': user.user_id,
+            'first_name': user.first_name,
+            'last_name': user.last_name,
+            'nickname': user.nickname,
+            'email': user.email,
+            'user_status': user.user_status
+        }
+
+    @staticmethod
+    def habit_payload(habit):
+        """Datos de un hábito incluidos en sus eventos."""
+        return {
+            'habit_id': habit.habit_id,
+            'habit_name': habit.habit_name,
+            'time_of_day': habit.time_of_day,
+            'habit_status': habit.habit_status
+        }
+
+    @staticmethod
+    def assignment_payload(assignment):
+        """Datos de una asignación incluidos en sus eventos."""
+        return {
+            'assignment_id': assignment.assignment_id,
+            'fk_user_id': assignment.fk_user_id,
+            'fk_habit_id': assignment.fk_habit_id,
+            'assignment_status': assignment.assignment_status,
+            'created_date': assignment.created_date.isoformat() if assignment.created_date else None
+        }
+
+    @staticmethod
+    def completed_date_payload(completed_date, fk_user_id):
+        """Datos de una fecha completada, y del usuario dueño de su asignación, incluidos en sus eventos."""
+        day = completed_date.completed_date
+        # Antes de recargarse desde la base de datos la fecha puede ser todavía un datetime
+        if isinstance(day, datetime):
+            day = day.date()
+        return {
+            'completed_date_id': completed_date.completed_date_id,
+            'fk_assignment_id': completed_date.fk_assignment_id,
+            'fk_user_id': fk_user_id,
+            'completed_date': day.isoformat() if day else None
+        }
+
+    @staticmethod
+    def record(entity, operation, payload):
+        """
+        Agrega un evento a la transacción en curso.
+
+        Args:
+            entity (str): Tipo de la entidad ('user', 'habit', 'assignment' o 'completed_date').
+            operation (str): Operación realizada ('created', 'updated' o 'deleted').
+            payload (dict): Datos de la entidad; debe incluir la clave `<entity>_id`.
+        """
+        db.session.add(OutboxEvent(entity, payload[f'{entity}_id'], operation, payload))
+        OutboxService._notify()
+
+    @staticmethod
+    def record_many(entity, operation, payloads):
+        """
+        Agrega varios eventos a la transacción en curso con una sola sentencia INSERT.
+
+        Args:
+            entity (str): Tipo de las entidades.
+            operation (str): Operación realizada.
+            payloads (list): Datos de cada entidad; cada uno debe incluir la clave `<entity>_id`.
+        """
+        if payloads:
+            db.session.execute(db.insert(OutboxEvent), [
+                {'entity': entity, 'entity_id': payload[f'{entity}_id'], 'operation': operation, 'payload': payload}
+                for payload in payloads
+            ])
+            OutboxService._notify()
+
+    @staticmethod
+    def parse_cursor(cursor):
+        """
+        Convierte un cursor del feed en sus componentes.
+
+        El cursor tiene la forma `<desde>-<hasta>-<event_id>`: la ventana de IDs de transacción que se está
+        leyendo (`hasta` es 0 si la ventana todavía no se fijó) y el último evento leído en ella. Un entero
+        solo, como los cursores anteriores a las ventanas y los de otros motores, es el último `event_id`.
+
+        Args:
+            cursor (str | None): El `next_cursor` de la respuesta anterior.
+
+        Returns:
+            tuple: (desde, hasta, event_id).
+
+        Raises:
+            InvalidDataError: Si el cursor no es válido.
+        """
+        if not cursor:
+            return 0, 0, 0
+        try:
+            parts = [int(part) for part in cursor.split('-')]
+        except ValueError:
+            parts = None
+        if parts is None or len(parts) not in (1, 3) or any(not 0 <= part < 2 ** 63 for part in parts):
+            raise InvalidDataError('after must be a cursor returned by a previous request.')
+        return (0, 0, parts[0]) if len(parts) == 1 else tuple(parts)
+
+    @staticmethod
+    def format_cursor(low, high, event_id):
+        """Arma el cursor que recibe `parse_cursor`."""
+        return str(event_id) if low == high == 0 else f'{low}-{high}-{event_id}'
+
+    @staticmethod
+    def _horizon():
+        # ID de la transacción más antigua todavía en curso: todas las anteriores ya terminaron. Se lee con
+        # el mismo enrutamiento que los eventos, así la réplica que los lee también las tiene aplicadas
+        if db.session.get_bind().dialect.name != 'postgresql':
+            return None
+        statement = db.select(db.cast(db.cast(db.func.pg_snapshot_xmin(db.func.pg_current_snapshot()), db.Text), db.BigInteger))
+        return db.session.connection(bind_arguments={'clause': statement}).scalar(statement)
+
+    @staticmethod
+    def start_cursor():
+        """
+        Obtiene el cursor que entrega solo los eventos de las transacciones que todavía no terminaron.
+
+        Returns:
+            str: El cursor.
+        """
+        horizon = OutboxService._horizon()
+        if horizon is None:
+            return OutboxService.format_cursor(0, 0, db.session.scalar(db.select(db.func.max(OutboxEvent.event_id))) or 0)
+        return OutboxService.format_cursor(horizon, 0, 0)
+
+    @staticmethod
+    def get_changes(after=None, limit=100):
+        """
+        Obtiene los eventos posteriores a un cursor, en orden.
+
+        Args:
+            after (str, opcional): El `next_cursor` de la respuesta anterior (None para empezar desde el principio).
+            limit (int): Cantidad máxima de eventos a retornar.
+
+        Returns:
+            dict: `items` (los eventos), `next_cursor` (el valor de `after` para la siguiente petición)
+                  y `has_more` (True si quedan eventos por leer).
+
+        Raises:
+            InvalidDataError: Si el cursor no es válido.
+        """
+        low, high, after_id = OutboxService.parse_cursor(after)
+        if high == 0:
+            # Se fija la ventana: sus transacciones ya terminaron, así que su contenido no cambia entre páginas
+            high = OutboxService._horizon()
+        query = ReadQuery(OutboxEvent).filter(OutboxEvent.event_id > after_id)
+        if high is not None:
+            query = query.filter(OutboxEvent.xact_id >= low, OutboxEvent.xact_id < high)
+        # Se pide un evento de más para saber si quedan eventos sin leer
+        events = query.order_by(OutboxEvent.event_id).limit(limit + 1).all()
+        has_more = len(events) > limit
+        events = events[:limit]
+        last_id = events[-1].event_id if events else after_id
+        if high is None:
+            next_cursor = OutboxService.format_cursor(0, 0, last_id)
+        elif has_more:
+            next_cursor = OutboxService.format_cursor(low, high, last_id)
+        else:
+            # Ventana terminada: la siguiente empieza donde termina esta
+            next_cursor = OutboxService.format_cursor(high, 0, 0)
+        return {
+            'items': events,
+            'next_cursor': next_cursor,
+            'has_more': has_more
+        }
+
+    @staticmethod
+    def prune(older_than_days):
+        """
+        Elimina los eventos más antiguos que la cantidad de días indicada.
+
+        Args:
+            older_than_days (int): Antigüedad mínima, en días, de los eventos a eliminar.
+
+        Returns:
+            int: Cantidad de eventos eliminados.
+        """
+        result = db.session.execute(
+            db.delete(OutboxEvent).where(OutboxEvent.created_at < datetime.now() - timedelta(days=older_than_days)))
+        db.session.commit()
+        return result.rowcount
@@ -0,0 +1,101 @@
+from flask import current_app
+from sqlalchemy.orm import aliased
+from app import db
+from app.models.assignment_model import Assignment
+from app.models.habit_model import Habit
+from app.models.habit_cooccurrence_model import HabitCooccurrence
+from app.services.user_service import UserService
+from app.utils.read_query import ReadQuery
+
+
+class RecommendationService:
+    """
+    Servicio de recomendaciones de hábitos del tipo "los usuarios que registran X también registran Y".
+
+    La matriz de co-ocurrencia (hábitos x hábitos) se calcula dentro de la base de datos con una sola
+    consulta agregada sobre `assignments` y se guarda, recortada a los mejores `RECOMMENDATION_TOP_K`
+    hábitos relacionados por hábito, en la tabla `habit_cooccurrences`. Las peticiones solo leen esa
+    tabla, así que su costo depende de la cantidad de hábitos del usuario y no del tamaño de `assignments`.
+    """
+
+    @staticmethod
+    def refresh_cooccurrences(top_k=None):
+        """
+        Recalcula la matriz de co-ocurrencia de hábitos a partir de las asignaciones activas.
+
+        El cálculo equivale al producto disperso AᵀA de la matriz usuarios x hábitos y se ejecuta como
+        un único INSERT ... SELECT. El borrado y la inserción ocurren en la misma transacción, de modo
+        que las lecturas concurrentes ven la matriz anterior hasta que la nueva está completa.
+
+        Args:
+            top_k (int, opcional): Cantidad de hábitos relacionados a conservar por hábito. Por defecto
+                                   se usa `RECOMMENDATION_TOP_K` de la configuración.
+
+        Returns:
+            int: Cantidad de entradas guardadas en la matriz.
+        """
+        top_k = top_k or current_app.config['RECOMMENDATION_TOP_K']
+        first, second = aliased(Assignment), aliased(Assignment)
+
+        # Pares de hábitos asignados a un mismo usuario y cantidad de usuarios por par
+        pairs = (db.select(first.fk_habit_id.label('habit_id'),
+                           second.fk_habit_id.label('related_habit_id'),
+                           db.func.count().label('score'))
+                 .select_from(first)
+                 .join(second, db.and_(first.fk_user_id == second.fk_user_id, first.fk_habit_id != second.fk_habit_id))
+                 .where(first.assignment_status, second.assignment_status)
+                 .group_by(first.fk_habit_id, second.fk_habit_id)
+                 .subquery())
+
+        # Se conservan solo los mejores top_k hábitos relacionados de cada hábito
+        ranked = db.select(
+            pairs,
+            db.func.row_number().over(
+                partition_by=pairs.c.habit_id,
+                order_by=(pairs.c.score.desc(), pairs.c.related_habit_id)).label('position')
+        ).subquery()
+        top_pairs = (db.select(ranked.c.habit_id, ranked.c.related_habit_id, ranked.c.score)
+                     .where(ranked.c.position <= top_k))
+
+        db.session.execute(db.delete(HabitCooccurrence))
+        result = db.session.execute(
+            db.insert(HabitCooccurrence).from_select(['habit_id', 'related_habit_id', 'score'], top_pairs))
+        db.session.commit()
+        return result.rowcount
+
+    @staticmethod
+    def get_recommendations_by_user_id(user_id, limit=10):
+        """
+        Obtiene los hábitos recomendados para un usuario, excluyendo los que ya tiene asignados.
+
+        El puntaje de cada hábito recomendado es la suma de sus co-ocurrencias con los hábitos activos
+        del usuario.
+
+        Args:
+            user_id (int): El ID del usuario.
+            limit (int): Cantidad máxima de recomendaciones.
+
+        Returns:
+            list: Filas con los datos del hábito recomendado y su puntaje (`score`), de mayor a menor puntaje.
+
+        Raises:
+            ValueError: Si el usuario no existe.
+        """
+        UserService.get_user_by_user_id(user_id)
+
+        user_habit_ids = db.select(Assignment.fk_habit_id).where(Assignment.fk_user_id == user_id)
+        active_user_habit_ids = user_habit_ids.where(Assignment.assignment_status)
+
+        scores = (db.select(HabitCooccurrence.related_habit_id, db.func.sum(HabitCooccurrence.score).label('score'))
+                  .where(HabitCooccurrence.habit_id.in_(active_user_habit_ids),
+                         HabitCooccurrence.related_habit_id.not_in(user_habit_ids))
+                  .group_by(HabitCooccurrence.related_habit_id)
+                  .subquery())
+
+        return ReadQuery(statement=(
+            db.select(Habit.habit_id, Habit.habit_name, Habit.time_of_day, Habit.habit_status, scores.c.score)
+            .join(scores, scores.c.related_habit_id == Habit.habit_id)
+            .where(Habit.habit_status)
+            .order_by(scores.c.score.desc(), Habit.habit_id)
+            .limit(limit)
+        )).all()
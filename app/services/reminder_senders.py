@@ -0,0 +1,55 @@
+import json
+import threading
+from werkzeug.utils import import_string
+
+
+class FileSender():
+    """
+    Emisor de recordatorios que agrega cada recordatorio como una línea JSON a un archivo local.
+
+    Sirve para desarrollo y pruebas; en producción `REMINDER_SENDER` apunta a un emisor que entrega los
+    recordatorios por el canal real (correo, notificaciones push, etc.).
+    """
+
+    # Los hilos del despacho comparten el archivo; el lock evita que se intercalen las líneas
+    _lock = threading.Lock()
+
+    def __init__(self, path):
+        """
+        Args:
+            path (str): Ruta del archivo de salida.
+        """
+        self.path = path
+
+    def send(self, reminders):
+        """
+        Entrega un lote de recordatorios.
+
+        Args:
+            reminders (list): Diccionarios con `dispatch_date`, `time_of_day`, `assignment_id`, `user_id`,
+                              `nickname`, `email`, `habit_id` y `habit_name`.
+
+        Raises:
+            Exception: Si no se pudo entregar el lote; todos sus recordatorios se reintentan.
+        """
+        lines = ''.join(json.dumps(reminder, ensure_ascii=False) + '\n' for reminder in reminders)
+        with FileSender._lock, open(self.path, 'a', encoding='utf-8') as file:
+            file.write(lines)
+
+
+def get_sender(config):
+    """
+    Crea el emisor de recordatorios configurado en `REMINDER_SENDER`.
+
+    Args:
+        config (dict): La configuración de la aplicación.
+
+    Returns:
+        object: Un objeto con el método `send(reminders)`. Con 'file' se usa `FileSender`; cualquier otro
+                valor es la ruta (`paquete.modulo:Clase` o `paquete.modulo.Clase`) de una clase que recibe
+                la configuración en su constructor.
+    """
+    sender = config['REMINDER_SENDER']
+    if sender == 'file':
+        return FileSender(config['REMINDER_FILE_PATH'])
+    return import_string(sender)(config)
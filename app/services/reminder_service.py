@@ -0,0 +1,269 @@
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy.dialects import postgresql, sqlite
+from app import db
+from app.models.assignment_model import Assignment
+from app.models.habit_model import Habit
+from app.models.user_model import User
+from app.models.reminder_dispatch_model import ReminderDispatch
+from app.services.assignment_service import AssignmentService
+from app.services.reminder_senders import get_sender
+from app.utils.exceptions import InvalidDataError
+
+
+class ReminderService:
+    """
+    Servicio de envío de recordatorios por momento del día ('mañana', 'tarde' y 'noche').
+
+    El envío de un turno tiene dos fases:
+
+    1. Planificación: recorre las asignaciones pendientes del turno por lotes con paginación por clave
+       (`assignment_id > último`, sobre la clave primaria) y las inserta en `reminder_dispatches`. La
+       clave primaria (día, turno, asignación) hace que volver a planificar no duplique recordatorios.
+    2. Despacho: recorre los recordatorios pendientes del turno, también por clave, y reparte los lotes
+       entre un pool de hilos. Cada hilo toma sus filas con un UPDATE condicional (solo las pendientes),
+       así dos procesos de despacho simultáneos no envían el mismo recordatorio, y registra el resultado.
+       Antes de enviar vuelve a comprobar que la asignación siga pendiente: las que se completaron (o
+       desactivaron) desde la planificación se marcan como omitidas ('skipped') y no se envían.
+
+    Si el proceso se interrumpe, ejecutar de nuevo el despacho del turno retoma los pendientes y los que
+    quedaron tomados por más de `REMINDER_CLAIM_TIMEOUT` segundos.
+    """
+
+    SLOTS = ('mañana', 'tarde', 'noche')
+
+    @staticmethod
+    def slot_starts(day):
+        """
+        Calcula el inicio de cada turno de un día según `REMINDER_SLOT_HOURS`.
+
+        Args:
+            day (date): El día.
+
+        Returns:
+            list: Tuplas (turno, fecha y hora de inicio), en orden.
+        """
+        hours = current_app.config['REMINDER_SLOT_HOURS']
+        return [(slot, datetime.combine(day, datetime.min.time()) + timedelta(hours=hour))
+                for slot, hour in zip(ReminderService.SLOTS, hours)]
+
+    @staticmethod
+    def current_slot(now):
+        """
+        Obtiene el turno en curso en un momento dado.
+
+        Args:
+            now (datetime): El momento.
+
+        Returns:
+            tuple: (turno, día del turno). Antes del primer turno del día sigue en curso la noche anterior.
+        """
+        for slot, start in reversed(ReminderService.slot_starts(now.date())):
+            if now >= start:
+                return slot, now.date()
+        return ReminderService.SLOTS[-1], now.date() - timedelta(days=1)
+
+    @staticmethod
+    def _check_slot(slot):
+        if slot not in ReminderService.SLOTS:
+            raise InvalidDataError(f"slot must be one of {', '.join(ReminderService.SLOTS)}.")
+
+    @staticmethod
+    def _insert_ignore():
+        # INSERT que ignora las filas ya planificadas (ON CONFLICT DO NOTHING en ambos motores)
+        dialect = postgresql if db.engine.dialect.name == 'postgresql' else sqlite
+        return dialect.insert(ReminderDispatch).on_conflict_do_nothing()
+
+    @staticmethod
+    def plan(slot, day, batch_size=None):
+        """
+        Registra los recordatorios de un turno: uno por asignación activa, de un usuario y un hábito
+        activos con ese momento del día, que corresponde al día y todavía no se completó.
+
+        Args:
+            slot (str): El turno ('mañana', 'tarde' o 'noche').
+            day (date): El día.
+            batch_size (int, opcional): Asignaciones por lote. Por defecto `REMINDER_BATCH_SIZE`.
+
+        Returns:
+            int: Cantidad de recordatorios nuevos registrados.
+
+        Raises:
+            ValueError: Si el turno no es válido.
+        """
+        ReminderService._check_slot(slot)
+        batch_size = batch_size or current_app.config['REMINDER_BATCH_SIZE']
+        due = (
+            db.select(Assignment.assignment_id, Assignment.fk_user_id)
+            .join(User, User.user_id == Assignment.fk_user_id)
+            .join(Habit, Habit.habit_id == Assignment.fk_habit_id)
+            .where(User.user_status, Habit.habit_status, Habit.time_of_day == slot,
+                   *AssignmentService.due_conditions(day))
+            .order_by(Assignment.assignment_id)
+            .limit(batch_size)
+        )
+
+        planned, last_id = 0, 0
+        while True:
+            rows = db.session.execute(due.where(Assignment.assignment_id > last_id)).all()
+            if not rows:
+                break
+            # RETURNING solo devuelve las filas insertadas, no las que ya estaban planificadas
+            inserted = db.session.scalars(
+                ReminderService._insert_ignore().returning(ReminderDispatch.fk_assignment_id),
+                [{'dispatch_date': day, 'time_of_day': slot, 'fk_assignment_id': assignment_id, 'fk_user_id': user_id}
+                 for assignment_id, user_id in rows]
+            ).all()
+            db.session.commit()
+            planned += len(inserted)
+            last_id = rows[-1].assignment_id
+        return planned
+
+    @staticmethod
+    def dispatch(slot, day, batch_size=None, workers=None):
+        """
+        Planifica y envía los recordatorios pendientes de un turno.
+
+        Los lotes se envían en paralelo con un pool de `workers` hilos (el envío espera sobre todo por la
+        red o el disco); como mucho hay dos lotes por hilo en vuelo, así la memoria no crece con la
+        cantidad de recordatorios.
+
+        Args:
+            slot (str): El turno ('mañana', 'tarde' o 'noche').
+            day (date): El día.
+            batch_size (int, opcional): Recordatorios por lote. Por defecto `REMINDER_BATCH_SIZE`.
+            workers (int, opcional): Hilos de envío. Por defecto `REMINDER_WORKERS`.
+
+        Returns:
+            dict: `planned` (recordatorios nuevos), `sent`, `failed` y `skipped` (recordatorios enviados,
+                  fallidos y omitidos por haberse completado antes del envío, en esta ejecución).
+
+        Raises:
+            ValueError: Si el turno no es válido.
+        """
+        config = current_app.config
+        batch_size = batch_size or config['REMINDER_BATCH_SIZE']
+        workers = workers or config['REMINDER_WORKERS']
+        planned = ReminderService.plan(slot, day, batch_size)
+
+        app = current_app._get_current_object()
+        sender = get_sender(config)
+        pending = (
+            db.select(ReminderDispatch.fk_assignment_id)
+            .where(ReminderDispatch.dispatch_date == day, ReminderDispatch.time_of_day == slot,
+                   ReminderService._claimable())
+            .order_by(ReminderDispatch.fk_assignment_id)
+            .limit(batch_size)
+        )
+
+        totals = {'planned': planned, 'sent': 0, 'failed': 0, 'skipped': 0}
+        in_flight = set()
+
+        def collect(done):
+            for future in done:
+                sent, failed, skipped = future.result()
+                totals['sent'] += sent
+                totals['failed'] += failed
+                totals['skipped'] += skipped
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='reminders') as executor:
+            last_id = 0
+            while True:
+                ids = db.session.scalars(pending.where(ReminderDispatch.fk_assignment_id > last_id)).all()
+                db.session.commit()
+                if not ids:
+                    break
+                last_id = ids[-1]
+                if len(in_flight) >= workers * 2:
+                    done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                    collect(done)
+                in_flight.add(executor.submit(ReminderService._send_batch, app, sender, slot, day, ids))
+            collect(wait(in_flight).done)
+        return totals
+
+    @staticmethod
+    def _claimable():
+        # Pendientes, o tomados por un despacho que no terminó dentro del plazo
+        timeout = timedelta(seconds=current_app.config['REMINDER_CLAIM_TIMEOUT'])
+        return db.or_(ReminderDispatch.status == 'pending',
+                      db.and_(ReminderDispatch.status == 'sending',
+                              ReminderDispatch.claimed_at < datetime.now() - timeout))
+
+    @staticmethod
+    def _send_batch(app, sender, slot, day, assignment_ids):
+        """
+        Toma, envía y registra un lote de recordatorios. Se ejecuta en los hilos del pool.
+
+        Returns:
+            tuple: (recordatorios enviados, recordatorios fallidos definitivamente, recordatorios omitidos).
+        """
+        with app.app_context():
+            in_batch = (ReminderDispatch.dispatch_date == day, ReminderDispatch.time_of_day == slot,
+                        ReminderDispatch.fk_assignment_id.in_(assignment_ids))
+            # Tomar solo las filas que siguen pendientes: otro despacho pudo haberlas tomado
+            claimed = db.session.scalars(
+                db.update(ReminderDispatch)
+                .where(*in_batch, ReminderService._claimable())
+                .values(status='sending', claimed_at=datetime.now())
+                .returning(ReminderDispatch.fk_assignment_id)
+            ).all()
+            db.session.commit()
+            if not claimed:
+                return 0, 0, 0
+
+            claimed_batch = (*in_batch[:2], ReminderDispatch.fk_assignment_id.in_(claimed))
+            # Se repiten las condiciones de la planificación: desde entonces el usuario pudo completar el
+            # hábito (o desactivarse la asignación, el usuario o el hábito)
+            reminders = [
+                {'dispatch_date': day.isoformat(), 'time_of_day': slot, 'assignment_id': assignment_id,
+                 'user_id': user_id, 'nickname': nickname, 'email': email,
+                 'habit_id': habit_id, 'habit_name': habit_name}
+                for assignment_id, user_id, nickname, email, habit_id, habit_name in db.session.execute(
+                    db.select(ReminderDispatch.fk_assignment_id, User.user_id, User.nickname, User.email,
+                              Habit.habit_id, Habit.habit_name)
+                    .join(Assignment, Assignment.assignment_id == ReminderDispatch.fk_assignment_id)
+                    .join(User, User.user_id == ReminderDispatch.fk_user_id)
+                    .join(Habit, Habit.habit_id == Assignment.fk_habit_id)
+                    .where(*claimed_batch, User.user_status, Habit.habit_status, *AssignmentService.due_conditions(day))
+                    .order_by(ReminderDispatch.fk_assignment_id)
+                )
+            ]
+            due_ids = [reminder['assignment_id'] for reminder in reminders]
+            skipped = len(claimed) - len(due_ids)
+            if skipped:
+                db.session.execute(
+                    db.update(ReminderDispatch)
+                    .where(*claimed_batch, ReminderDispatch.fk_assignment_id.not_in(due_ids))
+                    .values(status='skipped', claimed_at=None)
+                )
+                db.session.commit()
+            if not reminders:
+                return 0, 0, skipped
+            claimed_batch = (*in_batch[:2], ReminderDispatch.fk_assignment_id.in_(due_ids))
+
+            try:
+                sender.send(reminders)
+            except Exception as e:
+                app.logger.exception('Reminder batch for %s %s failed', day, slot)
+                db.session.rollback()
+                max_attempts = app.config['REMINDER_MAX_ATTEMPTS']
+                attempts = ReminderDispatch.attempts + 1
+                db.session.execute(
+                    db.update(ReminderDispatch)
+                    .where(*claimed_batch)
+                    .values(attempts=attempts, error=str(e)[:255], claimed_at=None,
+                            status=db.case((attempts >= max_attempts, 'failed'), else_='pending'))
+                )
+                failed = db.session.scalar(
+                    db.select(db.func.count()).where(*claimed_batch, ReminderDispatch.status == 'failed'))
+                db.session.commit()
+                return 0, failed, skipped
+
+            db.session.execute(
+                db.update(ReminderDispatch)
+                .where(*claimed_batch)
+                .values(status='sent', sent_at=datetime.now(), attempts=ReminderDispatch.attempts + 1, error=None)
+            )
+            db.session.commit()
+            return len(due_ids), 0, skipped
@@ -0,0 +1,158 @@
+from datetime import datetime, timedelta
+from flask import current_app
+from app import db
+from app.models.user_model import User
+from app.models.habit_model import Habit
+from app.models.assignment_model import Assignment
+from app.models.completed_date_model import CompletedDate
+from app.models.tombstone_model import Tombstone
+from app.utils.read_query import ReadQuery
+from app.utils.validations import Validations
+from app.utils.exceptions import InvalidDataError
+
+
+class SyncService:
+    """
+    Servicio de sincronización incremental para los clientes sin conexión permanente (aplicación móvil).
+
+    Cada respuesta incluye un token con el momento de la lectura, según el reloj de la base de datos. En la
+    siguiente sincronización solo se leen las filas con `updated_at` posterior al token (y las lápidas de
+    las filas eliminadas desde entonces), usando los índices por usuario y `updated_at`. El token se
+    retrocede `SYNC_TOKEN_OVERLAP` segundos para no perder las filas de transacciones que se confirmaron
+    después de la lectura anterior con una hora anterior; los clientes reciben esas filas dos veces y las
+    aplican por ID.
+    """
+
+    USER_FIELDS = ['user_id', 'first_name', 'last_name', 'nickname', 'email', 'user_status', 'user_created_date', 'updated_at']
+    HABIT_FIELDS = ['habit_id', 'habit_name', 'time_of_day', 'habit_status', 'updated_at']
+    ASSIGNMENT_FIELDS = ['assignment_id', 'fk_habit_id', 'assignment_status', 'created_date', 'schedule_days',
+                         'schedule_every', 'schedule_start', 'updated_at']
+    COMPLETED_DATE_FIELDS = ['completed_date_id', 'fk_assignment_id', 'completed_date', 'updated_at']
+
+    @staticmethod
+    def record_tombstone(entity, entity_id, fk_user_id=None):
+        """
+        Agrega a la transacción en curso la lápida de una fila eliminada; quien la elimina confirma ambas.
+
+        Args:
+            entity (str): Tipo de la fila ('habit', 'assignment' o 'completed_date').
+            entity_id (int): ID de la fila.
+            fk_user_id (int, opcional): ID del usuario dueño de la fila (None para los hábitos).
+        """
+        db.session.add(Tombstone(entity, entity_id, fk_user_id))
+
+    @staticmethod
+    def _now():
+        # Hora de la base de datos sin zona horaria, como la guardan las columnas `updated_at`
+        if db.session.get_bind().dialect.name == 'postgresql':
+            return db.session.scalar(db.select(db.func.localtimestamp()))
+        return db.session.scalar(db.select(db.func.now()))
+
+    @staticmethod
+    def parse_token(token):
+        """
+        Convierte un token de sincronización en el momento que representa.
+
+        Args:
+            token (str | None): El token retornado por una sincronización anterior.
+
+        Returns:
+            datetime | None: El momento del token, o None si no se envió.
+
+        Raises:
+            InvalidDataError: Si el token no es válido.
+        """
+        if not token:
+            return None
+        try:
+            return datetime.fromisoformat(token)
+        except ValueError:
+            raise InvalidDataError('The since parameter must be a token returned by a previous sync.')
+
+    @staticmethod
+    def get_changes(user_id, since=None):
+        """
+        Obtiene los datos de un usuario modificados desde una sincronización anterior.
+
+        Sin `since`, o si el token es más antiguo que las lápidas conservadas, se retorna una sincronización
+        completa: el cliente debe reemplazar sus datos en lugar de aplicar los cambios.
+
+        Args:
+            user_id (int): El ID del usuario.
+            since (datetime, opcional): El momento del token de la sincronización anterior.
+
+        Returns:
+            dict: `token` para la siguiente sincronización, `full_sync`, `user` (None si no cambió), los
+                  `habits` de sus asignaciones, `assignments` y `completed_dates` modificados, y `deleted`
+                  con los IDs eliminados por tipo.
+
+        Raises:
+            ValueError: Si el usuario no existe.
+        """
+        config = current_app.config
+        # El token se toma antes de leer: lo que se modifique durante la lectura se vuelve a enviar después
+        now = SyncService._now()
+        user = ReadQuery(User, SyncService.USER_FIELDS).filter(User.user_id == user_id).first()
+        Validations.check_if_exists(user, 'User')
+
+        full_sync = since is None or since < now - timedelta(days=config['SYNC_TOMBSTONE_RETENTION_DAYS'])
+        after = None if full_sync else since - timedelta(seconds=config['SYNC_TOKEN_OVERLAP'])
+
+        def changed(column):
+            return () if after is None else (column > after,)
+
+        assignments = (
+            ReadQuery(Assignment, SyncService.ASSIGNMENT_FIELDS)
+            .filter(Assignment.fk_user_id == user_id, *changed(Assignment.updated_at))
+            .order_by(Assignment.assignment_id)
+            .all()
+        )
+        user_assignment_ids = db.select(Assignment.assignment_id).where(Assignment.fk_user_id == user_id)
+        completed_dates = (
+            ReadQuery(CompletedDate, SyncService.COMPLETED_DATE_FIELDS)
+            .filter(CompletedDate.fk_assignment_id.in_(user_assignment_ids), *changed(CompletedDate.updated_at))
+            .order_by(CompletedDate.completed_date_id)
+            .all()
+        )
+        # Hábitos de las asignaciones del usuario que cambiaron, más los de las asignaciones nuevas o modificadas
+        user_habit_ids = db.select(Assignment.fk_habit_id).where(Assignment.fk_user_id == user_id)
+        habit_condition = Habit.habit_id.in_(user_habit_ids)
+        if after is not None:
+            habit_condition = db.and_(habit_condition, db.or_(
+                Habit.updated_at > after, Habit.habit_id.in_(sorted({row.fk_habit_id for row in assignments}))))
+        habits = ReadQuery(Habit, SyncService.HABIT_FIELDS).filter(habit_condition).order_by(Habit.habit_id).all()
+
+        deleted = {'habits': [], 'assignments': [], 'completed_dates': []}
+        if after is not None:
+            for entity, entity_id in db.session.execute(
+                    db.select(Tombstone.entity, Tombstone.entity_id)
+                    .where(db.or_(Tombstone.fk_user_id == user_id,
+                                  db.and_(Tombstone.fk_user_id.is_(None), Tombstone.entity == 'habit')),
+                           Tombstone.deleted_at > after)
+                    .order_by(Tombstone.tombstone_id)):
+                deleted[f'{entity}s'].append(entity_id)
+
+        return {
+            'token': now.isoformat(),
+            'full_sync': full_sync,
+            'user': user if after is None or user.updated_at > after else None,
+            'habits': habits,
+            'assignments': assignments,
+            'completed_dates': completed_dates,
+            'deleted': deleted
+        }
+
+    @staticmethod
+    def prune_tombstones():
+        """
+        Elimina las lápidas de más de `SYNC_TOMBSTONE_RETENTION_DAYS` días. Los clientes con un token anterior
+        a ese plazo ya reciben una sincronización completa, así que no las necesitan.
+
+        Returns:
+            int: Cantidad de lápidas eliminadas.
+        """
+        cutoff = SyncService._now() - timedelta(days=current_app.config['SYNC_TOMBSTONE_RETENTION_DAYS'])
+        result = db.session.execute(
+            db.delete(Tombstone).where(Tombstone.deleted_at < cutoff).execution_options(synchronize_session=False))
+        db.session.commit()
+        return result.rowcount
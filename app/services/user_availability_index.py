@@ -0,0 +1,166 @@
+import threading
+import time
+from flask import current_app
+from app import db
+from app.models.user_model import User
+from app.utils.bloom_filter import BloomFilter
+from app.utils.cache_invalidation import CacheInvalidation
+
+
+class UserAvailabilityIndex():
+    """
+    Filtro de Bloom en memoria con los apodos y correos registrados, para responder las consultas de
+    disponibilidad sin tocar la base de datos cuando el valor seguro no está en uso.
+
+    El filtro se construye en un hilo en segundo plano al iniciar cada worker (`start`, desde `post_fork`
+    en `gunicorn.conf.py`, o en la primera consulta si no se inició), recorriendo la tabla de usuarios del
+    primario por bloques, y se reconstruye de la misma forma cada `AVAILABILITY_FILTER_TTL` segundos o
+    cuando se llena. Las consultas nunca esperan la construcción: mientras se reconstruye se sigue usando
+    el filtro anterior, y si todavía no hay ninguno se consulta el índice único de la columna.
+
+    Los valores nuevos se agregan con `add` en este proceso y, en PostgreSQL, en los demás (ver
+    `CacheInvalidation`). Un valor que "puede estar" en el filtro se confirma con la búsqueda en el índice
+    único de la columna; así, los valores de usuarios eliminados o modificados solo cuestan esa consulta.
+    """
+
+    # Columnas cuyos valores se guardan en el filtro
+    FIELDS = {'nickname': User.nickname, 'email': User.email}
+
+    # Filas leídas por bloque al construir el filtro
+    FETCH_SIZE = 10000
+
+    # Segundos de espera antes de reintentar una construcción
+    RETRY_INTERVAL = 30
+
+    # Lecturas por construcción si se pierden invalidaciones mientras se lee
+    BUILD_ATTEMPTS = 3
+
+    _filter = None
+    _built_at = 0.0
+    _started_at = float('-inf')
+    _pending = None  # Claves agregadas mientras se construye el filtro; None si no hay construcción en curso
+    _lock = threading.Lock()
+
+    @staticmethod
+    def _key(field, value):
+        return f'{field}:{value}'
+
+    @staticmethod
+    def start(app):
+        """
+        Inicia la construcción del filtro en segundo plano, si no hay una en curso.
+
+        Args:
+            app (Flask): La aplicación Flask.
+        """
+        with UserAvailabilityIndex._lock:
+            if UserAvailabilityIndex._pending is not None:
+                return
+            CacheInvalidation.register('user_availability', UserAvailabilityIndex._on_change)
+            UserAvailabilityIndex._pending = []
+            UserAvailabilityIndex._started_at = time.monotonic()
+            threading.Thread(target=UserAvailabilityIndex._build, args=(app,), daemon=True).start()
+
+    @staticmethod
+    def _build(app):
+        with app.app_context():
+            # Se escucha antes de leer: al conectarse, el hilo de invalidaciones vacía las cachés y eso
+            # descarta la construcción en curso
+            CacheInvalidation.ensure_listening()
+            for _ in range(UserAvailabilityIndex.BUILD_ATTEMPTS):
+                bloom = UserAvailabilityIndex._read(app)
+                with UserAvailabilityIndex._lock:
+                    pending = UserAvailabilityIndex._pending
+                    if bloom is not None and None in pending:
+                        # Se perdieron invalidaciones durante la lectura: se vuelve a leer
+                        UserAvailabilityIndex._pending = []
+                        continue
+                    UserAvailabilityIndex._pending = None
+                    if bloom is None:
+                        return
+                    # Los valores registrados durante la lectura pueden no estar en ella
+                    for key in pending:
+                        bloom.add(key)
+                    UserAvailabilityIndex._filter, UserAvailabilityIndex._built_at = bloom, time.monotonic()
+                    return
+            with UserAvailabilityIndex._lock:
+                UserAvailabilityIndex._pending = None
+                UserAvailabilityIndex._filter = None
+
+    @staticmethod
+    def _read(app):
+        # Filtro con los valores actuales de los usuarios, o None si la lectura falla
+        try:
+            config = app.config
+            total = db.session.scalar(db.select(db.func.count()).select_from(User))
+            # Capacidad para el doble de los usuarios actuales antes de tener que reconstruirlo
+            bloom = BloomFilter(capacity=max(total, 1000) * 2 * len(UserAvailabilityIndex.FIELDS),
+                                error_rate=config['AVAILABILITY_FILTER_ERROR_RATE'])
+            result = db.session.execute(
+                db.select(*UserAvailabilityIndex.FIELDS.values()).execution_options(yield_per=UserAvailabilityIndex.FETCH_SIZE))
+            for row in result:
+                for field, value in zip(UserAvailabilityIndex.FIELDS, row):
+                    bloom.add(UserAvailabilityIndex._key(field, value))
+            return bloom
+        except Exception:
+            app.logger.exception('Could not build the user availability filter')
+            return None
+        finally:
+            db.session.remove()
+
+    @staticmethod
+    def _current():
+        # Filtro vigente, o None si todavía no hay uno. Si falta, se llenó o venció, se reconstruye en
+        # segundo plano; uno lleno sigue siendo correcto, solo con más falsos positivos
+        bloom = UserAvailabilityIndex._filter
+        now = time.monotonic()
+        stale = bloom is None or bloom.is_full() or \
+            now - UserAvailabilityIndex._built_at >= current_app.config['AVAILABILITY_FILTER_TTL']
+        if stale and now - UserAvailabilityIndex._started_at >= UserAvailabilityIndex.RETRY_INTERVAL:
+            UserAvailabilityIndex.start(current_app._get_current_object())
+        return bloom
+
+    @staticmethod
+    def _on_change(keys):
+        with UserAvailabilityIndex._lock:
+            if UserAvailabilityIndex._pending is not None:
+                UserAvailabilityIndex._pending.extend(keys if keys is not None else [None])
+            if keys is None:
+                UserAvailabilityIndex._filter = None
+            elif UserAvailabilityIndex._filter is not None:
+                for key in keys:
+                    UserAvailabilityIndex._filter.add(key)
+
+    @staticmethod
+    def add(nickname=None, email=None):
+        """
+        Registra en el filtro los valores de un usuario creado o modificado. Debe llamarse después de
+        confirmar la transacción.
+
+        Args:
+            nickname (str, opcional): El apodo en uso.
+            email (str, opcional): El correo en uso.
+        """
+        keys = [UserAvailabilityIndex._key(field, value)
+                for field, value in (('nickname', nickname), ('email', email)) if value is not None]
+        if keys:
+            CacheInvalidation.publish('user_availability', keys)
+
+    @staticmethod
+    def is_available(field, value):
+        """
+        Indica si un valor está libre en una columna única de los usuarios.
+
+        Args:
+            field (str): 'nickname' o 'email'.
+            value (str): El valor a consultar.
+
+        Returns:
+            bool: True si ningún usuario usa el valor.
+        """
+        bloom = UserAvailabilityIndex._current()
+        if bloom is not None and UserAvailabilityIndex._key(field, value) not in bloom:
+            return True
+        # Posible coincidencia (o filtro todavía en construcción): se confirma con el índice único de la columna
+        column = UserAvailabilityIndex.FIELDS[field]
+        return not db.session.query(db.exists().where(column == value)).scalar()
@@ -1,6 +1,15 @@
+from flask import current_app
 from app import db, bcrypt
 from app.models.user_model import User
+from app.models.assignment_model import Assignment
+from app.models.completed_date_model import CompletedDate
+from app.services.outbox_service import OutboxService
+from app.services.user_availability_index import UserAvailabilityIndex
+from app.services.job_service import JobService
 from app.utils.validations import Validations
+from app.utils.sparse_fields import SparseFields
+from app.utils.batch_lookup import BatchLookup
+from app.utils.exceptions import InvalidDataError
 from datetime import datetime
 
 class UserService:
@@ -38,26 +47,36 @@ class UserService:
         # Añadir el nuevo usuario a la base de datos
         db.session.add(user)
         db.session.commit()
+        UserAvailabilityIndex.add(nickname, email)
         return user
 
     @staticmethod
-    def get_all_users():
+    def get_all_users(include_inactive=False, fields=None):
         """
         Obtiene todos los usuarios registrados en la base de datos.
 
+        Args:
+            include_inactive (bool): Si es True también se incluyen los usuarios desactivados.
+            fields (list, opcional): Columnas a seleccionar; si se indican se retornan filas con solo esas columnas.
+
         Returns:
             List[User]: Una lista con todos los usuarios registrados.
         """
-        # Retorna todos los registros de la tabla User
-        return User.query.all()
+        query = SparseFields.query(User, fields)
+        if not include_inactive:
+            # Por defecto solo se leen los usuarios activos (índice parcial ix_users_active_user_id)
+            query = query.filter(User.user_status)
+        return query.all()
 
     @staticmethod
-    def get_user_by_user_id(user_id):
+    def get_user_by_user_id(user_id, include_inactive=False, fields=None):
         """
         Obtiene un usuario por su ID de usuario.
 
         Args:
             user_id (int): El ID del usuario que se desea obtener.
+            include_inactive (bool): Si es True también se retorna el usuario aunque esté desactivado.
+            fields (list, opcional): Columnas a seleccionar; si se indican se retornan filas con solo esas columnas.
 
         Returns:
             User: El usuario que coincide con el ID proporcionado.
@@ -66,7 +85,10 @@ class UserService:
             ValueError: Si el usuario no existe.
         """
         # Buscar al usuario por su ID
-        user = User.query.filter_by(user_id=user_id).first()
+        query = SparseFields.query(User, fields).filter(User.user_id == user_id)
+        if not include_inactive:
+            query = query.filter(User.user_status)
+        user = query.first()
         # Validar si el usuario existe
         user_validated = Validations.check_if_exists(user, 'User')
         return user_validated
@@ -102,22 +124,185 @@ class UserService:
             user.email = new_data['email']
         if 'user_password' in new_data:
             user.user_password = bcrypt.generate_password_hash(new_data['user_password']).decode('utf-8')
-        # Guardar los cambios en la base de datos
+        # Guardar los cambios en la base de datos, junto con su evento
+        OutboxService.record('user', 'updated', OutboxService.user_payload(user))
+        db.session.commit()
+        UserAvailabilityIndex.add(new_data.get('nickname'), new_data.get('email'))
+
+    @staticmethod
+    def check_availability(nickname=None, email=None):
+        """
+        Indica si un apodo y un correo están libres para registrar un usuario.
+
+        Los valores que el filtro de Bloom descarta se responden sin consultar la base de datos; solo las
+        posibles coincidencias se confirman con una búsqueda por índice (ver `UserAvailabilityIndex`).
+
+        Args:
+            nickname (str, opcional): El apodo a consultar.
+            email (str, opcional): El correo a consultar.
+
+        Returns:
+            dict: `{'nickname': bool, 'email': bool}` con los campos consultados; True si el valor está libre.
+
+        Raises:
+            ValueError: Si no se indica ningún valor.
+        """
+        values = {field: value for field, value in (('nickname', nickname), ('email', email)) if value}
+        if not values:
+            raise InvalidDataError('At least one of nickname or email is required.')
+        return {field: UserAvailabilityIndex.is_available(field, value) for field, value in values.items()}
+
+    @staticmethod
+    def set_user_status(user_id, status):
+        """
+        Activa o desactiva un usuario sin eliminar sus datos.
+
+        Args:
+            user_id (int): El ID del usuario.
+            status (bool): True para reactivar el usuario, False para desactivarlo.
+
+        Returns:
+            User: El usuario actualizado.
+
+        Raises:
+            ValueError: Si el usuario no existe.
+        """
+        user = UserService.get_user_by_user_id(user_id, include_inactive=True)
+        if user.user_status != status:
+            user.user_status = status
+            OutboxService.record('user', 'updated', OutboxService.user_payload(user))
         db.session.commit()
+        if not status:
+            Validations.invalidate_fk_existence('users', [user_id])
+        return user
 
     @staticmethod
-    def delete_user(user_id):
+    def delete_user(user_id, batch_size=None, progress_callback=None):
         """
-        Elimina un usuario de la base de datos.
+        Elimina un usuario junto con todo su historial (asignaciones y fechas completadas).
+
+        El historial se borra por lotes con sentencias DELETE sobre conjuntos de IDs, confirmando
+        cada lote en su propia transacción. Así no se cargan los objetos en la sesión y los
+        bloqueos sobre las tablas se mantienen cortos aunque el usuario tenga años de registros.
 
         Args:
             user_id (int): El ID del usuario a eliminar.
+            batch_size (int, opcional): Cantidad máxima de filas por lote. Por defecto se usa
+                                        `USER_DELETE_BATCH_SIZE` de la configuración.
+            progress_callback (callable, opcional): Función que recibe un diccionario con el progreso
+                                                    después de cada lote.
 
         Returns:
-            None
+            dict: Cantidad de fechas completadas y asignaciones eliminadas.
+
+        Raises:
+            ValueError: Si el usuario no existe.
         """
-        # Buscar al usuario por su ID
-        user = UserService.get_user_by_user_id(user_id)
-        # Eliminar el usuario de la base de datos
-        db.session.delete(user)
+        # Validar que el usuario exista antes de empezar a borrar
+        UserService.get_user_by_user_id(user_id, include_inactive=True)
+        batch_size = batch_size or current_app.config['USER_DELETE_BATCH_SIZE']
+
+        user_assignment_ids = db.select(Assignment.assignment_id).where(Assignment.fk_user_id == user_id)
+        user_completed_dates = db.select(CompletedDate.completed_date_id).where(CompletedDate.fk_assignment_id.in_(user_assignment_ids))
+
+        # Totales para reportar el progreso
+        progress = {
+            'user_id': user_id,
+            'completed_dates_total': db.session.scalar(db.select(db.func.count()).select_from(user_completed_dates.subquery())),
+            'assignments_total': db.session.scalar(db.select(db.func.count()).select_from(user_assignment_ids.subquery())),
+            'completed_dates_deleted': 0,
+            'assignments_deleted': 0
+        }
+        if progress_callback:
+            progress_callback(progress)
+
+        # Primero las fechas completadas, luego las asignaciones, respetando las claves foráneas. Cada lote
+        # registra en la bandeja de salida los eventos de las filas que eliminó, en su misma transacción
+        deleted_assignment_ids = []
+        for model, id_column, ids_query, counter, entity, payload_columns in (
+            (CompletedDate, CompletedDate.completed_date_id, user_completed_dates, 'completed_dates_deleted',
+             'completed_date', (CompletedDate.completed_date_id, CompletedDate.fk_assignment_id)),
+            (Assignment, Assignment.assignment_id, user_assignment_ids, 'assignments_deleted',
+             'assignment', (Assignment.assignment_id, Assignment.fk_user_id, Assignment.fk_habit_id))
+        ):
+            while True:
+                batch = ids_query.limit(batch_size)
+                deleted = db.session.execute(
+                    db.delete(model).where(id_column.in_(batch)).returning(*payload_columns)
+                    .execution_options(synchronize_session=False)).all()
+                OutboxService.record_many(entity, 'deleted', [{**row._asdict(), 'fk_user_id': user_id} for row in deleted])
+                db.session.commit()
+                if model is Assignment:
+                    deleted_assignment_ids.extend(row.assignment_id for row in deleted)
+                progress[counter] += len(deleted)
+                if progress_callback:
+                    progress_callback(progress)
+                if len(deleted) < batch_size:
+                    break
+
+        # Finalmente se elimina el usuario, que ya no tiene filas dependientes
+        db.session.execute(db.delete(User).where(User.user_id == user_id))
+        OutboxService.record('user', 'deleted', {'user_id': user_id})
         db.session.commit()
+        Validations.invalidate_fk_existence('assignments', deleted_assignment_ids)
+        Validations.invalidate_fk_existence('users', [user_id])
+        return {
+            'completed_dates_deleted': progress['completed_dates_deleted'],
+            'assignments_deleted': progress['assignments_deleted']
+        }
+
+    @staticmethod
+    def delete_user_in_background(user_id, batch_size=None):
+        """
+        Programa la eliminación de un usuario y su historial como trabajo en segundo plano.
+
+        Args:
+            user_id (int): El ID del usuario a eliminar.
+            batch_size (int, opcional): Cantidad máxima de filas por lote.
+
+        Returns:
+            str: El ID del trabajo, para consultar su progreso.
+
+        Raises:
+            ValueError: Si el usuario no existe.
+        """
+        # Validar que el usuario exista para responder de inmediato si no es así
+        UserService.get_user_by_user_id(user_id, include_inactive=True)
+        params = {'user_id': user_id} if batch_size is None else {'user_id': user_id, 'batch_size': batch_size}
+        return JobService.enqueue('delete_user', params).job_id
+
+    @staticmethod
+    def get_delete_task(task_id):
+        """
+        Obtiene el estado de una eliminación de usuario en segundo plano.
+
+        Args:
+            task_id (str): El ID del trabajo.
+
+        Returns:
+            ReadRow: El trabajo, con su estado y progreso.
+
+        Raises:
+            ValueError: Si el trabajo no existe o no es una eliminación de usuario.
+        """
+        return JobService.get_job(task_id, 'delete_user')
+
+    @staticmethod
+    def get_users_by_ids(user_ids, include_inactive=False, fields=None):
+        """
+        Obtiene varios usuarios por sus IDs en una sola consulta.
+
+        Args:
+            user_ids (list): IDs de usuarios en el orden en que deben retornarse.
+            include_inactive (bool): Si es True también se incluyen usuarios desactivados.
+            fields (list, opcional): Columnas a seleccionar; si se indican se retornan filas con solo esas columnas.
+
+        Returns:
+            tuple: (List[User] en el orden pedido, lista de IDs que no se encontraron).
+        """
+        # El ID siempre se selecciona para poder ordenar el resultado según la petición
+        columns = fields if not fields or 'user_id' in fields else fields + ['user_id']
+        query = SparseFields.query(User, columns).filter(BatchLookup.id_condition(User.user_id, user_ids))
+        if not include_inactive:
+            query = query.filter(User.user_status)
+        return BatchLookup.order_results(query.all(), user_ids, 'user_id')
@@ -0,0 +1,19 @@
+from flask_restx import fields
+
+
+class Weekdays(fields.Raw):
+    """
+    Campo de Flask-RESTX para una máscara de días de la semana (bit 0 = lunes ... bit 6 = domingo),
+    que se expone como la lista de días incluidos, de 0 (lunes) a 6 (domingo).
+    """
+
+    __schema_type__ = 'array'
+    __schema_example__ = [0, 2, 4]
+
+    def format(self, value):
+        return [day for day in range(7) if value >> day & 1]
+
+    def schema(self):
+        schema = super().schema()
+        schema['items'] = {'type': 'integer', 'minimum': 0, 'maximum': 6}
+        return schema
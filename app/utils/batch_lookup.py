@@ -0,0 +1,45 @@
+from sqlalchemy.dialects.postgresql import ARRAY
+from app import db
+
+
+class BatchLookup():
+    """
+    Utilidades para obtener varias filas por sus IDs en una sola consulta.
+    """
+
+    @staticmethod
+    def id_condition(column, ids):
+        """
+        Construye la condición `column = ANY(:ids)` para buscar varias filas por ID.
+
+        En PostgreSQL la lista se envía como un único parámetro de tipo arreglo, de modo que el texto
+        de la consulta es el mismo sin importar cuántos IDs se pidan. En otros motores se usa `IN`.
+
+        Args:
+            column (Column): La columna de ID.
+            ids (list): Los IDs a buscar.
+
+        Returns:
+            ColumnElement: La condición para la cláusula WHERE.
+        """
+        if db.engine.dialect.name == 'postgresql':
+            return column == db.any_(db.bindparam('ids', ids, type_=ARRAY(db.Integer)))
+        return column.in_(ids)
+
+    @staticmethod
+    def order_results(rows, ids, id_field):
+        """
+        Ordena las filas obtenidas según el orden de los IDs pedidos e identifica los faltantes.
+
+        Args:
+            rows (list): Filas u objetos retornados por la consulta.
+            ids (list): IDs en el orden solicitado por el cliente.
+            id_field (str): Nombre del atributo que contiene el ID en cada fila.
+
+        Returns:
+            tuple: (filas en el orden pedido, lista de IDs que no se encontraron).
+        """
+        rows_by_id = {getattr(row, id_field): row for row in rows}
+        items = [rows_by_id[row_id] for row_id in ids if row_id in rows_by_id]
+        missing = [row_id for row_id in ids if row_id not in rows_by_id]
+        return items, missing
@@ -0,0 +1,47 @@
+import hashlib
+import math
+
+
+class BloomFilter():
+    """
+    Filtro de Bloom: conjunto probabilístico que responde si una clave "seguro no está" o "puede estar".
+
+    Nunca da falsos negativos; la proporción de falsos positivos se mantiene cerca de `error_rate`
+    mientras no se agreguen más de `capacity` claves. No admite eliminar claves.
+    """
+
+    def __init__(self, capacity, error_rate=0.01):
+        """
+        Args:
+            capacity (int): Cantidad de claves previstas.
+            error_rate (float): Proporción de falsos positivos aceptada con `capacity` claves.
+        """
+        self.capacity = max(1, capacity)
+        self.size = max(8, math.ceil(-self.capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / self.capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key):
+        # Doble hashing: las k posiciones se derivan de dos valores de 64 bits de un único resumen
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+        first, second = int.from_bytes(digest[:8], 'little'), int.from_bytes(digest[8:], 'little') | 1
+        return ((first + i * second) % self.size for i in range(self.hash_count))
+
+    def add(self, key):
+        """
+        Agrega una clave al filtro.
+
+        Args:
+            key (str): La clave.
+        """
+        for position in self._positions(key):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, key):
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+    def is_full(self):
+        """Retorna True si se agregaron más claves que la capacidad prevista."""
+        return self.count > self.capacity
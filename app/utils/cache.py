@@ -0,0 +1,81 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class LRUCache():
+    """
+    Caché en memoria con capacidad limitada y expiración opcional, segura para varios hilos.
+
+    Cuando se supera la capacidad se descarta la entrada usada hace más tiempo. Si se indica `ttl`,
+    las entradas expiran después de esa cantidad de segundos.
+    """
+
+    _MISSING = object()
+
+    def __init__(self, maxsize=128, ttl=None):
+        """
+        Args:
+            maxsize (int): Cantidad máxima de entradas.
+            ttl (float, opcional): Segundos de vida de cada entrada; None para que no expiren.
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        """
+        Obtiene el valor de una clave y la marca como usada recientemente.
+
+        Args:
+            key (hashable): La clave a buscar.
+            default (any): Valor a retornar si la clave no existe o expiró.
+
+        Returns:
+            any: El valor guardado o `default`.
+        """
+        with self._lock:
+            entry = self._data.get(key, LRUCache._MISSING)
+            if entry is LRUCache._MISSING:
+                return default
+            value, expires_at = entry
+            if expires_at is not None and expires_at < time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        """
+        Guarda un valor, descartando la entrada menos usada si se supera la capacidad.
+
+        Args:
+            key (hashable): La clave.
+            value (any): El valor a guardar.
+        """
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key):
+        """
+        Elimina una clave si existe.
+
+        Args:
+            key (hashable): La clave a eliminar.
+        """
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        """Elimina todas las entradas."""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._data)
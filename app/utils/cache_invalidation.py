@@ -0,0 +1,105 @@
+import json
+import threading
+import time
+from flask import current_app
+from app import db
+from app.utils.pg_listen import listen
+
+
+class CacheInvalidation():
+    """
+    Difunde las invalidaciones de las cachés en memoria a todos los procesos de la aplicación.
+
+    Cada caché registra un manejador con un nombre (`register`). `publish` lo ejecuta en el proceso
+    actual y, en PostgreSQL, envía la invalidación por el canal `CHANNEL` (NOTIFY); un hilo por proceso,
+    que arranca con `ensure_listening`, la recibe y ejecuta el mismo manejador en los demás procesos.
+    Con otros motores no hay difusión y las entradas de los demás procesos expiran por su TTL.
+    """
+
+    CHANNEL = 'cache_invalidation'
+
+    # Tamaño máximo del payload de NOTIFY en PostgreSQL (8000 bytes) con margen
+    MAX_PAYLOAD = 7000
+
+    # Segundos de espera antes de reconectar el hilo que escucha el canal
+    RETRY_INTERVAL = 5
+
+    _handlers = {}  # {nombre: función(keys)}
+    _listener = None
+    _lock = threading.Lock()
+
+    @staticmethod
+    def register(name, handler):
+        """
+        Registra el manejador de invalidación de una caché.
+
+        Args:
+            name (str): El nombre de la caché.
+            handler (callable): Función que recibe la lista de claves a descartar, o None para vaciar la caché.
+        """
+        CacheInvalidation._handlers[name] = handler
+
+    @staticmethod
+    def publish(name, keys=None):
+        """
+        Invalida claves de una caché en este proceso y en los demás.
+
+        Debe llamarse después de confirmar la transacción que modificó los datos, para que ningún proceso
+        vuelva a guardar en caché el valor anterior. Si la lista de claves no entra en una notificación,
+        los demás procesos vacían la caché completa.
+
+        Args:
+            name (str): El nombre de la caché.
+            keys (list, opcional): Claves a descartar (valores serializables en JSON); None para vaciarla.
+        """
+        CacheInvalidation._apply(name, keys)
+        if db.engine.dialect.name != 'postgresql':
+            return
+        payload = json.dumps([name, keys])
+        if len(payload) > CacheInvalidation.MAX_PAYLOAD:
+            payload = json.dumps([name, None])
+        db.session.execute(db.select(db.func.pg_notify(CacheInvalidation.CHANNEL, payload)))
+        db.session.commit()
+
+    @staticmethod
+    def ensure_listening():
+        """
+        Arranca el hilo que recibe las invalidaciones de los demás procesos, si todavía no está en
+        ejecución en este proceso. No hace nada con motores distintos de PostgreSQL.
+        """
+        if CacheInvalidation._listener is not None and CacheInvalidation._listener.is_alive():
+            return
+        if db.engine.dialect.name != 'postgresql':
+            return
+        app = current_app._get_current_object()
+        with CacheInvalidation._lock:
+            if CacheInvalidation._listener is None or not CacheInvalidation._listener.is_alive():
+                CacheInvalidation._listener = threading.Thread(target=CacheInvalidation._run, args=(app,), daemon=True)
+                CacheInvalidation._listener.start()
+
+    @staticmethod
+    def _apply(name, keys):
+        handler = CacheInvalidation._handlers.get(name)
+        if handler is not None:
+            handler(keys)
+
+    @staticmethod
+    def _run(app):
+        with app.app_context():
+            wait = close = None
+            while True:
+                try:
+                    if wait is None:
+                        wait, close = listen(db.engine, CacheInvalidation.CHANNEL)
+                        # Las invalidaciones enviadas mientras no se escuchaba se perdieron: se vacía todo
+                        for name in list(CacheInvalidation._handlers):
+                            CacheInvalidation._apply(name, None)
+                    for payload in wait(60):
+                        name, keys = json.loads(payload)
+                        CacheInvalidation._apply(name, keys)
+                except Exception:
+                    app.logger.exception('Cache invalidation listener failed; retrying')
+                    if close is not None:
+                        close()
+                    wait = close = None
+                    time.sleep(CacheInvalidation.RETRY_INTERVAL)
@@ -0,0 +1,30 @@
+import select
+
+
+def listen(engine, channel):
+    """
+    Abre una conexión dedicada que escucha un canal de notificaciones de PostgreSQL (LISTEN/NOTIFY).
+
+    Args:
+        engine (Engine): El motor de PostgreSQL.
+        channel (str): El nombre del canal.
+
+    Returns:
+        tuple: Una función `wait(timeout)` que bloquea hasta que llegue una notificación o pase el tiempo
+               indicado y retorna la lista de payloads recibidos, y otra que cierra la conexión.
+    """
+    connection = engine.raw_connection()
+    driver_connection = connection.driver_connection
+    driver_connection.autocommit = True
+    with driver_connection.cursor() as cursor:
+        cursor.execute(f'LISTEN {channel}')
+
+    def wait(timeout):
+        if not driver_connection.notifies:
+            select.select([driver_connection], [], [], timeout)
+        driver_connection.poll()
+        payloads = [notify.payload for notify in driver_connection.notifies]
+        driver_connection.notifies.clear()
+        return payloads
+    # La conexión quedó en modo autocommit, por lo que se descarta en lugar de devolverla al pool
+    return wait, connection.invalidate
@@ -0,0 +1,145 @@
+from datetime import date
+from flask import request, current_app
+from .exceptions import InvalidDataError
+
+
+class QueryParams():
+    """
+    Utilidades para interpretar los parámetros de consulta (query string) de las peticiones.
+    """
+
+    @staticmethod
+    def get_bool(name, default=False):
+        """
+        Obtiene un parámetro de consulta booleano.
+
+        Args:
+            name (str): Nombre del parámetro.
+            default (bool): Valor a retornar si el parámetro no fue enviado.
+
+        Returns:
+            bool: True si el parámetro vale "true", "1" o "yes" (sin distinguir mayúsculas).
+        """
+        value = request.args.get(name)
+        if value is None:
+            return default
+        return value.lower() in ('true', '1', 'yes')
+
+    @staticmethod
+    def get_int(name, default, min_value, max_value):
+        """
+        Obtiene un parámetro de consulta entero dentro de un rango.
+
+        Args:
+            name (str): Nombre del parámetro.
+            default (int): Valor a retornar si el parámetro no fue enviado.
+            min_value (int): Valor mínimo permitido.
+            max_value (int): Valor máximo permitido.
+
+        Returns:
+            int: El valor del parámetro.
+
+        Raises:
+            InvalidDataError: Si el valor no es un entero o está fuera del rango.
+        """
+        try:
+            value = int(request.args.get(name, default))
+        except ValueError:
+            raise InvalidDataError(f'The {name} parameter must be an integer.')
+        if not min_value <= value <= max_value:
+            raise InvalidDataError(f'The {name} parameter must be between {min_value} and {max_value}.')
+        return value
+
+    @staticmethod
+    def get_date(name, default=None):
+        """
+        Obtiene un parámetro de consulta con una fecha en formato ISO (AAAA-MM-DD).
+
+        Args:
+            name (str): Nombre del parámetro.
+            default (date, opcional): Valor a retornar si el parámetro no fue enviado.
+
+        Returns:
+            date: El valor del parámetro.
+
+        Raises:
+            InvalidDataError: Si el valor no es una fecha válida.
+        """
+        value = request.args.get(name)
+        if not value:
+            return default
+        try:
+            return date.fromisoformat(value)
+        except ValueError:
+            raise InvalidDataError(f'The {name} parameter must be a date (YYYY-MM-DD).')
+
+    @staticmethod
+    def get_int_list(name):
+        """
+        Obtiene un parámetro de consulta con una lista de enteros separados por coma (por ejemplo, ?ids=1,2,3).
+
+        Los valores repetidos se descartan conservando el orden de la primera aparición.
+
+        Args:
+            name (str): Nombre del parámetro.
+
+        Returns:
+            list | None: La lista de enteros, o None si el parámetro no fue enviado.
+
+        Raises:
+            InvalidDataError: Si algún valor no es un entero o se supera `BATCH_MAX_IDS`.
+        """
+        value = request.args.get(name)
+        if value is None:
+            return None
+        try:
+            values = list(dict.fromkeys(int(item) for item in value.split(',') if item.strip()))
+        except ValueError:
+            raise InvalidDataError(f'The {name} parameter must be a comma-separated list of integers.')
+        max_items = current_app.config['BATCH_MAX_IDS']
+        if not values or len(values) > max_items:
+            raise InvalidDataError(f'The {name} parameter must contain between 1 and {max_items} values.')
+        return values
+
+    @staticmethod
+    def get_include(allowed):
+        """
+        Obtiene el parámetro `include`, con los datos relacionados a agregar a la respuesta separados por
+        coma (por ejemplo, ?include=stats).
+
+        Args:
+            allowed (tuple): Valores permitidos.
+
+        Returns:
+            set: Los valores pedidos (vacío si el parámetro no fue enviado).
+
+        Raises:
+            InvalidDataError: Si algún valor no está permitido.
+        """
+        requested = {item.strip() for item in request.args.get('include', '').split(',') if item.strip()}
+        unknown = requested - set(allowed)
+        if unknown:
+            raise InvalidDataError(
+                f"Unknown include: {', '.join(sorted(unknown))}. Allowed values: {', '.join(allowed)}.")
+        return requested
+
+    @staticmethod
+    def get_pagination():
+        """
+        Obtiene los parámetros de paginación `page` y `per_page`.
+
+        Returns:
+            tuple: (página, cantidad por página). Por defecto la página 1 y `DEFAULT_PER_PAGE` elementos.
+
+        Raises:
+            InvalidDataError: Si los valores no son enteros positivos o `per_page` supera `MAX_PER_PAGE`.
+        """
+        max_per_page = current_app.config['MAX_PER_PAGE']
+        try:
+            page = int(request.args.get('page', 1))
+            per_page = int(request.args.get('per_page', current_app.config['DEFAULT_PER_PAGE']))
+        except ValueError:
+            raise InvalidDataError('The page and per_page parameters must be integers.')
+        if page < 1 or not 1 <= per_page <= max_per_page:
+            raise InvalidDataError(f'The page parameter must be at least 1 and per_page must be between 1 and {max_per_page}.')
+        return page, per_page
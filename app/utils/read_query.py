@@ -0,0 +1,99 @@
+import dataclasses
+import itertools
+import threading
+import sqlalchemy as sa
+from app import db
+
+
+class ReadQuery():
+    """
+    Consulta de solo lectura construida con un SELECT de SQLAlchemy Core, para los endpoints GET.
+
+    La consulta se ejecuta como sentencia Core sobre la conexión de la sesión (la misma transacción y el
+    mismo enrutamiento a réplicas) y cada fila se convierte en un objeto liviano con `__slots__`: no se
+    crean instancias instrumentadas del ORM ni se registran en el identity map, y Flask-RESTX lee sus
+    campos por atributo sin pasar por las excepciones que le provoca `Row`. En los listados grandes,
+    consulta y serialización usan menos de la mitad de la memoria y alrededor del 60 % del tiempo que
+    con el ORM (ver `benchmarks/read_path.py`).
+
+    Ofrece el subconjunto de la interfaz de `Query` que usan los servicios (`filter`, `order_by`,
+    `limit`, `offset`, `all` y `first`), así el mismo código sirve para ambos casos.
+    """
+
+    # Clases de fila por tupla de nombres de columnas
+    _row_classes = {}
+    _lock = threading.Lock()
+
+    def __init__(self, model=None, fields=None, statement=None):
+        """
+        Args:
+            model (db.Model, opcional): El modelo cuya tabla se consulta.
+            fields (list, opcional): Nombres de las columnas a seleccionar; por defecto todas las de la tabla.
+            statement (Select, opcional): Un SELECT ya construido, en lugar de `model` y `fields`.
+        """
+        if statement is None:
+            columns = model.__table__.columns
+            statement = db.select(*(columns[field] for field in fields) if fields else columns)
+        self.statement = statement
+
+    def filter(self, *conditions):
+        """Retorna una nueva consulta con las condiciones agregadas al WHERE."""
+        return ReadQuery(statement=self.statement.where(*conditions))
+
+    def order_by(self, *clauses):
+        """Retorna una nueva consulta con el orden indicado."""
+        return ReadQuery(statement=self.statement.order_by(*clauses))
+
+    def limit(self, limit):
+        """Retorna una nueva consulta limitada a la cantidad de filas indicada."""
+        return ReadQuery(statement=self.statement.limit(limit))
+
+    def offset(self, offset):
+        """Retorna una nueva consulta que omite la cantidad de filas indicada."""
+        return ReadQuery(statement=self.statement.offset(offset))
+
+    def count(self):
+        """Retorna la cantidad de filas de la consulta, sin límite ni desplazamiento."""
+        return db.session.scalar(db.select(db.func.count()).select_from(self.statement.limit(None).offset(None).subquery()))
+
+    def all(self):
+        """Ejecuta la consulta y retorna todas las filas."""
+        result = ReadQuery._execute(self.statement)
+        return list(itertools.starmap(ReadQuery.row_class(tuple(result.keys())), result))
+
+    def first(self):
+        """Ejecuta la consulta y retorna la primera fila, o None si no hay resultados."""
+        result = ReadQuery._execute(self.statement.limit(1))
+        row = result.first()
+        return None if row is None else ReadQuery.row_class(tuple(result.keys()))(*row)
+
+    @staticmethod
+    def _execute(statement):
+        # Se ejecuta sobre la conexión para no pasar por el procesamiento de resultados del ORM; la
+        # sentencia se entrega a get_bind para elegir la misma conexión (primario o réplica) que la sesión.
+        # Si la réplica falla, la sesión la excluye y la lectura se repite en el primario
+        session = db.session()
+        try:
+            return session.connection(bind_arguments={'clause': statement}).execute(statement)
+        except sa.exc.OperationalError:
+            if not session.fall_back_to_primary(statement):
+                raise
+        return session.connection(bind_arguments={'clause': statement}).execute(statement)
+
+    @staticmethod
+    def row_class(names):
+        """
+        Obtiene la clase de fila con `__slots__` para un conjunto de columnas, creándola la primera vez.
+
+        Args:
+            names (tuple): Nombres de las columnas, en orden.
+
+        Returns:
+            type: Una dataclass cuyos campos son las columnas.
+        """
+        row_class = ReadQuery._row_classes.get(names)
+        if row_class is None:
+            with ReadQuery._lock:
+                row_class = ReadQuery._row_classes.setdefault(
+                    names, dataclasses.make_dataclass('ReadRow', names, slots=True))
+        return row_class
@@ -0,0 +1,73 @@
+from flask import request
+from .exceptions import InvalidDataError
+from .read_query import ReadQuery
+
+
+class SparseFields():
+    """
+    Soporte para el parámetro de consulta `fields` (?fields=a,b,c), que permite al cliente pedir solo
+    algunas columnas de un recurso. Las columnas pedidas se trasladan a la lista del SELECT, de modo
+    que la base de datos solo envía esos datos y la respuesta JSON solo los incluye.
+
+    Los endpoints GET siempre indican las columnas (todas las del modelo de respuesta si no se envió el
+    parámetro), así sus consultas usan `ReadQuery` y retornan filas livianas en lugar de objetos del ORM.
+    """
+
+    @staticmethod
+    def parse(response_model):
+        """
+        Obtiene y valida los campos solicitados en el parámetro `fields`.
+
+        Args:
+            response_model (Model): Modelo de respuesta de Flask-RESTX con los campos permitidos.
+
+        Returns:
+            list: Los nombres de los campos pedidos, en el orden del modelo, o todos los campos del modelo
+                  si no se envió el parámetro.
+
+        Raises:
+            InvalidDataError: Si alguno de los campos no existe en el modelo de respuesta.
+        """
+        value = request.args.get('fields')
+        if not value:
+            return list(response_model.keys())
+        requested = {field.strip() for field in value.split(',') if field.strip()}
+        unknown = requested - set(response_model.keys())
+        if unknown:
+            raise InvalidDataError(
+                f"Unknown fields: {', '.join(sorted(unknown))}. Allowed fields: {', '.join(response_model.keys())}.")
+        return [field for field in response_model.keys() if field in requested]
+
+    @staticmethod
+    def response_model(response_model, fields):
+        """
+        Reduce un modelo de respuesta a los campos solicitados.
+
+        Args:
+            response_model (Model): Modelo de respuesta completo.
+            fields (list | None): Campos solicitados.
+
+        Returns:
+            dict: El modelo completo si no se pidieron campos, o solo los campos pedidos.
+        """
+        if not fields:
+            return response_model
+        return {field: response_model[field] for field in fields}
+
+    @staticmethod
+    def query(model, fields):
+        """
+        Construye la consulta base de un modelo, limitada a las columnas solicitadas.
+
+        Args:
+            model (db.Model): El modelo a consultar.
+            fields (list | None): Nombres de las columnas a seleccionar.
+
+        Returns:
+            Query | ReadQuery: `model.query` si no se indicaron campos (para los servicios que modifican los
+                               objetos obtenidos); si no, una `ReadQuery` que solo selecciona esas columnas y
+                               retorna filas livianas en lugar de objetos del ORM.
+        """
+        if not fields:
+            return model.query
+        return ReadQuery(model, fields)
@@ -0,0 +1,52 @@
+class Trie():
+    """
+    Árbol de prefijos que asocia cadenas con valores, para buscar todas las claves que empiezan
+    por un prefijo sin recorrer la colección completa.
+    """
+
+    def __init__(self):
+        self._root = {}
+        self._size = 0
+
+    def insert(self, key, value):
+        """
+        Agrega un valor bajo una clave. Una misma clave puede tener varios valores.
+
+        Args:
+            key (str): La clave.
+            value (any): El valor asociado.
+        """
+        node = self._root
+        for char in key:
+            node = node.setdefault(char, {})
+        node.setdefault(None, []).append(value)
+        self._size += 1
+
+    def starts_with(self, prefix):
+        """
+        Obtiene los pares (clave, valor) cuya clave empieza por el prefijo, en orden alfabético.
+
+        Args:
+            prefix (str): El prefijo a buscar.
+
+        Returns:
+            list: Lista de tuplas (clave, valor).
+        """
+        node = self._root
+        for char in prefix:
+            node = node.get(char)
+            if node is None:
+                return []
+        results = []
+        stack = [(prefix, node)]
+        while stack:
+            key, node = stack.pop()
+            for value in node.get(None, ()):
+                results.append((key, value))
+            # Se apilan en orden inverso para recorrer los hijos en orden alfabético
+            for char in sorted((c for c in node if c is not None), reverse=True):
+                stack.append((key + char, node[char]))
+        return results
+
+    def __len__(self):
+        return self._size
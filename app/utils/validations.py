@@ -1,7 +1,13 @@
+from flask import current_app
 from app import db
+from .cache import LRUCache
+from .cache_invalidation import CacheInvalidation
 from .exceptions import *
 
 class Validations():
+    # Caché de las claves foráneas que existen: {(tabla, valor, requiere_activo): True}
+    _fk_cache = None
+
     @staticmethod
     def check_if_exists(obj, type_obj):
         """
@@ -41,7 +47,7 @@ class Validations():
             raise DuplicateValueError(f'{name} already exists. Please choose a different one.')
 
     @staticmethod
-    def check_fk_existence(attribute, value, tablename):
+    def check_fk_existence(attribute, value, tablename, status_attribute=None):
         """
         Verifica la existencia de una clave foránea (foreign key) en una tabla.
 
@@ -49,6 +55,7 @@ class Validations():
             attribute (Column): La columna en la base de datos que representa la clave foránea.
             value (any): El valor esperado de la clave foránea.
             tablename (str): El nombre de la tabla donde se busca la clave foránea.
+            status_attribute (Column, opcional): Columna de estado; si se indica, la fila además debe estar activa.
 
         Returns:
             bool: Retorna True si la clave foránea existe en la tabla.
@@ -57,8 +64,52 @@ class Validations():
             ValueError: Si la clave foránea no existe, lanza un error con el mensaje
                         "The primary key {value} does not exist in the {tablename} table."
         """
-        if not db.session.query(db.exists().where(attribute == value)).scalar():
+        # Solo se guardan en caché los resultados positivos: una clave inexistente se vuelve a consultar
+        cache = Validations._get_fk_cache()
+        # El valor se normaliza a texto para que 5 y '5' compartan la entrada y su invalidación
+        key = (tablename, str(value), status_attribute is not None)
+        if cache.get(key):
+            return
+        condition = attribute == value
+        if status_attribute is not None:
+            condition = db.and_(condition, status_attribute)
+        if not db.session.query(db.exists().where(condition)).scalar():
             raise NotFoundError(f'The primary key {value} does not exist in the {tablename} table.')
+        cache.set(key, True)
+        CacheInvalidation.ensure_listening()
+
+    @staticmethod
+    def _get_fk_cache():
+        if Validations._fk_cache is None:
+            Validations._fk_cache = LRUCache(
+                maxsize=current_app.config['FK_CACHE_SIZE'], ttl=current_app.config['FK_CACHE_TTL'])
+            CacheInvalidation.register('fk_existence', Validations._discard_fks)
+        return Validations._fk_cache
+
+    @staticmethod
+    def _discard_fks(keys):
+        cache = Validations._get_fk_cache()
+        if keys is None:
+            cache.clear()
+            return
+        for tablename, value in keys:
+            cache.pop((tablename, str(value), True))
+            cache.pop((tablename, str(value), False))
+
+    @staticmethod
+    def invalidate_fk_existence(tablename, values=None):
+        """
+        Descarta de la caché de `check_fk_existence` las claves de filas eliminadas o desactivadas, en este
+        proceso y en los demás (ver `CacheInvalidation`). Debe llamarse después de confirmar la transacción.
+
+        Args:
+            tablename (str): El nombre de la tabla, como se indica en `check_fk_existence`.
+            values (list, opcional): Valores de las claves; None para vaciar la caché completa.
+        """
+        Validations._get_fk_cache()
+        keys = None if values is None else [[tablename, value] for value in values]
+        if keys != []:
+            CacheInvalidation.publish('fk_existence', keys)
 
     @staticmethod
     def check_data_pair_existence(attribute1, value1, attribute2, value2, name):
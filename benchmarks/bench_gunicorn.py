@@ -0,0 +1,143 @@
+"""
+Benchmark de las configuraciones de Gunicorn.
+
+Levanta el servidor con cada combinación de clase de worker y preload usando gunicorn.conf.py,
+genera carga concurrente contra un endpoint y reporta peticiones por segundo, latencias y la
+memoria (PSS) total de los workers.
+
+Uso:
+    python benchmarks/bench_gunicorn.py --path /swagger.json --duration 10 --concurrency 32
+
+Por defecto se usa /swagger.json porque no requiere base de datos; para medir un endpoint que
+consulta la base de datos (por ejemplo /habits/) debe existir el archivo .env con la conexión.
+"""
+import argparse
+import importlib.util
+import itertools
+import os
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def wait_until_ready(url, timeout=30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            urllib.request.urlopen(url, timeout=1).read()
+            return True
+        except Exception:
+            time.sleep(0.2)
+    return False
+
+
+def worker_pids(master_pid):
+    try:
+        with open(f'/proc/{master_pid}/task/{master_pid}/children') as f:
+            return [int(pid) for pid in f.read().split()]
+    except OSError:
+        return []
+
+
+def pss_kb(pid):
+    """Memoria proporcional (PSS) de un proceso: reparte las páginas compartidas entre quienes las usan."""
+    try:
+        with open(f'/proc/{pid}/smaps_rollup') as f:
+            for line in f:
+                if line.startswith('Pss:'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return 0
+
+
+def run_load(url, duration, concurrency):
+    latencies = []
+    errors = 0
+    deadline = time.time() + duration
+
+    def client():
+        nonlocal errors
+        local = []
+        while time.time() < deadline:
+            start = time.perf_counter()
+            try:
+                urllib.request.urlopen(url, timeout=10).read()
+                local.append(time.perf_counter() - start)
+            except Exception:
+                errors += 1
+        return local
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for result in pool.map(lambda _: client(), range(concurrency)):
+            latencies.extend(result)
+    return latencies, errors
+
+
+def bench(worker_class, preload, args):
+    port = free_port()
+    env = dict(os.environ, PORT=str(port), GUNICORN_WORKER_CLASS=worker_class,
+               GUNICORN_PRELOAD='true' if preload else 'false', GUNICORN_ACCESS_LOG='/dev/null')
+    if args.workers:
+        env['GUNICORN_WORKERS'] = str(args.workers)
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '--config', 'gunicorn.conf.py', 'run:app'],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    url = f'http://127.0.0.1:{port}{args.path}'
+    try:
+        if not wait_until_ready(url):
+            return None
+        # Calentamiento para que cada worker atienda al menos una petición
+        run_load(url, 1, args.concurrency)
+        memory = sum(pss_kb(pid) for pid in worker_pids(server.pid))
+        latencies, errors = run_load(url, args.duration, args.concurrency)
+    finally:
+        server.send_signal(signal.SIGTERM)
+        server.wait(timeout=60)
+    latencies.sort()
+    return {
+        'rps': len(latencies) / args.duration,
+        'p50': statistics.median(latencies) * 1000 if latencies else 0,
+        'p99': latencies[int(len(latencies) * 0.99) - 1] * 1000 if latencies else 0,
+        'errors': errors,
+        'workers_pss_mb': memory / 1024
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--path', default='/swagger.json', help='Endpoint a medir')
+    parser.add_argument('--duration', type=float, default=10, help='Segundos de carga por configuración')
+    parser.add_argument('--concurrency', type=int, default=32, help='Clientes concurrentes')
+    parser.add_argument('--workers', type=int, help='Forzar la cantidad de workers')
+    parser.add_argument('--worker-classes', default='sync,gthread,gevent')
+    args = parser.parse_args()
+
+    print(f"{'worker_class':<12} {'preload':<8} {'req/s':>9} {'p50 ms':>8} {'p99 ms':>8} {'errors':>7} {'PSS MB':>8}")
+    for worker_class, preload in itertools.product(args.worker_classes.split(','), (False, True)):
+        if worker_class == 'gevent' and importlib.util.find_spec('gevent') is None:
+            print(f'{worker_class:<12} {str(preload):<8} skipped (gevent is not installed)')
+            continue
+        result = bench(worker_class, preload, args)
+        if result is None:
+            print(f'{worker_class:<12} {str(preload):<8} failed to start')
+            continue
+        print(f"{worker_class:<12} {str(preload):<8} {result['rps']:>9.1f} {result['p50']:>8.2f} "
+              f"{result['p99']:>8.2f} {result['errors']:>7} {result['workers_pss_mb']:>8.1f}")
+
+
+if __name__ == '__main__':
+    main()
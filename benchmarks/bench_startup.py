@@ -0,0 +1,71 @@
+"""
+Benchmark del tiempo de arranque en frío de la aplicación.
+
+Para cada modo (desarrollo y producción con arranque rápido) lanza varios procesos nuevos de Python
+y mide, dentro de cada uno, el tiempo de importar el paquete `app`, el de `create_app()` y la
+latencia de la primera y la segunda petición a /swagger.json (la primera construye la especificación).
+
+Uso:
+    python benchmarks/bench_startup.py --runs 10
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Código que se ejecuta en cada proceso hijo
+CHILD = r'''
+import json, time
+start = time.perf_counter()
+import app
+imported = time.perf_counter()
+flask_app = app.create_app()
+created = time.perf_counter()
+client = flask_app.test_client()
+client.get('/swagger.json')
+first = time.perf_counter()
+client.get('/swagger.json')
+second = time.perf_counter()
+print(json.dumps({
+    'import_ms': (imported - start) * 1000,
+    'create_app_ms': (created - imported) * 1000,
+    'first_request_ms': (first - created) * 1000,
+    'second_request_ms': (second - first) * 1000,
+}))
+'''
+
+MODES = {
+    'development': {'APP_ENV': 'development'},
+    'production': {'APP_ENV': 'production'},
+}
+
+
+def measure(env_overrides, runs):
+    samples = []
+    for _ in range(runs):
+        env = dict(os.environ, **env_overrides)
+        start = subprocess.run([sys.executable, '-c', CHILD], cwd=ROOT, env=env,
+                               capture_output=True, text=True, check=True)
+        samples.append(json.loads(start.stdout.strip().splitlines()[-1]))
+    return {key: statistics.median(sample[key] for sample in samples) for key in samples[0]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=10, help='Procesos por modo (se reporta la mediana)')
+    args = parser.parse_args()
+
+    print(f"{'mode':<12} {'import ms':>10} {'create_app ms':>14} {'1st request ms':>15} {'2nd request ms':>15} {'total ms':>9}")
+    for mode, env in MODES.items():
+        result = measure(env, args.runs)
+        total = result['import_ms'] + result['create_app_ms'] + result['first_request_ms']
+        print(f"{mode:<12} {result['import_ms']:>10.1f} {result['create_app_ms']:>14.1f} "
+              f"{result['first_request_ms']:>15.1f} {result['second_request_ms']:>15.1f} {total:>9.1f}")
+
+
+if __name__ == '__main__':
+    main()
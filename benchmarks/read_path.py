@@ -0,0 +1,132 @@
+"""
+Benchmark de la capa de lectura: objetos del ORM frente a `ReadQuery` en los listados grandes.
+
+Para cada listado (usuarios y asignaciones) mide el tiempo de la consulta, el tiempo total con la
+serialización de la respuesta (marshal de Flask-RESTX, como en los endpoints GET) y el pico de memoria
+reservada por Python (tracemalloc) con las dos formas de lectura:
+
+    - orm: `Model.query`, que crea objetos instrumentados y los registra en el identity map.
+    - core: el servicio con todas las columnas del modelo de respuesta, que usa `ReadQuery`.
+
+Por defecto usa una base SQLite temporal con datos sintéticos; con --database-uri se puede medir contra
+otra base (por ejemplo, una copia de PostgreSQL), que debe tener el esquema creado y se siembra solo
+si está vacía.
+
+Uso:
+    python benchmarks/read_path.py --users 50000 --assignments-per-user 4 --runs 5
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# La app se configura antes de importarla: sin consultas en consola y sin réplicas
+os.environ['SQLALCHEMY_ECHO'] = 'false'
+os.environ.pop('DB_REPLICA_URIS', None)
+sys.path.insert(0, ROOT)
+
+from flask_restx import marshal  # noqa: E402
+from app import create_app, db  # noqa: E402
+from app.config import Config  # noqa: E402
+from app.models.user_model import User  # noqa: E402
+from app.models.habit_model import Habit  # noqa: E402
+from app.models.assignment_model import Assignment  # noqa: E402
+from app.services.user_service import UserService  # noqa: E402
+from app.services.assignment_service import AssignmentService  # noqa: E402
+from app.controllers.user_controller import get_user_response_model  # noqa: E402
+from app.controllers.assignment_controller import get_assignment_response_model  # noqa: E402
+
+# Listados medidos: (nombre, lectura con el ORM, lectura con ReadQuery, modelo de respuesta)
+LISTINGS = (
+    ('users', lambda: User.query.filter(User.user_status).all(),
+     lambda: UserService.get_all_users(fields=list(get_user_response_model.keys())), get_user_response_model),
+    ('assignments', lambda: Assignment.query.filter(Assignment.assignment_status).all(),
+     lambda: AssignmentService.get_all_assignments(fields=list(get_assignment_response_model.keys())),
+     get_assignment_response_model),
+)
+
+
+def seed(users, assignments_per_user, habits=100):
+    if db.session.scalar(db.select(db.func.count()).select_from(User)):
+        return
+    now = datetime.now()
+    db.session.execute(db.insert(Habit), [
+        {'habit_name': f'habit {i}', 'time_of_day': ('mañana', 'tarde', 'noche')[i % 3], 'habit_status': True}
+        for i in range(habits)])
+    db.session.execute(db.insert(User), [
+        {'first_name': f'first {i}', 'last_name': f'last {i}', 'nickname': f'user{i}', 'email': f'user{i}@example.com',
+         'user_password': 'x' * 60, 'user_status': True, 'user_created_date': now}
+        for i in range(users)])
+    user_ids = db.session.scalars(db.select(User.user_id)).all()
+    habit_ids = db.session.scalars(db.select(Habit.habit_id)).all()
+    db.session.execute(db.insert(Assignment), [
+        {'fk_user_id': user_id, 'fk_habit_id': habit_ids[(index * 7 + offset) % len(habit_ids)],
+         'assignment_status': True, 'created_date': now}
+        for index, user_id in enumerate(user_ids) for offset in range(assignments_per_user)])
+    db.session.commit()
+
+
+def measure(read, response_model, runs):
+    query_times, total_times = [], []
+    for _ in range(runs):
+        db.session.remove()
+        start = time.perf_counter()
+        rows = read()
+        queried = time.perf_counter()
+        marshal(rows, response_model)
+        query_times.append(queried - start)
+        total_times.append(time.perf_counter() - start)
+        del rows
+    # La memoria se mide en una ejecución aparte: tracemalloc hace más lento el código medido
+    db.session.remove()
+    tracemalloc.start()
+    rows = read()
+    marshal(rows, response_model)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return len(rows), statistics.median(query_times), statistics.median(total_times), peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--database-uri', default=None, help='Base a medir (por defecto, una SQLite temporal)')
+    parser.add_argument('--users', type=int, default=50000, help='Usuarios a sembrar si la base está vacía')
+    parser.add_argument('--assignments-per-user', type=int, default=4, help='Asignaciones por usuario a sembrar')
+    parser.add_argument('--runs', type=int, default=5, help='Ejecuciones por caso (se reporta la mediana)')
+    args = parser.parse_args()
+
+    tmp_dir = None
+    if args.database_uri is None:
+        tmp_dir = tempfile.TemporaryDirectory()
+        args.database_uri = f"sqlite:///{os.path.join(tmp_dir.name, 'read_path.db')}"
+    Config.SQLALCHEMY_DATABASE_URI = args.database_uri
+    Config.SQLALCHEMY_REPLICA_URIS = []
+    flask_app = create_app()
+
+    with flask_app.app_context():
+        if tmp_dir is not None:
+            db.create_all()
+        seed(args.users, args.assignments_per_user)
+
+        print(f"{'listing':<12} {'path':<5} {'rows':>8} {'query ms':>9} {'total ms':>9} {'peak MiB':>9}")
+        for name, orm_read, core_read, response_model in LISTINGS:
+            results = {'orm': measure(orm_read, response_model, args.runs),
+                       'core': measure(core_read, response_model, args.runs)}
+            for path, (rows, query_time, total_time, peak) in results.items():
+                print(f'{name:<12} {path:<5} {rows:>8} {query_time * 1000:>9.1f} {total_time * 1000:>9.1f} {peak / 2 ** 20:>9.1f}')
+            orm, core = results['orm'], results['core']
+            print(f'{name:<12} core/orm: {core[2] / orm[2]:.0%} of the time, {core[3] / orm[3]:.0%} of the peak memory')
+        db.session.remove()
+
+    if tmp_dir is not None:
+        tmp_dir.cleanup()
+
+
+if __name__ == '__main__':
+    main()
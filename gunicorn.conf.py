@@ -0,0 +1,86 @@
+import multiprocessing
+import os
+
+# Configuración de Gunicorn. Se carga automáticamente al ejecutar `gunicorn run:app` desde la raíz
+# del proyecto, o explícitamente con `gunicorn -c gunicorn.conf.py run:app`.
+# Todos los valores pueden ajustarse con variables de entorno.
+
+cpu_count = multiprocessing.cpu_count()
+
+# Dirección y puerto en los que escucha el servidor
+bind = f"0.0.0.0:{os.environ.get('PORT', '5000')}"
+
+# Clase de worker: 'sync' (un proceso atiende una petición a la vez), 'gthread' (varios hilos por proceso)
+# o 'gevent' (corrutinas, requiere tener instalado gevent)
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'sync')
+
+# Cantidad de workers según los núcleos disponibles. Con gthread y gevent la concurrencia la aportan
+# los hilos o las corrutinas, por lo que se necesitan menos procesos
+if worker_class == 'sync':
+    default_workers = cpu_count * 2 + 1
+else:
+    default_workers = cpu_count + 1
+workers = int(os.environ.get('GUNICORN_WORKERS', default_workers))
+
+# Hilos por worker (solo aplica a gthread)
+threads = int(os.environ.get('GUNICORN_THREADS', 4 if worker_class == 'gthread' else 1))
+
+# Conexiones simultáneas por worker (solo aplica a gevent)
+worker_connections = int(os.environ.get('GUNICORN_WORKER_CONNECTIONS', 1000))
+
+# Importa la aplicación una sola vez en el proceso maestro antes de crear los workers. Los módulos,
+# los modelos de Flask-RESTX y la especificación Swagger se comparten en memoria (copy-on-write).
+# Con gevent se desactiva por defecto porque el monkey patching debe ocurrir antes de importar la app
+preload_app = os.environ.get('GUNICORN_PRELOAD', 'false' if worker_class == 'gevent' else 'true').lower() == 'true'
+
+# Reinicia cada worker tras atender un número de peticiones, con un margen aleatorio para que
+# no se reinicien todos al mismo tiempo (limita el crecimiento de memoria por fragmentación)
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 1000))
+max_requests_jitter = int(os.environ.get('GUNICORN_MAX_REQUESTS_JITTER', 100))
+
+# Un worker que no responde en `timeout` segundos es reiniciado; al apagar o recargar se esperan
+# `graceful_timeout` segundos a que terminen las peticiones en curso
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 30))
+graceful_timeout = int(os.environ.get('GUNICORN_GRACEFUL_TIMEOUT', 30))
+keepalive = int(os.environ.get('GUNICORN_KEEPALIVE', 5))
+
+# Registro de accesos y errores por la salida estándar
+accesslog = os.environ.get('GUNICORN_ACCESS_LOG', '-')
+errorlog = '-'
+
+
+def post_fork(server, worker):
+    """
+    Se ejecuta en cada worker justo después de crearlo.
+
+    Con `preload_app` el pool de conexiones de SQLAlchemy se crea en el proceso maestro; las conexiones
+    no pueden compartirse entre procesos, así que cada worker descarta las heredadas sin cerrarlas
+    (el maestro podría seguir usándolas) y abre las suyas bajo demanda.
+    """
+    if worker_class == 'gevent':
+        try:
+            # Hace cooperativo al driver de PostgreSQL si psycogreen está instalado
+            from psycogreen.gevent import patch_psycopg
+            patch_psycopg()
+        except ImportError:
+            server.log.warning('psycogreen is not installed; database calls will block the gevent loop')
+
+    if not server.cfg.preload_app:
+        return
+
+    from app import db, replicas
+    flask_app = server.app.wsgi()
+    with flask_app.app_context():
+        for engine in [*db.engines.values(), *replicas.engines]:
+            engine.dispose(close=False)
+
+
+def post_worker_init(worker):
+    """
+    Se ejecuta en cada worker después de inicializarlo (con gevent, ya con el monkey patching aplicado).
+
+    Construye en segundo plano el filtro de apodos y correos en uso, para que las consultas de
+    disponibilidad no esperen la primera lectura de la tabla de usuarios.
+    """
+    from app.services.user_availability_index import UserAvailabilityIndex
+    UserAvailabilityIndex.start(worker.app.wsgi())
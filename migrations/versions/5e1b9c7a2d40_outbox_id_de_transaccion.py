@@ -0,0 +1,31 @@
+"""ID de transacción de los eventos de la bandeja de salida
+
+Revision ID: 5e1b9c7a2d40
+Revises: 0a6d3e9c4f18
+Create Date: 2026-10-19 19:42:10.305117
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5e1b9c7a2d40'
+down_revision = '0a6d3e9c4f18'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Los eventos existentes quedan con 0: se leen antes que los nuevos, en orden de event_id
+    with op.batch_alter_table('outbox_events', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('xact_id', sa.BigInteger(), server_default=sa.text('0'), nullable=False))
+        batch_op.create_index(batch_op.f('ix_outbox_events_xact_id'), ['xact_id'], unique=False)
+    # Los eventos nuevos guardan el ID de la transacción que los registra
+    op.alter_column('outbox_events', 'xact_id', server_default=sa.text('(pg_current_xact_id()::text)::bigint'))
+
+
+def downgrade():
+    with op.batch_alter_table('outbox_events', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_outbox_events_xact_id'))
+        batch_op.drop_column('xact_id')
@@ -0,0 +1,30 @@
+"""Indices de busqueda de habitos por nombre
+
+Revision ID: e4b27f90c6a1
+Revises: c81e5a94b0d3
+Create Date: 2026-10-19 13:27:03.915842
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e4b27f90c6a1'
+down_revision = 'c81e5a94b0d3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Índices de expresión sobre lower(habit_name) para la búsqueda de hábitos activos:
+    # - text_pattern_ops permite resolver LIKE 'término%' (prefijo) con un índice B-tree
+    # - gin_trgm_ops (extensión pg_trgm) permite resolver LIKE '%término%' y la similitud (operador %)
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    op.execute('CREATE INDEX ix_habits_habit_name_prefix ON habits (lower(habit_name) text_pattern_ops) WHERE habit_status')
+    op.execute('CREATE INDEX ix_habits_habit_name_trgm ON habits USING gin (lower(habit_name) gin_trgm_ops) WHERE habit_status')
+
+
+def downgrade():
+    op.execute('DROP INDEX IF EXISTS ix_habits_habit_name_trgm')
+    op.execute('DROP INDEX IF EXISTS ix_habits_habit_name_prefix')
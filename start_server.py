@@ -1,12 +1,15 @@
 import subprocess
 import os
 
-def run_commands():    
+def run_commands():
     # Comando para iniciar el servidor con Gunicorn
     try:
         print("Iniciando el servidor con Gunicorn...")
-        port = os.environ.get('PORT', '5000')  # Usa el puerto definido o el 5000 por defecto
-        subprocess.run(['gunicorn', f'--bind=0.0.0.0:{port}', '--workers=3', 'run:app'], check=True)
+        # La configuración (puerto, workers, clase de worker, preload, timeouts) se lee de gunicorn.conf.py
+        # Los streams de eventos (GET /users/<id>/events) requieren GUNICORN_WORKER_CLASS=gevent o gthread:
+        # con el worker sync por defecto responden 503, porque cada conexión ocuparía un worker completo
+        config_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'gunicorn.conf.py')
+        subprocess.run(['gunicorn', '--config', config_path, 'run:app'], check=True)
     except subprocess.CalledProcessError as e:
         print(f"Error al iniciar el servidor: {e}")
 